@@ -0,0 +1,51 @@
+# compares encode/decode throughput and frame size of the message formats
+# run with `python benchmarks/bench_codec.py` after `pip install -e .[all]`
+import json
+import time
+from olink.core import MessageConverter, MessageFormat, Protocol
+
+# a high-rate numeric property stream and a typical init snapshot
+messages = {
+    "property_change": Protocol.property_change_message(
+        "demo.Sensor/samples", [i * 0.25 for i in range(32)]
+    ),
+    "init": Protocol.init_message(
+        "demo.Sensor",
+        {"count": 42, "name": "sensor", "enabled": True, "values": list(range(64))},
+    ),
+}
+
+
+def measure(func, count: int) -> float:
+    # returns operations per second
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def run(count: int = 20000) -> dict:
+    results = {}
+    for format in MessageFormat:
+        try:
+            converter = MessageConverter(format)
+        except ImportError as e:
+            results[format.name] = {"skipped": str(e)}
+            continue
+        for kind, msg in messages.items():
+            data = converter.to_string(msg)
+            size = len(data.encode() if isinstance(data, str) else data)
+            results[f"{format.name}/{kind}"] = {
+                "encode_per_sec": round(
+                    measure(lambda: converter.to_string(msg), count)
+                ),
+                "decode_per_sec": round(
+                    measure(lambda: converter.from_string(data), count)
+                ),
+                "frame_bytes": size,
+            }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,107 @@
+# messages per second of Protocol.handle_message per message type,
+# compared to the former if/elif chain over MsgType
+import json
+import time
+from typing import Any
+from olink.core import MsgType, Protocol
+
+
+class NullListener:
+    def handle_link(self, name):
+        pass
+
+    def handle_init(self, name, props):
+        pass
+
+    def handle_unlink(self, name):
+        pass
+
+    def handle_set_property(self, name, value):
+        pass
+
+    def handle_property_change(self, name, value):
+        pass
+
+    def handle_invoke(self, id, name, args):
+        pass
+
+    def handle_invoke_reply(self, id, name, value):
+        pass
+
+    def handle_signal(self, name, args):
+        pass
+
+    def handle_error(self, msgType, id, error):
+        pass
+
+
+class ChainProtocol(Protocol):
+    # the if/elif dispatch used before the dispatch table
+    def handle_message(self, msg: list[Any]) -> bool:
+        msgType = msg[0]
+        if msgType == MsgType.LINK:
+            _, name = msg
+            self.listener.handle_link(name)
+        elif msgType == MsgType.INIT:
+            _, name, props = msg
+            self.listener.handle_init(name, props)
+        elif msgType == MsgType.UNLINK:
+            _, name = msg
+            self.listener.handle_unlink(name)
+        elif msgType == MsgType.SET_PROPERTY:
+            _, name, value = msg
+            self.listener.handle_set_property(name, value)
+        elif msgType == MsgType.PROPERTY_CHANGE:
+            _, name, value = msg
+            self.listener.handle_property_change(name, value)
+        elif msgType == MsgType.INVOKE:
+            _, id, name, args = msg
+            self.listener.handle_invoke(id, name, args)
+        elif msgType == MsgType.INVOKE_REPLY:
+            _, id, name, value = msg
+            self.listener.handle_invoke_reply(id, name, value)
+        elif msgType == MsgType.SIGNAL:
+            _, name, args = msg
+            self.listener.handle_signal(name, args)
+        elif msgType == MsgType.ERROR:
+            _, msgType, id, error = msg
+            self.listener.handle_error(msgType, id, error)
+        else:
+            return False
+        return True
+
+
+# messages as they arrive after decoding, with plain int message types
+messages = {
+    "LINK": [10, "demo.Calc"],
+    "INIT": [11, "demo.Calc", {"total": 1}],
+    "PROPERTY_CHANGE": [21, "demo.Calc/total", 1],
+    "INVOKE_REPLY": [31, 1, "demo.Calc/add", 2],
+    "SIGNAL": [40, "demo.Calc/down", [1]],
+    "ERROR": [90, 30, 1, "error"],
+}
+
+
+def measure(protocol: Protocol, msg: list[Any], count: int) -> float:
+    handle = protocol.handle_message
+    start = time.perf_counter()
+    for _ in range(count):
+        handle(msg)
+    return count / (time.perf_counter() - start)
+
+
+def run(count: int = 200000) -> dict:
+    listener = NullListener()
+    table = Protocol(listener)
+    chain = ChainProtocol(listener)
+    results = {}
+    for kind, msg in messages.items():
+        results[kind] = {
+            "chain_per_sec": round(measure(chain, msg, count)),
+            "table_per_sec": round(measure(table, msg, count)),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,51 @@
+# cost of notify_signal fan-out against the number of linked nodes,
+# compared to encoding the message once per node
+import json
+import time
+from olink.core import Protocol
+from olink.remote import RemoteNode, get_remote_registry
+
+name = "demo.Fanout"
+sigName = "demo.Fanout/tick"
+args = [1, 2.5, "value"]
+
+
+def per_node_emit(nodes):
+    # the fan-out used before the broadcast path
+    for node in nodes:
+        node.emit_write(Protocol.signal_message(sigName, args))
+
+
+def measure(func, count: int) -> float:
+    # returns events per second
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def run(sizes: tuple[int, ...] = (1, 10, 100, 1000, 2000), events: int = 20000) -> dict:
+    registry = get_remote_registry()
+    results = {}
+    for size in sizes:
+        nodes = [RemoteNode() for _ in range(size)]
+        for node in nodes:
+            node.on_write(lambda data: None)
+            registry.add_node_to_source(name, node)
+        linked = registry.get_nodes(name)
+        count = max(events // size, 10)
+        results[str(size)] = {
+            "per_node_events_per_sec": round(
+                measure(lambda: per_node_emit(linked), count)
+            ),
+            "broadcast_events_per_sec": round(
+                measure(lambda: RemoteNode.notify_signal(sigName, args), count)
+            ),
+        }
+        for node in nodes:
+            node.detach()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,68 @@
+# invoke round trip latency of back to back client and remote nodes, with a reply
+# callback and with the awaitable ClientNode.invoke
+import asyncio
+import json
+import statistics
+import time
+from olink.client import ClientNode, ClientRegistry
+from olink.mocks import MockSink, MockSource
+from olink.remote import RemoteNode, RemoteRegistry
+
+name = "demo.Invoke"
+invokeName = "demo.Invoke/add"
+args = [1, 2]
+
+
+def setup() -> ClientNode:
+    remote_registry = RemoteRegistry()
+    remote_registry.add_source(MockSource(name, remote_registry))
+    client_registry = ClientRegistry()
+    MockSink(name, client_registry)
+    client = ClientNode(registry=client_registry)
+    remote = RemoteNode(registry=remote_registry)
+    client.on_write(lambda data: remote.handle_message(data))
+    remote.on_write(lambda data: client.handle_message(data))
+    client.link_remote(name)
+    return client
+
+
+def summary(samples: list[float]) -> dict:
+    samples.sort()
+    return {
+        "invokes_per_sec": round(len(samples) / sum(samples)),
+        "p50_us": round(statistics.median(samples) * 1e6, 3),
+        "p99_us": round(samples[int(len(samples) * 0.99)] * 1e6, 3),
+    }
+
+
+def measure_callback(client: ClientNode, count: int) -> list[float]:
+    samples = []
+    replies = []
+    invoke = client.invoke_remote
+    for _ in range(count):
+        start = time.perf_counter()
+        invoke(invokeName, args, replies.append)
+        samples.append(time.perf_counter() - start)
+    assert len(replies) == count
+    return samples
+
+
+async def measure_await(client: ClientNode, count: int) -> list[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await client.invoke(invokeName, args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(count: int = 20000) -> dict:
+    client = setup()
+    return {
+        "callback": summary(measure_callback(client, count)),
+        "await": summary(asyncio.run(measure_await(client, count))),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
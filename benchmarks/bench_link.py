@@ -0,0 +1,47 @@
+# link and unlink cost of back to back client and remote nodes against the
+# number of sources in the registry
+import json
+import time
+from olink.client import ClientNode, ClientRegistry
+from olink.mocks import MockSink, MockSource
+from olink.remote import RemoteNode, RemoteRegistry
+
+
+def setup(size: int) -> tuple[ClientNode, list[str]]:
+    # registry with size sources, a client node linked back to back
+    remote_registry = RemoteRegistry()
+    client_registry = ClientRegistry()
+    names = [f"demo.Link{i}" for i in range(size)]
+    for name in names:
+        source = MockSource(name, remote_registry)
+        source.properties = {"count": 0}
+        remote_registry.add_source(source)
+        MockSink(name, client_registry)
+    client = ClientNode(registry=client_registry)
+    remote = RemoteNode(registry=remote_registry)
+    client.on_write(lambda data: remote.handle_message(data))
+    remote.on_write(lambda data: client.handle_message(data))
+    return client, names
+
+
+def run(sizes: tuple[int, ...] = (10, 100, 1000, 10000), count: int = 20000) -> dict:
+    results = {}
+    for size in sizes:
+        client, names = setup(size)
+        linked = [names[i * size // 10] for i in range(min(size, 10))]
+        rounds = max(count // len(linked), 1)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for name in linked:
+                client.link_remote(name)
+                client.unlink_remote(name)
+        elapsed = time.perf_counter() - start
+        results[str(size)] = {
+            "link_unlink_per_sec": round(rounds * len(linked) / elapsed),
+            "link_unlink_us": round(elapsed / (rounds * len(linked)) * 1e6, 3),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,66 @@
+# linking many objects with one link message per object against one multi link
+# message, counts frames and time of the in-process round trip
+import asyncio
+import json
+import time
+from olink.client import ClientNode, ClientRegistry
+from olink.mocks import MockSink, MockSource
+from olink.remote import RemoteNode, RemoteRegistry
+
+
+def measure(count: int, multi_link: bool, repeat: int) -> dict:
+    names = [f"demo.Bench{i}" for i in range(count)]
+    remote_registry = RemoteRegistry()
+    for name in names:
+        source = MockSource(name, remote_registry)
+        source.properties = {"count": 0, "name": name}
+        remote_registry.add_source(source)
+    elapsed = 0.0
+    frames = 0
+    for _ in range(repeat):
+        client_registry = ClientRegistry()
+        for name in names:
+            MockSink(name, client_registry)
+        client = ClientNode(registry=client_registry)
+        client.multi_link = multi_link
+        remote = RemoteNode(registry=remote_registry)
+        written = []
+
+        def client_write(data):
+            written.append(data)
+            remote.handle_message(data)
+
+        def remote_write(data):
+            written.append(data)
+            client.handle_message(data)
+
+        client.on_write(client_write)
+        remote.on_write(remote_write)
+        start = time.perf_counter()
+        if multi_link:
+            client.link_remotes(names)
+        else:
+            for name in names:
+                client.link_remote(name)
+        elapsed += time.perf_counter() - start
+        frames = len(written)
+        remote.detach()
+    return {"frames": frames, "link_ms": round(elapsed / repeat * 1000, 3)}
+
+
+def run(sizes: tuple[int, ...] = (10, 100, 300, 1000), repeat: int = 20) -> dict:
+    # measured on a running loop, multi link needs one for its timeout
+    async def main():
+        return {
+            str(size): {
+                "link": measure(size, False, repeat),
+                "multi_link": measure(size, True, repeat),
+            }
+            for size in sizes
+        }
+
+    return asyncio.run(main())
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,83 @@
+# per-message overhead of name parsing on the registry hot path,
+# for realistic numbers of distinct names. compares str.split (used before),
+# str.partition (used now) and a bounded lru cache of parsed names
+import json
+import sys
+import time
+from functools import lru_cache
+from olink.core import Name, ParsedName
+from olink.remote import RemoteRegistry
+
+
+class SplitName:
+    # the name parsing used before, allocates a list per call
+    @staticmethod
+    def resource_from_name(name: str) -> str:
+        return name.split("/")[0]
+
+    @staticmethod
+    def path_from_name(name: str) -> str:
+        return name.split("/")[-1]
+
+
+@lru_cache(maxsize=16384)
+def _cached_parse(name: str) -> ParsedName:
+    return ParsedName(
+        sys.intern(name.partition("/")[0]), sys.intern(name.rpartition("/")[2])
+    )
+
+
+class CachedName:
+    # parsed names from a bounded lru cache with interned parts
+    @staticmethod
+    def resource_from_name(name: str) -> str:
+        return _cached_parse(name).resource
+
+    @staticmethod
+    def path_from_name(name: str) -> str:
+        return _cached_parse(name).path
+
+
+def messages(objects: int, properties: int, count: int) -> list[str]:
+    # names cycling through all properties of all objects
+    return [
+        f"demo.Object{i % objects}/property{i // objects % properties}"
+        for i in range(count)
+    ]
+
+
+def measure(
+    registry: RemoteRegistry, names: list[str], parser, repeat: int = 5
+) -> float:
+    # returns the best nanoseconds per message for a registry lookup and the property
+    # path, names are decoded again per run, as each message creates new string objects
+    entries = registry.entries
+    best = float("inf")
+    for _ in range(repeat):
+        fresh = [json.loads(json.dumps(name)) for name in names]
+        start = time.perf_counter()
+        for name in fresh:
+            entries.get(parser.resource_from_name(name))
+            parser.path_from_name(name)
+        best = min(best, time.perf_counter() - start)
+    return best / len(names) * 1e9
+
+
+def run(count: int = 100000) -> dict:
+    results = {}
+    for objects, properties in ((10, 10), (300, 20), (2000, 40)):
+        registry = RemoteRegistry()
+        for i in range(objects):
+            registry._entry(f"demo.Object{i}")
+        names = messages(objects, properties, count)
+        results[f"{objects}x{properties}"] = {
+            "distinct_names": objects * properties,
+            "split_ns_per_msg": round(measure(registry, names, SplitName), 1),
+            "partition_ns_per_msg": round(measure(registry, names, Name), 1),
+            "lru_cache_ns_per_msg": round(measure(registry, names, CachedName), 1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
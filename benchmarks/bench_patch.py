@@ -0,0 +1,70 @@
+# bytes on the wire and cpu of full property changes against property patches
+# for a large device table where one field changes per update
+import json
+import time
+from olink.core import MessageConverter, Protocol
+from olink.core.patch import apply, copy_value, diff
+
+propName = "demo.Devices/table"
+
+
+def device_table(devices: int) -> dict:
+    return {
+        f"device{i}": {
+            "state": "on",
+            "level": i,
+            "tags": ["a", "b"],
+            "info": {"room": i % 10},
+        }
+        for i in range(devices)
+    }
+
+
+def run(devices: tuple[int, ...] = (10, 100, 1000), updates: int = 200) -> dict:
+    converter = MessageConverter()
+    results = {}
+    for size in devices:
+        table = device_table(size)
+        values = []
+        for i in range(updates):
+            table = copy_value(table)
+            table[f"device{i % size}"]["level"] += 1
+            values.append(table)
+
+        # full change: encode on the server and decode on the client
+        start = time.perf_counter()
+        full_bytes = 0
+        for value in values:
+            data = converter.to_string(
+                Protocol.property_change_message(propName, value)
+            )
+            converter.from_string(data)
+            full_bytes += len(data)
+        full_time = time.perf_counter() - start
+
+        # patch: diff and update the last value on the server,
+        # encode, decode and apply on the client
+        start = time.perf_counter()
+        patch_bytes = 0
+        last = copy_value(values[0])
+        client = values[0]
+        for value in values[1:]:
+            ops = diff(last, value)
+            last = apply(last, copy_value(ops))
+            data = converter.to_string(Protocol.property_patch_message(propName, ops))
+            client = apply(client, converter.from_string(data)[2])
+            patch_bytes += len(data)
+        patch_time = time.perf_counter() - start
+        assert client == values[-1]
+
+        results[f"{size}_devices"] = {
+            "full_bytes_per_update": full_bytes // updates,
+            "patch_bytes_per_update": patch_bytes // (updates - 1),
+            "full_us_per_update": round(full_time / updates * 1e6, 1),
+            "patch_us_per_update": round(patch_time / (updates - 1) * 1e6, 1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,54 @@
+# time to detach all nodes at once (mass disconnect) against the registry size,
+# compared to scanning all registry entries per detached node
+import json
+import time
+from olink.remote import RemoteNode, RemoteRegistry
+
+
+def scan_remove_node(registry: RemoteRegistry, node: RemoteNode) -> None:
+    # the detach used before the reverse index
+    for entry in registry.entries.values():
+        if node in entry.nodes:
+            entry.nodes.remove(node)
+
+
+def setup(objects: int, nodes: int, links: int) -> tuple[RemoteRegistry, list]:
+    # registry with objects, each node linked to a few objects
+    registry = RemoteRegistry()
+    for i in range(objects):
+        registry._entry(f"demo.Object{i}")
+    created = [RemoteNode(registry=registry) for _ in range(nodes)]
+    for i, node in enumerate(created):
+        for k in range(links):
+            registry.add_node_to_source(f"demo.Object{(i + k) % objects}", node)
+    return registry, created
+
+
+def measure(objects: int, nodes: int, links: int, scan: bool) -> float:
+    # returns seconds to detach all nodes
+    registry, created = setup(objects, nodes, links)
+    start = time.perf_counter()
+    for node in created:
+        if scan:
+            scan_remove_node(registry, node)
+        else:
+            node.detach()
+    return time.perf_counter() - start
+
+
+def run(
+    sizes: tuple[int, ...] = (100, 1000, 10000), nodes: int = 1000, links: int = 5
+) -> dict:
+    results = {}
+    for objects in sizes:
+        results[str(objects)] = {
+            "nodes": nodes,
+            "links_per_node": links,
+            "scan_detach_sec": round(measure(objects, nodes, links, True), 6),
+            "index_detach_sec": round(measure(objects, nodes, links, False), 6),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,105 @@
+# invoke latency and throughput of the stream transport (tcp and unix socket)
+# against the websocket transport on loopback
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from olink.client import ClientNode, ClientRegistry
+from olink.core import MessageFormat
+from olink.mocks import MockSource
+from olink.remote import RemoteRegistry
+from olink.transport.stream import StreamClient, StreamServer
+
+name = "demo.Transport"
+invokeName = "demo.Transport/echo"
+
+
+async def start_websocket(registry, format):
+    from olink.transport.websocket import WebSocketClient, WebSocketServer
+
+    server = WebSocketServer(registry, format)
+    await server.start("127.0.0.1", 0, compression=None)
+    node = ClientNode(format, registry=ClientRegistry())
+    client = WebSocketClient(node)
+    await client.connect(f"ws://127.0.0.1:{server.port}", compression=None)
+    return server, client, node
+
+
+async def start_tcp(registry, format):
+    server = StreamServer(registry, format)
+    await server.start_tcp("127.0.0.1", 0)
+    node = ClientNode(format, registry=ClientRegistry())
+    client = StreamClient(node)
+    await client.connect_tcp("127.0.0.1", server.port)
+    return server, client, node
+
+
+async def start_unix(registry, format):
+    path = os.path.join(tempfile.mkdtemp(), "olink.sock")
+    server = StreamServer(registry, format)
+    await server.start_unix(path)
+    node = ClientNode(format, registry=ClientRegistry())
+    client = StreamClient(node)
+    await client.connect_unix(path)
+    return server, client, node
+
+
+async def measure(start, format, count: int, window: int) -> dict:
+    registry = RemoteRegistry()
+    registry.add_source(MockSource(name, registry))
+    server, client, node = await start(registry, format)
+    args = [1, 2.5, "value"]
+    for _ in range(100):
+        await node.invoke(invokeName, args)
+    # sequential round trips
+    samples = []
+    for _ in range(count):
+        start_time = time.perf_counter()
+        await node.invoke(invokeName, args)
+        samples.append(time.perf_counter() - start_time)
+    samples.sort()
+    # pipelined invokes, window requests in flight
+    start_time = time.perf_counter()
+    for _ in range(count // window):
+        await asyncio.gather(*[node.invoke(invokeName, args) for _ in range(window)])
+    elapsed = time.perf_counter() - start_time
+    await client.close()
+    await server.close()
+    return {
+        "latency_p50_us": round(statistics.median(samples) * 1e6, 1),
+        "latency_p99_us": round(samples[int(len(samples) * 0.99)] * 1e6, 1),
+        "invokes_per_sec": round(count // window * window / elapsed),
+    }
+
+
+async def main(count: int, window: int) -> dict:
+    transports = {"tcp": start_tcp}
+    if sys.platform != "win32":
+        transports["unix"] = start_unix
+    try:
+        import websockets  # noqa: F401
+
+        transports["websocket"] = start_websocket
+    except ImportError:
+        pass
+    results = {}
+    for format in (MessageFormat.JSON, MessageFormat.MSGPACK):
+        try:
+            ClientNode(format)
+        except ImportError:
+            continue
+        for transport, start in transports.items():
+            key = f"{transport}_{format.name.lower()}"
+            results[key] = await measure(start, format, count, window)
+    return results
+
+
+def run(count: int = 5000, window: int = 100) -> dict:
+    return asyncio.run(main(count, window))
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
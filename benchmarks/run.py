@@ -0,0 +1,89 @@
+# runs the benchmark suite and writes the results as one JSON document
+# python benchmarks/run.py [--quick] [--only codec,invoke] [--output results.json]
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# benchmark modules in suite order, each has a run() returning a dict
+suite = [
+    "codec",
+    "dispatch",
+    "names",
+    "link",
+    "registry",
+    "multilink",
+    "fanout",
+    "invoke",
+    "patch",
+    "transport",
+]
+
+# smaller arguments for a quick smoke run, e.g. in ci
+quick = {
+    "codec": {"count": 2000},
+    "dispatch": {"count": 20000},
+    "names": {"count": 10000},
+    "link": {"sizes": (10, 1000), "count": 2000},
+    "registry": {"sizes": (100, 1000), "nodes": 100},
+    "multilink": {"sizes": (10, 300), "repeat": 2},
+    "fanout": {"sizes": (1, 100), "events": 2000},
+    "invoke": {"count": 2000},
+    "patch": {"devices": (10, 100), "updates": 20},
+    "transport": {"count": 500, "window": 50},
+}
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run(names: list[str], is_quick: bool = False) -> dict:
+    results = {"environment": environment(), "quick": is_quick, "benchmarks": {}}
+    for name in names:
+        module = importlib.import_module(f"bench_{name}")
+        kwargs = quick.get(name, {}) if is_quick else {}
+        start = time.perf_counter()
+        try:
+            result = module.run(**kwargs)
+        except ImportError as e:
+            # optional dependency of the benchmark is not installed
+            result = {"skipped": str(e)}
+        results["benchmarks"][name] = {
+            "duration_sec": round(time.perf_counter() - start, 3),
+            "results": result,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="olink benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="smaller counts")
+    parser.add_argument("--only", help="comma separated benchmarks: " + ",".join(suite))
+    parser.add_argument("--output", help="write the results to a file")
+    args = parser.parse_args()
+    names = args.only.split(",") if args.only else suite
+    unknown = [name for name in names if name not in suite]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    data = json.dumps(run(names, args.quick), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
 import asyncio
 from typing import Any
-from asyncio.queues import Queue
 from starlette.applications import Starlette
 from starlette.endpoints import WebSocketEndpoint
 from starlette.routing import WebSocketRoute
 from starlette.websockets import WebSocket
 
-from olink.core.types import Name
-from olink.remotenode import IObjectSource, RemoteNode
+from olink.core import Name, SendQueue
+from olink.remote import IObjectSource, RemoteNode
 
 
 class Counter:
@@ -41,13 +40,13 @@ class CounterAdapter(IObjectSource):
     def olink_set_property(self, name: str, value: Any):
         # called on incoming set property message
         path = Name.path_from_name(name)
-        setattr(self, self.impl, value)
+        setattr(self.impl, path, value)
 
     def olink_linked(self, name: str, node: "RemoteNode"):
         # called when a remote node is linked to this node
         self.impl._node = node
 
-    def olink_unlinked(self, name: str):
+    def olink_unlinked(self, name: str, node: "RemoteNode"):
         # called when a remote node is linked to this node
         self.impl._node = None
 
@@ -60,38 +59,29 @@ adapter = CounterAdapter(counter)
 
 
 class RemoteEndpoint(WebSocketEndpoint):
+    # a remote node and send queue per connection
     encoding = "text"
-    node = RemoteNode()
-    queue = Queue()
 
-    async def sender(self, ws):
-        print("start sender")
+    async def sender(self, ws: WebSocket):
         while True:
-            print("001")
-            msg = await self.queue.get()
-            print("send", msg)
-            await ws.send_text(msg)
-            self.queue.task_done()
+            data = await self.queue.get()
+            await ws.send_text(data)
 
     async def on_connect(self, ws: WebSocket):
-        print("on_connect")
-        asyncio.create_task(self.sender(ws))
-
-        def writer(msg: str):
-            print("writer", msg)
-            self.queue.put_nowait(msg)
-
-        self.node.on_write(writer)
+        self.node = RemoteNode()
+        self.queue = SendQueue()
+        self.node.set_send_queue(self.queue)
+        self.sender_task = asyncio.create_task(self.sender(ws))
         await super().on_connect(ws)
 
     async def on_receive(self, ws: WebSocket, data: Any) -> None:
-        print("on_receive", data)
         self.node.handle_message(data)
 
-    async def on_disconnect(self, websocket: WebSocket, close_code: int) -> None:
-        await super().on_disconnect(websocket, close_code)
-        self.node.on_write(None)
-        await self.queue.join()
+    async def on_disconnect(self, ws: WebSocket, close_code: int) -> None:
+        await super().on_disconnect(ws, close_code)
+        self.node.detach()
+        self.queue.close()
+        self.sender_task.cancel()
 
 
 routes = [WebSocketRoute("/ws", RemoteEndpoint)]
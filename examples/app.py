@@ -1,7 +1,7 @@
 from asyncio.queues import Queue
 from typing import Any
-from olink.core.types import Name
-from olink.clientnode import IObjectSink, ClientNode
+from olink.core import Name
+from olink.client import IObjectSink, ClientNode
 import asyncio
 import websockets
 
@@ -49,17 +49,15 @@ class CounterSink(IObjectSink):
 
 class ClientWebsocketAdapter:
     # adapts the websocket communication to the client node
-    queue = Queue()
-    node = None
 
     def __init__(self, node):
         self.node = node
+        self.queue = Queue()
         # register a write function
         self.node.on_write(self.writer)
 
     def writer(self, data):
         # don't send directly, first write to queue
-        print("write to queue")
         self.queue.put_nowait(data)
 
     async def _reader(self, ws):
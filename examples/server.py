@@ -1,22 +1,21 @@
 import asyncio
 from typing import Any
-from asyncio.queues import Queue
 from starlette.applications import Starlette
 from starlette.endpoints import WebSocketEndpoint
 from starlette.routing import WebSocketRoute
 from starlette.websockets import WebSocket
 
-from olink.core.types import Name
-from olink.remotenode import IObjectSource, RemoteNode
+from olink.core import Name, SendQueue
+from olink.remote import IObjectSource, RemoteNode
 
 
 class CounterService:
     count = 0
-    _node: RemoteNode
 
     def increment(self):
         self.count += 1
-        self._node.notify_property_change("demo.Counter/count", self.count)
+        # notify all linked client nodes
+        RemoteNode.notify_property_change("demo.Counter/count", self.count)
 
 
 class CounterWebsocketAdapter(IObjectSource):
@@ -37,28 +36,22 @@ class CounterWebsocketAdapter(IObjectSource):
         path = Name.path_from_name(name)
         # get the function from the implementation
         func = getattr(self.impl, path)
-        try:
-            # call function with arguments from the implementation
-            result = func(**args)
-        except Exception as e:
-            # need to have proper exception handling here
-            print("error: %s" % e)
-            result = None
-        # results will be send back to calling client node
-        return result
+        # call function with arguments from the implementation, the result is send
+        # back to the calling client node, an exception is send back as error
+        return func(*args)
 
     def olink_set_property(self, name: str, value: Any):
         # set property value on implementation
         path = Name.path_from_name(name)
-        setattr(self, self.impl, value)
+        setattr(self.impl, path, value)
 
     def olink_linked(self, name: str, node: "RemoteNode"):
         # called when the source is linked to a client node
-        self.impl._node = node
+        pass
 
-    def olink_unlinked(self, name: str):
-        # called when the source is linked to a client node
-        self.impl._node = None
+    def olink_unlinked(self, name: str, node: "RemoteNode"):
+        # called when the source is unlinked from a client node
+        pass
 
     def olink_collect_properties(self) -> object:
         # collect properties from implementation to send back to client node initially
@@ -73,49 +66,37 @@ adapter = CounterWebsocketAdapter(counter)
 
 
 class RemoteEndpoint(WebSocketEndpoint):
-    # endpoint to handle a client connection
+    # endpoint to handle a client connection, starlette creates an endpoint
+    # per connection so each connection has its own node and send queue
     encoding = "text"
-    node = RemoteNode()
-    # message queue
-    queue = Queue()
 
-    async def sender(self, ws):
+    async def sender(self, ws: WebSocket):
         # sender coroutine, messages from queue are send to client
-        print("start sender")
         while True:
-            msg = await self.queue.get()
-            print("send", msg)
-            await ws.send_text(msg)
-            self.queue.task_done()
+            data = await self.queue.get()
+            await ws.send_text(data)
 
     async def on_connect(self, ws: WebSocket):
         # handle a socket connection
-        print("on_connect")
-        # register a sender to the connection
-        asyncio.create_task(self.sender(ws))
-
-        # a writer function to queue messages
-        def writer(msg: str):
-            print("write to queue:", msg)
-            self.queue.put_nowait(msg)
-
-        # register the writer function to the node
-        self.node.on_write(writer)
+        self.node = RemoteNode()
+        # the node writes its messages into the queue, the sender drains it
+        self.queue = SendQueue()
+        self.node.set_send_queue(self.queue)
+        self.sender_task = asyncio.create_task(self.sender(ws))
         # call the super connection handler
         await super().on_connect(ws)
 
     async def on_receive(self, ws: WebSocket, data: Any) -> None:
         # handle a message from a client socket
-        print("on_receive", data)
         self.node.handle_message(data)
 
-    async def on_disconnect(self, websocket: WebSocket, close_code: int) -> None:
+    async def on_disconnect(self, ws: WebSocket, close_code: int) -> None:
         # handle a socket disconnect
-        await super().on_disconnect(websocket, close_code)
-        # remove the writer from the node
-        self.node.on_write(None)
-        # wait for all messages to be send, before closing the connection
-        await self.queue.join()
+        await super().on_disconnect(ws, close_code)
+        # unlink the node from all sources and stop the sender
+        self.node.detach()
+        self.queue.close()
+        self.sender_task.cancel()
 
 
 # see https://www.starlette.io/routing/
@@ -1,5 +1,7 @@
 from .sink import IObjectSink as IObjectSink
 from .node import ClientNode as ClientNode
 from .node import InvokeReplyArg as InvokeReplyArg
+from .node import InvokeError as InvokeError
+from .node import InvokePolicy as InvokePolicy
 from .registry import ClientRegistry as ClientRegistry
 from .registry import get_client_registry as get_client_registry
@@ -1,47 +1,263 @@
-
+import asyncio
+import time
+from enum import IntEnum
 from typing import Any, Optional, Callable
-from olink.core import LogLevel, MsgType, BaseNode, Protocol
+from olink.core import LogLevel, MsgType, BaseNode, MessageFormat, Name, Protocol
+from olink.core.patch import apply
+from olink.core.timer import call_later
 from .registry import ClientRegistry, get_client_registry
 from .sink import IObjectSink
 
 class InvokeReplyArg:
-    def __init__(self, name: str, value: Any):
+    def __init__(self, name: str, value: Any, error: Optional[str] = None):
         self.name = name
         self.value = value
+        self.error = error
 
     name: str
     value: Any
+    # error description if the invoke failed on the remote side
+    error: Optional[str]
+
+
+class InvokeError(Exception):
+    # raised by ClientNode.invoke when the remote invoke failed
+    pass
 
 
 InvokeReplyFunc = Callable[[InvokeReplyArg], None]
 
+# error of invokes failed by a lost connection
+DISCONNECTED = "disconnected"
+
+
+class InvokePolicy(IntEnum):
+    # handling of pending invokes when the connection is lost
+    # fail all pending invokes
+    FAIL = 1
+    # send pending idempotent invokes again after reconnect, fail the others
+    REPLAY = 2
+
+
+def _expire(future: asyncio.Future) -> None:
+    # fail a pending invoke future on timeout
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
 class ClientNode(BaseNode):
     # client side node
     invokes_pending: dict[int, InvokeReplyFunc] = {}
     requestId = 0
+    # handling of pending invokes when the connection is lost
+    invoke_policy: InvokePolicy = InvokePolicy.FAIL
+    # link several objects with one multi link message, the remote node needs to
+    # support it, disabled again if the remote node replies an error or no
+    # multi init message within multi_link_timeout seconds
+    multi_link = False
+    multi_link_timeout = 1.0
+
+    def __init__(
+        self,
+        format: MessageFormat = MessageFormat.JSON,
+        registry: Optional[ClientRegistry] = None,
+    ):
+        # without a registry the node uses the global registry
+        super().__init__(format)
+        self._registry = registry or get_client_registry()
+        self.invokes_pending = {}
+        self.requestId = 0
+        # property values of objects linked with patches by resource and path,
+        # the base of the patches
+        self.property_values: dict[str, dict[str, Any]] = {}
+        # resources linked again to replace a missing patch base
+        self.resyncing: set[str] = set()
+        # name and args of pending idempotent invokes by request id
+        self.invokes_replay: dict[int, tuple[str, list[Any]]] = {}
+        # false between handle_disconnect and handle_connect
+        self.connected = True
+        # options of links by resource, sent again on reconnect
+        self.link_options: dict[str, dict[str, Any]] = {}
+        # names of sent multi links waiting for the multi init message
+        self.multi_link_pending: set[str] = set()
+        # timer of the pending multi link, see multi_link_timeout
+        self.multi_link_timer = None
 
     def registry(self) -> ClientRegistry:
-        return get_client_registry()
+        # returns the registry of this node
+        return self._registry
 
     def detach(self) -> None:
         self.registry().remove_node(self)
+        self.property_values.clear()
+        self.resyncing.clear()
 
     def next_request_id(self) -> int:
         self.requestId += 1
         return self.requestId
 
     def invoke_remote(
-        self, name: str, args: list[Any], func: Optional[InvokeReplyFunc]
-    ) -> None:
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.invoke_remote: {name} {args}")
+        self,
+        name: str,
+        args: list[Any],
+        func: Optional[InvokeReplyFunc],
+        idempotent: bool = False,
+    ) -> int:
+        # send invoke message, func is called with the reply
+        # an idempotent invoke may be sent again after a reconnect, see InvokePolicy
+        # returns the request id of the invoke
+        self.emit_log(LogLevel.DEBUG, "ClientNode.invoke_remote: %s %s", name, args)
         request_id = self.next_request_id()
+        if func and self.metrics:
+            func = self._timed(func)
+        replay = idempotent and func and self.invoke_policy == InvokePolicy.REPLAY
+        if not self.connected:
+            # idempotent invokes are sent on reconnect, the others fail now
+            if replay:
+                self.invokes_pending[request_id] = func
+                self.invokes_replay[request_id] = (name, args)
+            elif func:
+                func(InvokeReplyArg(name, None, DISCONNECTED))
+            return request_id
         if func:
             self.invokes_pending[request_id] = func
+            if replay:
+                self.invokes_replay[request_id] = (name, args)
         self.emit_write(Protocol.invoke_message(request_id, name, args))
+        return request_id
+
+    def _timed(self, func: InvokeReplyFunc) -> InvokeReplyFunc:
+        # wrap a reply function to observe the invoke round trip time
+        metrics = self.metrics
+        start = time.perf_counter()
+
+        def timed(arg: InvokeReplyArg) -> None:
+            if arg.error != DISCONNECTED:
+                metrics.observe_invoke(time.perf_counter() - start)
+            func(arg)
+
+        return timed
+
+    async def invoke(
+        self,
+        name: str,
+        args: list[Any],
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ) -> Any:
+        # invoke a remote operation and wait for the reply value
+        # raises InvokeError when the remote invoke failed
+        # raises asyncio.TimeoutError when no reply arrives within timeout seconds
+        # the pending invoke is removed on reply, timeout and cancellation
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def func(arg: InvokeReplyArg):
+            if future.done():
+                return
+            if arg.error is None:
+                future.set_result(arg.value)
+            else:
+                future.set_exception(InvokeError(arg.error))
+
+        request_id = self.invoke_remote(name, args, func, idempotent)
+        timer = loop.call_later(timeout, _expire, future) if timeout else None
+        try:
+            return await future
+        finally:
+            if timer:
+                timer.cancel()
+            self.invokes_pending.pop(request_id, None)
+            if self.invokes_replay:
+                self.invokes_replay.pop(request_id, None)
+
+    def handle_connect(self) -> None:
+        # called by the transport when a connection is established
+        # links all resources of this node again, sinks are resynchronized by the
+        # init messages, and sends pending idempotent invokes again
+        self.connected = True
+        self.relink()
+        for request_id, (name, args) in list(self.invokes_replay.items()):
+            if request_id in self.invokes_pending:
+                self.emit_write(Protocol.invoke_message(request_id, name, args))
+            else:
+                del self.invokes_replay[request_id]
+
+    def handle_disconnect(self) -> None:
+        # called by the transport when the connection is lost
+        # pending invokes fail unless they are replayed, see invoke_policy
+        self.emit_log(LogLevel.DEBUG, "ClientNode.handle_disconnect")
+        self.connected = False
+        self._cancel_multi_link()
+        # patch bases are replaced by the init messages after reconnect
+        self.property_values.clear()
+        self.resyncing.clear()
+        replay = self.invoke_policy == InvokePolicy.REPLAY
+        for request_id in list(self.invokes_pending):
+            if not replay or request_id not in self.invokes_replay:
+                func = self.invokes_pending.pop(request_id)
+                self.invokes_replay.pop(request_id, None)
+                if func:
+                    func(InvokeReplyArg("", None, DISCONNECTED))
+
+    def relink(self) -> None:
+        # send link messages for all resources linked to this node
+        resources = self.registry().node_links.get(self)
+        if resources:
+            self._send_links(sorted(resources))
+
+    def _send_links(self, names: list[str]) -> None:
+        # send a multi link message if enabled for the names without link options
+        # and link messages for the others, the messages are sent as one batch
+        # frame only if batching is enabled, see BaseNode.enable_batching
+        # without a running loop a missing multi init is not detected, the names
+        # are linked one by one then
+        options = self.link_options
+        msgs = []
+        if self.multi_link and len(names) > 1:
+            plain = [name for name in names if name not in options]
+            if len(plain) > 1:
+                if self.multi_link_timer:
+                    self.multi_link_timer.cancel()
+                self.multi_link_timer = call_later(
+                    self.multi_link_timeout, self._multi_link_expired
+                )
+                if self.multi_link_timer:
+                    self.multi_link_pending.update(plain)
+                    msgs.append(Protocol.multi_link_message(plain))
+                    names = [name for name in names if name in options]
+        for name in names:
+            msgs.append(Protocol.link_message(name, options.get(name)))
+        for msg in msgs:
+            self.emit_write(msg)
+        self.flush()
+
+    def _cancel_multi_link(self) -> None:
+        # forget the pending multi link and stop its timer
+        self.multi_link_pending.clear()
+        if self.multi_link_timer:
+            self.multi_link_timer.cancel()
+            self.multi_link_timer = None
+
+    def _multi_link_expired(self) -> None:
+        # the remote node did not answer the multi link in time
+        self.multi_link_timer = None
+        if self.multi_link_pending:
+            self.emit_log(LogLevel.WARNING, "no multi init, fall back to link")
+            self._fallback_links()
+
+    def _fallback_links(self) -> None:
+        # disable multi links and link the pending names one by one
+        self.multi_link = False
+        names = sorted(self.multi_link_pending)
+        self._cancel_multi_link()
+        if names:
+            self._send_links(names)
 
     def set_remote_property(self, name: str, value: Any) -> None:
         # send remote property message
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.set_remote_property: {name} {value}")
+        self.emit_log(
+            LogLevel.DEBUG, "ClientNode.set_remote_property: %s %s", name, value
+        )
         self.emit_write(Protocol.set_property_message(name, value))
 
     def link_node(self, name: str):
@@ -54,68 +270,199 @@ class ClientNode(BaseNode):
 
     @staticmethod
     def register_sink(sink: IObjectSink) -> Optional["ClientNode"]:
-        # register sink to registry
+        # register sink to global registry
         return get_client_registry().register_sink(sink)
 
     @staticmethod
     def unregister_sink(sink: IObjectSink) -> None:
-        # unregister sink from registry
+        # unregister sink from global registry
         return get_client_registry().unregister_sink(sink)
 
     @staticmethod
     def get_sink(name: str) -> Optional[IObjectSink]:
-        # get sink from registry
+        # get sink from global registry
         return get_client_registry().get_sink(name)
 
-    def link_remote(self, name: str):
+    def link_remote(
+        self,
+        name: str,
+        filter: Optional[list[str]] = None,
+        rate: Optional[float] = None,
+        rates: Optional[dict[str, float]] = None,
+        patch: bool = False,
+    ):
         # register this node from sink and send a link message
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.linkRemote: {name}")
+        # with a filter only the listed property and signal paths are sent, a path
+        # ending with "*" is a prefix, the init message is trimmed to the filter
+        # rate limits the property changes per second of the object and rates of
+        # single properties, the remote node sends the latest value per interval
+        # with patch the remote node may send changes of patched properties as
+        # PROPERTY_PATCH messages, the node keeps the property values as base
+        self.emit_log(LogLevel.DEBUG, "ClientNode.linkRemote: %s", name)
         self.registry().add_node_to_sink(name, self)
-        self.emit_write(Protocol.link_message(name))
+        resource = Name.resource_from_name(name)
+        options = {}
+        if filter is not None:
+            options["filter"] = list(filter)
+        if rate is not None:
+            options["rate"] = rate
+        if rates is not None:
+            options["rates"] = dict(rates)
+        if patch:
+            options["patch"] = True
+        if options:
+            self.link_options[resource] = options
+        else:
+            self.link_options.pop(resource, None)
+        self.emit_write(Protocol.link_message(name, options))
+
+    def link_remotes(self, names: list[str]) -> None:
+        # register this node for several sinks and link them in one message
+        registry = self.registry()
+        for name in names:
+            registry.add_node_to_sink(name, self)
+        if names:
+            self._send_links(list(names))
 
     def unlink_remote(self, name: str):
         # unlink this node from sink and send an unlink message
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.unlink_remote: {name}")
+        self.emit_log(LogLevel.DEBUG, "ClientNode.unlink_remote: %s", name)
         self.emit_write(Protocol.unlink_message(name))
         self.registry().remove_node_from_sink(name, self)
+        self.property_values.pop(Name.resource_from_name(name), None)
+        self.link_options.pop(Name.resource_from_name(name), None)
 
     def handle_init(self, name: str, props: object):
         # handle init message from source
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.handle_init: {name}")
-        sink = self.get_sink(name)
+        self.emit_log(LogLevel.DEBUG, "ClientNode.handle_init: %s", name)
+        resource = Name.resource_from_name(name)
+        options = self.link_options.get(resource)
+        if options and options.get("patch") and isinstance(props, dict):
+            self.property_values[resource] = dict(props)
+        self.resyncing.discard(resource)
+        sink = self.registry().get_sink(name)
         if sink:
-            sink.olink_on_init(name, props, self)
+            if self.tracer:
+                self.trace_call(
+                    MsgType.INIT, name, sink.olink_on_init, name, props, self
+                )
+            else:
+                sink.olink_on_init(name, props, self)
+
+    def handle_multi_init(self, inits: list[list[Any]]) -> None:
+        # handle multi init message, the init messages of a multi link
+        # names without init message are not known to the remote node
+        self._cancel_multi_link()
+        for msg in inits:
+            self.handle_init(msg[1], msg[2])
 
     def handle_property_change(self, name: str, value: Any) -> None:
         # handle property change message from source
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.handle_property_change: {name}")
-        sink = self.get_sink(name)
+        self.emit_log(LogLevel.DEBUG, "ClientNode.handle_property_change: %s", name)
+        if self.property_values:
+            resource, path = Name.parse(name)
+            values = self.property_values.get(resource)
+            if values is not None:
+                values[path] = value
+        sink = self.registry().get_sink(name)
+        if sink:
+            if self.tracer:
+                self.trace_call(
+                    MsgType.PROPERTY_CHANGE,
+                    name,
+                    sink.olink_on_property_changed,
+                    name,
+                    value,
+                )
+            else:
+                sink.olink_on_property_changed(name, value)
+
+    def handle_property_patch(self, name: str, ops: list[Any]) -> None:
+        # handle property patch message from source
+        # the patch is applied to the last value and passed on as property change
+        self.emit_log(LogLevel.DEBUG, "ClientNode.handle_property_patch: %s", name)
+        resource, path = Name.parse(name)
+        values = self.property_values.get(resource)
+        if values is None or path not in values:
+            # link again, the init message replaces the missing base
+            self.emit_log(LogLevel.WARNING, "no value to patch, relink: %s", name)
+            if resource not in self.resyncing:
+                self.resyncing.add(resource)
+                options = self.link_options.get(resource)
+                self.emit_write(Protocol.link_message(resource, options))
+            return
+        value = values[path] = apply(values[path], ops)
+        sink = self.registry().get_sink(name)
         if sink:
-            sink.olink_on_property_changed(name, value)
+            if self.tracer:
+                self.trace_call(
+                    MsgType.PROPERTY_CHANGE,
+                    name,
+                    sink.olink_on_property_changed,
+                    name,
+                    value,
+                )
+            else:
+                sink.olink_on_property_changed(name, value)
 
     def handle_invoke_reply(self, id: int, name: str, value: Any) -> None:
         # handle invoke reply message from source
         self.emit_log(
-            LogLevel.DEBUG, f"ClientNode.handle_invoke_reply: {id} {name} {value}"
+            LogLevel.DEBUG, "ClientNode.handle_invoke_reply: %s %s %s", id, name, value
         )
         if id in self.invokes_pending:
             func = self.invokes_pending[id]
             if func:
                 arg = InvokeReplyArg(name, value)
-                func(arg)
+                if self.tracer:
+                    self.trace_call(MsgType.INVOKE_REPLY, name, func, arg)
+                else:
+                    func(arg)
             del self.invokes_pending[id]
+            if self.invokes_replay:
+                self.invokes_replay.pop(id, None)
         else:
-            self.emit_log(LogLevel.DEBUG, f"no pending invoke: {id} {name}")
+            self.emit_log(LogLevel.DEBUG, "no pending invoke: %s %s", id, name)
 
     def handle_signal(self, name: str, args: list[Any]) -> None:
         # handle signal message from source
-        self.emit_log(LogLevel.DEBUG, f"ClientNode.handle_signal: {name} {args}")
-        sink = self.get_sink(name)
+        self.emit_log(LogLevel.DEBUG, "ClientNode.handle_signal: %s %s", name, args)
+        sink = self.registry().get_sink(name)
+        if sink:
+            if self.tracer:
+                self.trace_call(MsgType.SIGNAL, name, sink.olink_on_signal, name, args)
+            else:
+                sink.olink_on_signal(name, args)
+
+    def handle_signal_batch(self, name: str, batch: list[list[Any]]) -> None:
+        # handle signal batch message from source
+        # passed as batch to sinks with olink_on_signal_batch, unpacked otherwise
+        self.emit_log(
+            LogLevel.DEBUG, "ClientNode.handle_signal_batch: %s %s", name, len(batch)
+        )
+        sink = self.registry().get_sink(name)
         if sink:
-            sink.olink_on_signal(name, args)
+            on_batch = getattr(sink, "olink_on_signal_batch", None)
+            if on_batch:
+                if self.tracer:
+                    self.trace_call(MsgType.SIGNAL_BATCH, name, on_batch, name, batch)
+                else:
+                    on_batch(name, batch)
+            else:
+                for args in batch:
+                    self.handle_signal(name, args)
 
     def handle_error(self, msgType: MsgType, id: int, error: str):
         # handle error message from source
+        # a failed invoke is replied to the pending invoke with the error
         self.emit_log(
-            LogLevel.DEBUG, f"ClientNode.handle_error: {msgType} {id} {error}"
+            LogLevel.DEBUG, "ClientNode.handle_error: %s %s %s", msgType, id, error
         )
+        if msgType == MsgType.MULTI_LINK:
+            self._fallback_links()
+        elif msgType == MsgType.INVOKE:
+            func = self.invokes_pending.pop(id, None)
+            if self.invokes_replay:
+                self.invokes_replay.pop(id, None)
+            if func:
+                func(InvokeReplyArg("", None, error))
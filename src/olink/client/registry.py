@@ -15,17 +15,32 @@ class SinkToClientEntry:
 
 class ClientRegistry(Base):
     # client side registry to link sinks to nodes
+    # each registry is an isolated set of sinks
     entries: dict[str, SinkToClientEntry] = {}
 
+    def __init__(self):
+        self.entries = {}
+        # reverse index of the resources a node is linked to
+        self.node_links: dict["ClientNode", set[str]] = {}
+
     def remove_node(self, node: "ClientNode"):
-        # remove node from all sinks
-        for entry in self.entries.values():
-            if entry.node is node:
+        # remove node from all sinks it is linked to
+        for resource in self.node_links.pop(node, ()):
+            entry = self.entries.get(resource)
+            if entry and entry.node is node:
                 entry.node = None
 
     def add_node_to_sink(self, name: str, node: "ClientNode"):
         # add not to named sink
-        self._entry(name).node = node
+        resource = Name.resource_from_name(name)
+        entry = self._entry(resource)
+        if entry.node is not None and entry.node is not node:
+            self._unlink(entry.node, resource)
+        entry.node = node
+        links = self.node_links.get(node)
+        if links is None:
+            links = self.node_links[node] = set()
+        links.add(resource)
 
     def remove_node_from_sink(self, name: str, node: "ClientNode"):
         # remove node from named sink
@@ -33,9 +48,12 @@ class ClientRegistry(Base):
         if resource in self.entries:
             if self.entries[resource].node is node:
                 self.entries[resource].node = None
+                self._unlink(node, resource)
             else:
                 self.emit_log(
-                    LogLevel.DEBUG, f"unlink node failed, not the same node: {resource}"
+                    LogLevel.DEBUG,
+                    "unlink node failed, not the same node: %s",
+                    resource,
                 )
 
     def register_sink(self, sink: IObjectSink) -> "ClientNode":
@@ -58,11 +76,19 @@ class ClientRegistry(Base):
         # get node using name
         return self._entry(name).node
 
+    def _unlink(self, node: "ClientNode", resource: str) -> None:
+        # remove a resource from the reverse index of the node
+        links = self.node_links.get(node)
+        if links:
+            links.discard(resource)
+            if not links:
+                del self.node_links[node]
+
     def _entry(self, name: str) -> SinkToClientEntry:
         # get an entry by name
         resource = Name.resource_from_name(name)
         if not resource in self.entries:
-            self.emit_log(LogLevel.DEBUG, f"add new resource: {resource}")
+            self.emit_log(LogLevel.DEBUG, "add new resource: %s", resource)
             self.entries[resource] = SinkToClientEntry()
         return self.entries[resource]
 
@@ -72,7 +98,7 @@ class ClientRegistry(Base):
         del self.entries[resource]
 
 
-# global client registry
+# global client registry, used by nodes created without a registry
 _registry = ClientRegistry()
 
 
@@ -10,12 +10,18 @@ class IObjectSink(ProtocolType):
         # called on signal message
         raise NotImplementedError()
 
+    def olink_on_signal_batch(self, name: str, batch: list[list[Any]]) -> None:
+        # called on signal batch message with the args of each emit, oldest first
+        # override to handle the batch at once, sinks without it get each signal
+        for args in batch:
+            self.olink_on_signal(name, args)
+
     def olink_on_property_changed(self, name: str, value: Any) -> None:
         # called on property changed message
         raise NotImplementedError()
 
     def olink_on_init(self, name: str, props: object, node: "ClientNode"):
-        # called on init message
+        # called on init message, again with the current state after a reconnect
         raise NotImplementedError()
 
     def olink_on_release(self) -> None:
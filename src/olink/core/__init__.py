@@ -1,8 +1,19 @@
 from .types import Name as Name
+from .types import ParsedName as ParsedName
 from .types import LogLevel as LogLevel
 from .types import MsgType as MsgType
+from .types import MessageFormat as MessageFormat
+from .types import MessageConverter as MessageConverter
+from .types import MessageData as MessageData
 from .types import Base as Base
 from .types import ILogger as ILogger
 from .node import BaseNode as BaseNode
 from .protocol import IProtocolListener as IProtocolListener
-from .protocol import Protocol as Protocol
\ No newline at end of file
+from .protocol import Protocol as Protocol
+from .queue import SendQueue as SendQueue
+from .queue import OverflowPolicy as OverflowPolicy
+from .metrics import Metrics as Metrics
+from .metrics import Histogram as Histogram
+from .trace import ITracer as ITracer
+from .trace import TraceStage as TraceStage
+from .trace import SlowestSampler as SlowestSampler
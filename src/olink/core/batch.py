@@ -0,0 +1,59 @@
+import time
+from typing import Optional
+from .types import LogLevel, MessageData, MsgType
+from .timer import call_later
+
+
+class FrameBatcher:
+    # collects encoded frames and writes them as one batch frame
+    # a batch is flushed when it reaches max_messages or max_bytes (encoded length)
+    # or when the oldest frame is older than max_delay seconds
+    def __init__(
+        self,
+        node: "BaseNode",
+        max_messages: int = 64,
+        max_bytes: int = 64 * 1024,
+        max_delay: float = 0.005,
+    ):
+        self.node = node
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.frames: list[MessageData] = []
+        self.size = 0
+        self.started = 0.0
+        self.timer = None
+
+    def add(self, data: MessageData) -> None:
+        # add an encoded frame to the batch and flush if the policy is met
+        if not self.frames:
+            self.started = time.monotonic()
+            if self.max_delay > 0:
+                self.timer = call_later(self.max_delay, self.flush)
+        self.frames.append(data)
+        self.size += len(data)
+        if len(self.frames) >= self.max_messages or self.size >= self.max_bytes:
+            self.flush()
+        elif not self.timer and time.monotonic() - self.started >= self.max_delay:
+            # without an event loop the delay is checked on every write
+            self.flush()
+
+    def flush(self) -> None:
+        # write all pending frames, a single frame is written without batch frame
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        frames = self.frames
+        if not frames:
+            return
+        self.frames = []
+        self.size = 0
+        if not self.node.can_write():
+            self.node.emit_log(
+                LogLevel.DEBUG, "write not set, drop %s frames", len(frames)
+            )
+            return
+        if len(frames) == 1:
+            self.node.send_data(frames[0])
+        else:
+            self.node.send_data(self.node.converter.join_frames(MsgType.BATCH, frames))
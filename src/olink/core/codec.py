@@ -0,0 +1,110 @@
+import json
+from typing import Any, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+try:
+    import bson
+except ImportError:  # pragma: no cover
+    bson = None
+
+
+# encoded message, text for json and bytes for the binary formats
+MessageData = Union[str, bytes]
+
+
+def _cbor_array_header(size: int) -> bytes:
+    # initial bytes of a cbor array (major type 4) with the given size
+    if size < 24:
+        return bytes([0x80 | size])
+    if size < 0x100:
+        return bytes([0x98, size])
+    if size < 0x10000:
+        return b"\x99" + size.to_bytes(2, "big")
+    return b"\x9a" + size.to_bytes(4, "big")
+
+
+class JsonCodec:
+    # text codec using the standard json module
+    binary = False
+
+    def encode(self, msg: list[Any]) -> str:
+        return json.dumps(msg)
+
+    def decode(self, data: MessageData) -> list[Any]:
+        return json.loads(data)
+
+    def encode_batch(self, msg_type: int, frames: list[str]) -> str:
+        # encodes [msg_type, [frame, ...]] by joining the already encoded frames
+        return f"[{int(msg_type)}, [{', '.join(frames)}]]"
+
+
+class MsgpackCodec:
+    # binary codec using msgpack (pip install msgpack)
+    binary = True
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is required for MessageFormat.MSGPACK")
+        # a packer is reused to avoid the setup cost of msgpack.packb per message
+        self._packer = msgpack.Packer(autoreset=True)
+
+    def encode(self, msg: list[Any]) -> bytes:
+        return self._packer.pack(msg)
+
+    def decode(self, data: bytes) -> list[Any]:
+        return msgpack.unpackb(data, strict_map_key=False)
+
+    def encode_batch(self, msg_type: int, frames: list[bytes]) -> bytes:
+        # encodes [msg_type, [frame, ...]] by joining the already encoded frames
+        packer = self._packer
+        head = packer.pack_array_header(2) + packer.pack(int(msg_type))
+        return b"".join([head, packer.pack_array_header(len(frames)), *frames])
+
+
+class CborCodec:
+    # binary codec using cbor2 (pip install cbor2)
+    binary = True
+
+    def __init__(self):
+        if cbor2 is None:
+            raise ImportError("cbor2 is required for MessageFormat.CBOR")
+
+    def encode(self, msg: list[Any]) -> bytes:
+        return cbor2.dumps(msg)
+
+    def decode(self, data: bytes) -> list[Any]:
+        return cbor2.loads(data)
+
+    def encode_batch(self, msg_type: int, frames: list[bytes]) -> bytes:
+        # encodes [msg_type, [frame, ...]] by joining the already encoded frames
+        head = _cbor_array_header(2) + cbor2.dumps(int(msg_type))
+        return b"".join([head, _cbor_array_header(len(frames)), *frames])
+
+
+class BsonCodec:
+    # binary codec using the bson module of pymongo (pip install pymongo)
+    # a bson document can not be an array, so the message is wrapped as {"m": msg}
+    binary = True
+
+    def __init__(self):
+        if bson is None or not hasattr(bson, "encode"):
+            raise ImportError("pymongo is required for MessageFormat.BSON")
+
+    def encode(self, msg: list[Any]) -> bytes:
+        return bson.encode({"m": msg})
+
+    def decode(self, data: bytes) -> list[Any]:
+        return bson.decode(data)["m"]
+
+    def encode_batch(self, msg_type: int, frames: list[bytes]) -> bytes:
+        # bson documents can not be nested by joining, so the frames are re-encoded
+        return self.encode([int(msg_type), [self.decode(frame) for frame in frames]])
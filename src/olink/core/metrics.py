@@ -0,0 +1,220 @@
+import weakref
+from bisect import bisect_left
+from typing import Any, Iterable, Optional
+from .types import MsgType
+
+# upper bounds of the invoke latency buckets in seconds
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# upper bounds of the fan-out buckets in nodes
+FANOUT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    # counts observed values in buckets with the given upper bounds
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        # the last count is for values above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        # returns the cumulative counts by upper bound
+        cumulative = {}
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative[str(bound)] = total
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+def _type_name(msg_type: int) -> str:
+    try:
+        return MsgType(msg_type).name
+    except ValueError:
+        return str(msg_type)
+
+
+class Metrics:
+    # metrics collector shared by nodes and remote registries
+    # attach with node.set_metrics(metrics) and registry.set_metrics(metrics),
+    # without a collector the nodes only check for it. gauges like the pending
+    # invokes and send queue depths are read from the attached nodes on snapshot
+    def __init__(self):
+        self.messages_in: dict[int, int] = {}
+        self.messages_out: dict[int, int] = {}
+        self.frames_in = 0
+        self.frames_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.decode_errors = 0
+        self.invoke_latency = Histogram(LATENCY_BUCKETS)
+        self.fanout = Histogram(FANOUT_BUCKETS)
+        self.nodes: "weakref.WeakSet" = weakref.WeakSet()
+
+    def attach(self, node: Any) -> None:
+        # add a node to the gauges
+        self.nodes.add(node)
+
+    def detach(self, node: Any) -> None:
+        self.nodes.discard(node)
+
+    def count_in(self, msg_type: int) -> None:
+        # a message was received, messages of a batch are counted as well
+        self.messages_in[msg_type] = self.messages_in.get(msg_type, 0) + 1
+
+    def count_out(self, msg_type: int) -> None:
+        # a message was written
+        self.messages_out[msg_type] = self.messages_out.get(msg_type, 0) + 1
+
+    def frame_in(self, size: int) -> None:
+        self.frames_in += 1
+        self.bytes_in += size
+
+    def frame_out(self, size: int) -> None:
+        self.frames_out += 1
+        self.bytes_out += size
+
+    def observe_invoke(self, seconds: float) -> None:
+        # round trip time of an invoke
+        self.invoke_latency.observe(seconds)
+
+    def observe_fanout(self, nodes: int) -> None:
+        # number of nodes a property change or signal is sent to
+        self.fanout.observe(nodes)
+
+    def gauges(self) -> dict[str, int]:
+        # current values read from the attached nodes
+        pending = 0
+        depth = 0
+        dropped = 0
+        for node in list(self.nodes):
+            pending += len(getattr(node, "invokes_pending", ()))
+            queue = node.send_queue
+            if queue:
+                depth += queue.depth
+                dropped += queue.dropped
+        return {
+            "nodes": len(self.nodes),
+            "invokes_pending": pending,
+            "send_queue_depth": depth,
+            "send_queue_dropped": dropped,
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        # returns all metrics as plain dict
+        return {
+            "messages_in": {
+                _type_name(key): value for key, value in self.messages_in.items()
+            },
+            "messages_out": {
+                _type_name(key): value for key, value in self.messages_out.items()
+            },
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "decode_errors": self.decode_errors,
+            "invoke_latency_seconds": self.invoke_latency.snapshot(),
+            "fanout_nodes": self.fanout.snapshot(),
+            **self.gauges(),
+        }
+
+    def to_prometheus(self, prefix: str = "olink") -> str:
+        # returns all metrics in the prometheus text exposition format
+        lines = []
+
+        def metric(name: str, kind: str, help: str, samples: list[tuple[str, Any]]):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        def by_type(counts: dict[int, int]) -> list[tuple[str, int]]:
+            return [
+                (f'{{type="{_type_name(key)}"}}', value)
+                for key, value in sorted(counts.items())
+            ]
+
+        def histogram(name: str, help: str, histogram: Histogram) -> None:
+            snapshot = histogram.snapshot()
+            samples = [
+                (f'_bucket{{le="{bound}"}}', count)
+                for bound, count in snapshot["buckets"].items()
+            ]
+            samples.append(("_sum", snapshot["sum"]))
+            samples.append(("_count", snapshot["count"]))
+            metric(name, "histogram", help, samples)
+
+        metric(
+            "messages_in_total",
+            "counter",
+            "Received messages by type.",
+            by_type(self.messages_in),
+        )
+        metric(
+            "messages_out_total",
+            "counter",
+            "Written messages by type.",
+            by_type(self.messages_out),
+        )
+        metric("frames_in_total", "counter", "Received frames.", [("", self.frames_in)])
+        metric(
+            "frames_out_total", "counter", "Written frames.", [("", self.frames_out)]
+        )
+        metric("bytes_in_total", "counter", "Received bytes.", [("", self.bytes_in)])
+        metric("bytes_out_total", "counter", "Written bytes.", [("", self.bytes_out)])
+        metric(
+            "decode_errors_total",
+            "counter",
+            "Frames failed to decode.",
+            [("", self.decode_errors)],
+        )
+        histogram(
+            "invoke_latency_seconds", "Invoke round trip time.", self.invoke_latency
+        )
+        histogram("fanout_nodes", "Nodes per property change or signal.", self.fanout)
+        gauges = self.gauges()
+        metric("nodes", "gauge", "Nodes with metrics.", [("", gauges["nodes"])])
+        metric(
+            "invokes_pending",
+            "gauge",
+            "Invokes waiting for a reply.",
+            [("", gauges["invokes_pending"])],
+        )
+        metric(
+            "send_queue_depth",
+            "gauge",
+            "Frames in send queues.",
+            [("", gauges["send_queue_depth"])],
+        )
+        metric(
+            "send_queue_dropped",
+            "gauge",
+            "Frames dropped by send queues.",
+            [("", gauges["send_queue_dropped"])],
+        )
+        return "\n".join(lines) + "\n"
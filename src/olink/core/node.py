@@ -1,11 +1,17 @@
-import logging
-from typing import Any
+import time
+from typing import Any, Callable, Iterable, Optional
+from olink.core.batch import FrameBatcher
+from olink.core.metrics import Metrics
 from olink.core.protocol import IProtocolListener, Protocol
+from olink.core.queue import SendQueue
+from olink.core.trace import ITracer, TraceStage, message_name, message_type
 from olink.core.types import (
     Base,
     LogLevel,
     MessageConverter,
+    MessageData,
     MessageFormat,
+    MsgType,
     WriteMessageFunc,
 )
 
@@ -15,28 +21,183 @@ class BaseNode(Base, IProtocolListener):
     write_func: WriteMessageFunc = None
     converter: MessageConverter = None
     protocol: Protocol = None
+    batcher: FrameBatcher = None
+    send_queue: SendQueue = None
+    metrics: Metrics = None
+    tracer: ITracer = None
 
-    def __init__(self):
+    def __init__(self, format: MessageFormat = MessageFormat.JSON):
         super()
         self.protocol = Protocol(self)
-        self.converter = MessageConverter(MessageFormat.JSON)
+        self.converter = MessageConverter(format)
 
     def on_write(self, func: WriteMessageFunc) -> None:
         # set the write function
         self.write_func = func
 
+    def set_send_queue(self, queue: Optional[SendQueue]) -> None:
+        # write frames into the queue instead of calling the write function
+        # the transport consumes the queue, see SendQueue
+        self.flush()
+        self.send_queue = queue
+
+    def set_metrics(self, metrics: Optional[Metrics]) -> None:
+        # collect message metrics of this node, None disables the metrics
+        if self.metrics:
+            self.metrics.detach(self)
+        self.metrics = metrics
+        self.protocol.metrics = metrics
+        if metrics:
+            metrics.attach(self)
+
+    def set_tracer(self, tracer: Optional[ITracer]) -> None:
+        # trace the decode, dispatch and callback stages of received messages,
+        # None disables tracing
+        self.tracer = tracer
+
+    def trace_call(
+        self, msg_type: int, name: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        # call a sink or source callback and trace its duration
+        start = time.perf_counter_ns()
+        try:
+            return func(*args)
+        finally:
+            self.tracer.trace(
+                TraceStage.CALLBACK, msg_type, name, start, time.perf_counter_ns()
+            )
+
+    def can_write(self) -> bool:
+        # true if a write function or a send queue is set
+        return self.write_func is not None or self.send_queue is not None
+
+    def enable_batching(
+        self,
+        max_messages: int = 64,
+        max_bytes: int = 64 * 1024,
+        max_delay: float = 0.005,
+    ) -> None:
+        # collect written messages into batch frames, see FrameBatcher
+        self.flush()
+        self.batcher = FrameBatcher(self, max_messages, max_bytes, max_delay)
+
+    def disable_batching(self) -> None:
+        # flush pending messages and write each message as own frame
+        self.flush()
+        self.batcher = None
+
+    def flush(self) -> None:
+        # write pending batched messages
+        if self.batcher:
+            self.batcher.flush()
+
     def emit_write(self, msg: list[Any]) -> None:
         # emit a message using the write function
-        if self.write_func:
-            data = self.converter.to_string(msg)
+        if self.write_func or self.send_queue:
+            if self.metrics:
+                self.metrics.count_out(msg[0])
+            self.write_data(self.converter.to_string(msg), msg)
+        else:
+            self.emit_log(LogLevel.DEBUG, "write not set on protocol: %s", msg)
+
+    def write_data(self, data: MessageData, msg: Optional[list[Any]] = None) -> None:
+        # write an encoded message, batched if batching is enabled
+        # msg is the message of data, used to conflate property changes in the queue
+        msg_type = msg[0] if msg else None
+        if self.batcher:
+            if not self.send_queue or (
+                msg_type != MsgType.PROPERTY_CHANGE
+                and msg_type != MsgType.PROPERTY_PATCH
+            ):
+                # counted as frame when the batch is sent
+                self.batcher.add(data)
+                return
+            # property changes are queued by key, a dropped batch frame would
+            # break the patches of its properties unnoticed
+            self.batcher.flush()
+        if self.send_queue:
+            if self.metrics:
+                self.metrics.frame_out(len(data))
+            if msg_type == MsgType.PROPERTY_CHANGE:
+                self.send_queue.put(data, msg[1], True)
+            elif msg_type == MsgType.PROPERTY_PATCH:
+                # a patch depends on the previous value and is never replaced
+                self.send_queue.put(data, msg[1], False)
+            else:
+                self.send_queue.put(data)
+        else:
+            if self.metrics:
+                self.metrics.frame_out(len(data))
+            self.write_func(data)
+
+    def send_data(self, data: MessageData) -> None:
+        # send an encoded frame to the send queue or the write function
+        if self.metrics:
+            self.metrics.frame_out(len(data))
+        if self.send_queue:
+            self.send_queue.put(data)
+        elif self.write_func:
             self.write_func(data)
         else:
-            self.emit_log(LogLevel.DEBUG, f"write not set on protocol: {msg}")
+            self.emit_log(LogLevel.DEBUG, "write not set on protocol")
+
+    @staticmethod
+    def broadcast(nodes: Iterable["BaseNode"], msg: list[Any]) -> None:
+        # write a message to all nodes, encoding it only once per message format
+        frames: dict[MessageFormat, MessageData] = {}
+        for node in nodes:
+            if not node.write_func and not node.send_queue:
+                continue
+            converter = node.converter
+            data = frames.get(converter.format)
+            if data is None:
+                data = frames[converter.format] = converter.to_string(msg)
+            if node.metrics:
+                node.metrics.count_out(msg[0])
+            node.write_data(data, msg)
 
-    def handle_message(self, data: str) -> None:
+    def handle_message(self, data: MessageData) -> None:
         # handle a message and pass is on to the protocol
+        if self.tracer:
+            self._handle_traced(data)
+            return
+        try:
+            msg = self.converter.from_string(data)
+        except Exception as e:
+            self._decode_failed(e)
+            return
+        if self.metrics:
+            self.metrics.frame_in(len(data))
+        try:
+            self.protocol.handle_message(msg)
+        except Exception as e:
+            self.emit_log(LogLevel.ERROR, "handle_message error: %s", e)
+
+    def _handle_traced(self, data: MessageData) -> None:
+        # handle_message with the decode and dispatch stages traced
+        tracer = self.tracer
+        start = time.perf_counter_ns()
         try:
             msg = self.converter.from_string(data)
+        except Exception as e:
+            tracer.trace(TraceStage.DECODE, 0, "", start, time.perf_counter_ns())
+            self._decode_failed(e)
+            return
+        decoded = time.perf_counter_ns()
+        msg_type = message_type(msg)
+        name = message_name(msg)
+        tracer.trace(TraceStage.DECODE, msg_type, name, start, decoded)
+        if self.metrics:
+            self.metrics.frame_in(len(data))
+        try:
             self.protocol.handle_message(msg)
         except Exception as e:
-            self.emit_log(LogLevel.ERROR, f"handle_message error: {e}")
+            self.emit_log(LogLevel.ERROR, "handle_message error: %s", e)
+        tracer.trace(
+            TraceStage.DISPATCH, msg_type, name, decoded, time.perf_counter_ns()
+        )
+
+    def _decode_failed(self, error: Exception) -> None:
+        if self.metrics:
+            self.metrics.decode_errors += 1
+        self.emit_log(LogLevel.ERROR, "handle_message error: %s", error)
@@ -0,0 +1,69 @@
+from typing import Any
+
+# a patch is a list of operations on nested dicts and lists
+# [path, value] sets the value at path, [path] removes the dict key at path
+# a path is a list of dict keys and list indices, [] is the value itself
+# operations are idempotent, applying a patch twice gives the same value
+Patch = list[list[Any]]
+
+
+def diff(old: Any, new: Any) -> Patch:
+    # return the operations to turn old into new
+    ops: Patch = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: list[Any], ops: Patch) -> None:
+    if type(old) is not type(new):
+        ops.append([path, new])
+    elif old is new or old == new:
+        # the equality check runs in C and skips unchanged subtrees
+        return
+    elif type(old) is dict:
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, path + [key], ops)
+            else:
+                ops.append([path + [key], value])
+        for key in old:
+            if key not in new:
+                ops.append([path + [key]])
+    elif type(old) is list and len(old) == len(new):
+        for index, (a, b) in enumerate(zip(old, new)):
+            _diff(a, b, path + [index], ops)
+    else:
+        ops.append([path, new])
+
+
+def apply(value: Any, ops: Patch) -> Any:
+    # return a new value with the operations applied, value is not modified
+    # containers along the patched paths are copied, all others are shared
+    for op in ops:
+        path = op[0]
+        if not path:
+            value = op[1]
+            continue
+        value = _apply(value, path, op)
+    return value
+
+
+def _apply(node: Any, path: list[Any], op: list[Any]) -> Any:
+    node = node.copy()
+    key = path[0]
+    if len(path) > 1:
+        node[key] = _apply(node[key], path[1:], op)
+    elif len(op) > 1:
+        node[key] = op[1]
+    else:
+        node.pop(key, None)
+    return node
+
+
+def copy_value(value: Any) -> Any:
+    # deep copy of nested dicts and lists, other values are shared
+    if type(value) is dict:
+        return {key: copy_value(item) for key, item in value.items()}
+    if type(value) is list:
+        return [copy_value(item) for item in value]
+    return value
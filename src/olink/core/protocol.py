@@ -1,11 +1,12 @@
-from typing import Any, Protocol as ProtocolType
+from typing import Any, Callable, Optional, Protocol as ProtocolType
+from .metrics import Metrics
 from .types import Base, LogLevel, MsgType
 
 
 class IProtocolListener(ProtocolType):
     # interface for protocol listeners
-    def handle_link(self, name: str) -> None:
-        # called when a link is created
+    def handle_link(self, name: str, options: Optional[dict[str, Any]] = None) -> None:
+        # called when a link is created, options are the link options of the client
         raise NotImplementedError()
 
     def handle_unlink(self, name: str) -> None:
@@ -16,6 +17,16 @@ class IProtocolListener(ProtocolType):
         # called when a node is initialized
         raise NotImplementedError()
 
+    def handle_multi_link(self, names: list[str]) -> None:
+        # called when several links are created at once
+        for name in names:
+            self.handle_link(name)
+
+    def handle_multi_init(self, inits: list[list[Any]]) -> None:
+        # called with the init messages of a multi link
+        for msg in inits:
+            self.handle_init(msg[1], msg[2])
+
     def handle_set_property(self, name: str, value: Any) -> None:
         # called when a property is set
         raise NotImplementedError()
@@ -24,6 +35,10 @@ class IProtocolListener(ProtocolType):
         # called when a property is changed
         raise NotImplementedError()
 
+    def handle_property_patch(self, name: str, ops: list[Any]) -> None:
+        # called when a property is changed by a patch of the previous value
+        raise NotImplementedError()
+
     def handle_invoke(self, id: int, name: str, args: list[Any]) -> None:
         # called when a node invokes a method
         raise NotImplementedError()
@@ -36,27 +51,69 @@ class IProtocolListener(ProtocolType):
         # called when a signal is emitted
         raise NotImplementedError()
 
+    def handle_signal_batch(self, name: str, batch: list[list[Any]]) -> None:
+        # called with the args of several emits of a batched signal
+        for args in batch:
+            self.handle_signal(name, args)
+
     def handle_error(self, msgType: int, id: int, error: str) -> None:
         # called when an error occurs
         raise NotImplementedError()
 
 
+# message types dispatched to the listener, with handler name and message length,
+# a message type listed again accepts a longer form with optional arguments
+_listener_methods = [
+    (MsgType.LINK, "handle_link", 2),
+    # link with options
+    (MsgType.LINK, "handle_link", 3),
+    (MsgType.INIT, "handle_init", 3),
+    (MsgType.UNLINK, "handle_unlink", 2),
+    (MsgType.MULTI_LINK, "handle_multi_link", 2),
+    (MsgType.MULTI_INIT, "handle_multi_init", 2),
+    (MsgType.SET_PROPERTY, "handle_set_property", 3),
+    (MsgType.PROPERTY_CHANGE, "handle_property_change", 3),
+    (MsgType.PROPERTY_PATCH, "handle_property_patch", 3),
+    (MsgType.INVOKE, "handle_invoke", 4),
+    (MsgType.INVOKE_REPLY, "handle_invoke_reply", 4),
+    (MsgType.SIGNAL, "handle_signal", 3),
+    (MsgType.SIGNAL_BATCH, "handle_signal_batch", 3),
+    (MsgType.ERROR, "handle_error", 4),
+]
+
+
 class Protocol(Base):
     listener: IProtocolListener = None
+    # counts the handled messages by type if set, see BaseNode.set_metrics
+    metrics: Metrics = None
 
     def __init__(self, listener: IProtocolListener):
         super()
         self.listener = listener
+        # dispatch table, built once as the listener is fixed for a protocol
+        self._handlers = self._create_handlers() if listener else {}
 
     @staticmethod
-    def link_message(name: str) -> list[Any]:
-        """links remote object"""
+    def link_message(name: str, options: Optional[dict[str, Any]] = None) -> list[Any]:
+        """links remote object, options like a subscription filter are optional"""
+        if options:
+            return [MsgType.LINK, name, options]
         return [MsgType.LINK, name]
 
     @staticmethod
     def init_message(name: str, props: object) -> list[Any]:
         return [MsgType.INIT, name, props]
 
+    @staticmethod
+    def multi_link_message(names: list[str]) -> list[Any]:
+        """links several remote objects, answered by one multi init message"""
+        return [MsgType.MULTI_LINK, names]
+
+    @staticmethod
+    def multi_init_message(inits: list[list[Any]]) -> list[Any]:
+        """init messages of several remote objects"""
+        return [MsgType.MULTI_INIT, inits]
+
     @staticmethod
     def unlink_message(name: str) -> list[Any]:
         """unlinks remote object"""
@@ -72,6 +129,11 @@ class Protocol(Base):
         """signal property change to the client linked to the remote objects"""
         return [MsgType.PROPERTY_CHANGE, name, value]
 
+    @staticmethod
+    def property_patch_message(name: str, ops: list[Any]) -> list[Any]:
+        """signal a property change as patch of the previous value"""
+        return [MsgType.PROPERTY_PATCH, name, ops]
+
     @staticmethod
     def invoke_message(id: int, name: str, args: list[Any]) -> list[Any]:
         """invoke an operation on a remote object"""
@@ -86,6 +148,16 @@ class Protocol(Base):
     def signal_message(name: str, args: list[Any]) -> list[Any]:
         return [MsgType.SIGNAL, name, args]
 
+    @staticmethod
+    def signal_batch_message(name: str, batch: list[list[Any]]) -> list[Any]:
+        """the args of several emits of a signal, oldest first"""
+        return [MsgType.SIGNAL_BATCH, name, batch]
+
+    @staticmethod
+    def batch_message(msgs: list[list[Any]]) -> list[Any]:
+        """several messages sent as one frame"""
+        return [MsgType.BATCH, msgs]
+
     @staticmethod
     def error_message(msgType: MsgType, id: int, error: str) -> list[Any]:
         return [MsgType.ERROR, msgType, id, error]
@@ -94,35 +166,45 @@ class Protocol(Base):
         if not self.listener:
             self.emit_log(LogLevel.DEBUG, "no listener installed")
             return False
-        msgType = msg[0]
-        if msgType == MsgType.LINK:
-            _, name = msg
-            self.listener.handle_link(name)
-        elif msgType == MsgType.INIT:
-            _, name, props = msg
-            self.listener.handle_init(name, props)
-        elif msgType == MsgType.UNLINK:
-            _, name = msg
-            self.listener.handle_unlink(name)
-        elif msgType == MsgType.SET_PROPERTY:
-            _, name, value = msg
-            self.listener.handle_set_property(name, value)
-        elif msgType == MsgType.PROPERTY_CHANGE:
-            _, name, value = msg
-            self.listener.handle_property_change(name, value)
-        elif msgType == MsgType.INVOKE:
-            _, id, name, args = msg
-            self.listener.handle_invoke(id, name, args)
-        elif msgType == MsgType.INVOKE_REPLY:
-            _, id, name, value = msg
-            self.listener.handle_invoke_reply(id, name, value)
-        elif msgType == MsgType.SIGNAL:
-            _, name, args = msg
-            self.listener.handle_signal(name, args)
-        elif msgType == MsgType.ERROR:
-            _, msgType, id, error = msg
-            self.listener.handle_error(msgType, id, error)
-        else:
-            self.emit_log(LogLevel.DEBUG, f"not supported message type: {msgType}")
+        try:
+            handler, size, max_size = self._handlers[msg[0]]
+        except (KeyError, IndexError, TypeError):
+            self.emit_log(LogLevel.DEBUG, "not supported message: %s", msg)
             return False
+        length = len(msg)
+        if length != size and not size < length <= max_size:
+            self.emit_log(LogLevel.DEBUG, "malformed message: %s", msg)
+            return False
+        if self.metrics:
+            self.metrics.count_in(msg[0])
+        handler(*msg[1:])
         return True
+
+    def _create_handlers(self) -> dict[int, tuple[Callable[..., None], int, int]]:
+        # maps a message type to the bound listener handler and the minimum and
+        # maximum message length, message types without a handler on the listener
+        # are not supported
+        listener = self.listener
+        handlers = {
+            MsgType.BATCH: (self._handle_batch, 2, 2),
+        }
+        for msg_type, method, size in _listener_methods:
+            handler = getattr(listener, method, None)
+            if handler is None:
+                continue
+            entry = handlers.get(msg_type)
+            if entry:
+                # a longer form of the message with optional arguments
+                handlers[msg_type] = (handler, entry[1], size)
+            else:
+                handlers[msg_type] = (handler, size, size)
+        return handlers
+
+    def _handle_batch(self, msgs: list[list[Any]]) -> None:
+        # unpacks a batch message and handles each message in order, a failing
+        # message does not stop the messages after it
+        for msg in msgs:
+            try:
+                self.handle_message(msg)
+            except Exception as e:
+                self.emit_log(LogLevel.ERROR, "handle_message error: %s", e)
@@ -0,0 +1,237 @@
+import asyncio
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Optional
+from .types import Base, LogLevel, MessageData
+
+
+class OverflowPolicy(IntEnum):
+    # keep all frames, the transports stop reading from the peer while the queue
+    # is above the high watermark, other producers await SendQueue.writable()
+    BLOCK = 1
+    # drop the oldest frames until the new frame fits
+    DROP_OLDEST = 2
+    # a property change replaces the pending change of the same property,
+    # if the queue is still full the oldest frames are dropped
+    CONFLATE = 3
+    # close the queue and call on_overflow, the transport closes the connection
+    DISCONNECT = 4
+
+
+QueueCallback = Callable[["SendQueue"], None]
+DropCallback = Callable[["SendQueue", str], Optional[MessageData]]
+
+
+class SendQueue(Base):
+    # bounded queue of encoded frames between a node and its transport
+    # the transport consumes frames using `await queue.get()` or `queue.pop()`
+    # watermarks are message counts, on_high is called when the depth reaches the
+    # high watermark and on_low when it drains to the low watermark again
+    # dropping a property change or patch drops the patches of its key queued
+    # after it as well, they miss their base. the next patch of the key is
+    # replaced by the full frame on_drop returns for the key, or dropped
+    def __init__(
+        self,
+        max_messages: int = 1000,
+        max_bytes: int = 1024 * 1024,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        high_watermark: Optional[int] = None,
+        low_watermark: Optional[int] = None,
+        on_high: Optional[QueueCallback] = None,
+        on_low: Optional[QueueCallback] = None,
+        on_overflow: Optional[QueueCallback] = None,
+        on_drop: Optional[DropCallback] = None,
+    ):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.high_watermark = high_watermark or max(1, max_messages * 3 // 4)
+        self.low_watermark = low_watermark or self.high_watermark // 2
+        self.on_high = on_high
+        self.on_low = on_low
+        self.on_overflow = on_overflow
+        self.on_drop = on_drop
+        # entries are [key, data, conflate], keyed entries are indexed by key
+        self.items: deque[list[Any]] = deque()
+        self.keys: dict[str, list[Any]] = {}
+        # keys with a dropped frame, their next frame needs to be a full change
+        self.broken: set[str] = set()
+        self.bytes = 0
+        self.high = False
+        self.closed = False
+        self._getter: Optional[asyncio.Future] = None
+        self._writable: Optional[asyncio.Event] = None
+        # metrics
+        self.put_count = 0
+        self.sent_count = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    @property
+    def blocked(self) -> bool:
+        # true if producers should wait for writable before adding frames
+        return self.high and self.policy == OverflowPolicy.BLOCK
+
+    @property
+    def depth(self) -> int:
+        # number of pending frames
+        return len(self.items)
+
+    def put(
+        self, data: MessageData, key: Optional[str] = None, conflate: bool = False
+    ) -> bool:
+        # add a frame, key names the property of a property change or patch,
+        # only frames with conflate set may be replaced by a later frame of the key
+        # returns false if the frame was dropped
+        if self.closed:
+            self.dropped += 1
+            return False
+        self.put_count += 1
+        while True:
+            if not conflate and key in self.broken:
+                # a patch without its base, send the full value instead
+                data = self.on_drop(self, key) if self.on_drop else None
+                if data is None:
+                    self.dropped += 1
+                    return False
+                conflate = True
+            if key is not None and self.policy == OverflowPolicy.CONFLATE:
+                entry = self.keys.get(key)
+                if entry and entry[2] and conflate:
+                    self.bytes += len(data) - len(entry[1])
+                    entry[1] = data
+                    self.conflated += 1
+                    self.broken.discard(key)
+                    return True
+            if (
+                len(self.items) >= self.max_messages
+                or self.bytes + len(data) > self.max_bytes
+            ):
+                if not self._overflow(len(data)):
+                    self.dropped += 1
+                    return False
+                if not conflate and key in self.broken:
+                    # the base of the patch was dropped to make room
+                    continue
+            break
+        entry = [key, data, conflate]
+        self.items.append(entry)
+        if key is not None:
+            self.keys[key] = entry
+            if conflate and self.broken:
+                self.broken.discard(key)
+        self.bytes += len(data)
+        depth = len(self.items)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self._getter and not self._getter.done():
+            self._getter.set_result(None)
+        if not self.high and depth >= self.high_watermark:
+            self.high = True
+            if self._writable:
+                self._writable.clear()
+            if self.on_high:
+                self.on_high(self)
+        return True
+
+    def _overflow(self, size: int) -> bool:
+        # make room for a new frame, returns false if the frame is dropped
+        # the keys of dropped keyed frames are added to broken
+        if self.policy == OverflowPolicy.BLOCK:
+            return True
+        if self.policy == OverflowPolicy.DISCONNECT:
+            self.emit_log(LogLevel.WARNING, "send queue overflow, disconnect")
+            self.close()
+            if self.on_overflow:
+                self.on_overflow(self)
+            return False
+        while self.items and (
+            len(self.items) >= self.max_messages or self.bytes + size > self.max_bytes
+        ):
+            key = self.items[0][0]
+            self._popleft()
+            self.dropped += 1
+            if key is not None:
+                self.broken.add(key)
+                self._drop_patches(key)
+        return True
+
+    def _drop_patches(self, key: str) -> None:
+        # drop the queued patches of key up to the next full property change
+        # of the key, each patch depends on the frame before it
+        patches = []
+        for entry in self.items:
+            if entry[0] == key:
+                if entry[2]:
+                    break
+                patches.append(entry)
+        for entry in patches:
+            self.items.remove(entry)
+            self._removed(entry)
+            self.dropped += 1
+
+    def _popleft(self) -> MessageData:
+        entry = self.items.popleft()
+        self._removed(entry)
+        return entry[1]
+
+    def _removed(self, entry: list[Any]) -> None:
+        # update the index, size and watermark state for a removed entry
+        key, data, _ = entry
+        if key is not None and self.keys.get(key) is entry:
+            del self.keys[key]
+        self.bytes -= len(data)
+        if self.high and len(self.items) <= self.low_watermark:
+            self.high = False
+            if self._writable:
+                self._writable.set()
+            if self.on_low:
+                self.on_low(self)
+
+    def pop(self) -> Optional[MessageData]:
+        # return the next frame or None if the queue is empty
+        if not self.items:
+            return None
+        self.sent_count += 1
+        return self._popleft()
+
+    async def get(self) -> MessageData:
+        # wait for the next frame, only one consumer may wait at a time
+        while not self.items:
+            self._getter = asyncio.get_running_loop().create_future()
+            await self._getter
+        self.sent_count += 1
+        return self._popleft()
+
+    async def writable(self) -> None:
+        # wait until the queue drained below the high watermark
+        if not self.high:
+            return
+        if not self._writable:
+            self._writable = asyncio.Event()
+        await self._writable.wait()
+
+    def close(self) -> None:
+        # drop all pending frames and reject new ones, wakes up waiting producers
+        self.closed = True
+        self.dropped += len(self.items)
+        self.items.clear()
+        self.keys.clear()
+        self.broken.clear()
+        self.bytes = 0
+        self.high = False
+        if self._writable:
+            self._writable.set()
+
+    def stats(self) -> dict[str, int]:
+        # returns a snapshot of the queue metrics
+        return {
+            "depth": len(self.items),
+            "bytes": self.bytes,
+            "max_depth": self.max_depth,
+            "put": self.put_count,
+            "sent": self.sent_count,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+        }
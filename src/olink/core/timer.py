@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+def call_later(delay: float, func: Callable[[], None]) -> Optional[asyncio.TimerHandle]:
+    # schedule func on the running event loop
+    # returns None when no loop is running, the caller then needs to flush explicitly
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return loop.call_later(delay, func)
+
+
+class TimerWheel:
+    # hashed timer wheel for many short timers, e.g. one per throttled property
+    # callbacks run on the first tick after their deadline, ticks are scheduled
+    # on the running loop while timers are pending. without a running loop the
+    # owner calls advance to run the due callbacks
+    def __init__(self, tick: float = 0.01, slots: int = 256):
+        self.tick = tick
+        self.slots = slots
+        # entries are (deadline tick, callback)
+        self.wheel: list[list[tuple[int, Callable[[], None]]]] = [
+            [] for _ in range(slots)
+        ]
+        self.current = self._now()
+        self.count = 0
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+    def _now(self) -> int:
+        return int(time.monotonic() / self.tick)
+
+    def schedule(self, delay: float, func: Callable[[], None]) -> None:
+        # run func after delay seconds
+        if not self.count:
+            self.current = self._now()
+        deadline = int((time.monotonic() + delay) / self.tick) + 1
+        self.wheel[deadline % self.slots].append((deadline, func))
+        self.count += 1
+        if not self.handle:
+            self.handle = call_later(self.tick, self._on_tick)
+
+    def advance(self) -> None:
+        # run all callbacks which are due
+        if not self.count:
+            return
+        target = self._now()
+        steps = min(target - self.current + 1, self.slots)
+        due = []
+        for step in range(steps):
+            slot = self.wheel[(self.current + step) % self.slots]
+            if slot:
+                keep = [entry for entry in slot if entry[0] > target]
+                if len(keep) != len(slot):
+                    due.extend(entry for entry in slot if entry[0] <= target)
+                    slot[:] = keep
+        self.current = target + 1
+        self.count -= len(due)
+        for _, func in sorted(due, key=lambda entry: entry[0]):
+            func()
+
+    def _on_tick(self) -> None:
+        self.handle = None
+        self.advance()
+        if self.count and not self.handle:
+            self.handle = call_later(self.tick, self._on_tick)
@@ -0,0 +1,103 @@
+import heapq
+import time
+from enum import IntEnum
+from typing import Any, Optional, Protocol as ProtocolType
+from .metrics import _type_name
+from .types import Base, LogLevel, MsgType
+
+
+class TraceStage(IntEnum):
+    # decoding a frame with the message converter
+    DECODE = 1
+    # handling a decoded message by the protocol, including the callbacks
+    DISPATCH = 2
+    # a sink or source callback
+    CALLBACK = 3
+
+
+class ITracer(ProtocolType):
+    # interface for tracers, see BaseNode.set_tracer
+    def trace(
+        self, stage: TraceStage, msg_type: int, name: str, start: int, end: int
+    ) -> None:
+        # called after each stage of a message, start and end are time.perf_counter_ns
+        # values, msg_type is 0 and name empty if the frame failed to decode
+        raise NotImplementedError()
+
+
+def message_name(msg: Any) -> str:
+    # returns the object or member name of a decoded message, empty if it has none
+    try:
+        msg_type = msg[0]
+        if msg_type == MsgType.INVOKE or msg_type == MsgType.INVOKE_REPLY:
+            name = msg[2]
+        elif msg_type == MsgType.ERROR:
+            return ""
+        else:
+            name = msg[1]
+    except (IndexError, KeyError, TypeError):
+        return ""
+    return name if isinstance(name, str) else ""
+
+
+def message_type(msg: Any) -> int:
+    # returns the message type of a decoded message, 0 if it has none
+    try:
+        msg_type = msg[0]
+    except (IndexError, KeyError, TypeError):
+        return 0
+    return msg_type if isinstance(msg_type, int) else 0
+
+
+class SlowestSampler(Base):
+    # tracer keeping the slowest traced stages, written to the log with
+    # log_slowest, or every interval seconds if an interval is given
+    def __init__(self, size: int = 10, interval: Optional[float] = None):
+        self.size = size
+        self.interval = interval
+        # min heap of (duration, sequence, stage, msg_type, name)
+        self.slowest: list[tuple] = []
+        self.count = 0
+        self.last_log = time.monotonic()
+
+    def trace(
+        self, stage: TraceStage, msg_type: int, name: str, start: int, end: int
+    ) -> None:
+        self.count += 1
+        entry = (end - start, self.count, stage, msg_type, name)
+        if len(self.slowest) < self.size:
+            heapq.heappush(self.slowest, entry)
+        elif entry[0] > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+        if self.interval and time.monotonic() - self.last_log >= self.interval:
+            self.log_slowest()
+
+    def report(self) -> list[dict[str, Any]]:
+        # returns the slowest stages, slowest first
+        return [
+            {
+                "stage": TraceStage(stage).name,
+                "type": _type_name(msg_type),
+                "name": name,
+                "duration_ms": duration / 1e6,
+            }
+            for duration, _, stage, msg_type, name in sorted(self.slowest, reverse=True)
+        ]
+
+    def log_slowest(self) -> None:
+        # write the slowest stages to the log and start a new sample
+        for entry in self.report():
+            self.emit_log(
+                LogLevel.INFO,
+                "slow %s %s %s: %.3f ms",
+                entry["stage"],
+                entry["type"],
+                entry["name"],
+                entry["duration_ms"],
+            )
+        self.reset()
+
+    def reset(self) -> None:
+        self.slowest = []
+        self.count = 0
+        self.last_log = time.monotonic()
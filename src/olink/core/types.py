@@ -1,18 +1,23 @@
 from enum import IntEnum
-from typing import Any, Callable
+from typing import Any, Callable, NamedTuple, Optional
 from typing import Protocol as ProptocolType
-import json
+from .codec import BsonCodec, CborCodec, JsonCodec, MessageData, MsgpackCodec
 
 
 class MsgType(IntEnum):
     LINK = (10,)
     INIT = (11,)
     UNLINK = (12,)
+    MULTI_LINK = (13,)
+    MULTI_INIT = (14,)
     SET_PROPERTY = (20,)
     PROPERTY_CHANGE = (21,)
+    PROPERTY_PATCH = (22,)
     INVOKE = (30,)
     INVOKE_REPLY = (31,)
     SIGNAL = (40,)
+    SIGNAL_BATCH = (41,)
+    BATCH = (80,)
     ERROR = (90,)
 
 
@@ -23,18 +28,30 @@ class MessageFormat(IntEnum):
     CBOR = (4,)
 
 
+class ParsedName(NamedTuple):
+    # a name split into resource and path, a resource name is also its own path
+    resource: str
+    path: str
+
+
 class Name:
     # a name is a resource name (module.Interface) with a path (method, property, signal), joined by a '/'
     # module=demo, interface=Calc, method=add => demo.Calc/add
+    # partition is used instead of split, it does not allocate a list per call
+    @staticmethod
+    def parse(name: str) -> ParsedName:
+        # return resource and path of a name
+        return ParsedName(name.partition("/")[0], name.rpartition("/")[2])
+
     @staticmethod
     def resource_from_name(name: str) -> str:
         # return the resource name from a name
-        return name.split("/")[0]
+        return name.partition("/")[0]
 
     @staticmethod
     def path_from_name(name: str) -> str:
         # return the path from a name
-        return name.split("/")[-1]
+        return name.rpartition("/")[2]
 
     @staticmethod
     def has_path(name: str) -> bool:
@@ -47,28 +64,47 @@ class Name:
         return f"{resource}/{path}"
 
 
+_codecs = {
+    MessageFormat.JSON: JsonCodec,
+    MessageFormat.BSON: BsonCodec,
+    MessageFormat.MSGPACK: MsgpackCodec,
+    MessageFormat.CBOR: CborCodec,
+}
+
+
 class MessageConverter:
-    # convert a message from/to a string
+    # convert a message from/to the wire data of the message format
+    # json produces text (str), all other formats produce bytes
     format: MessageFormat = MessageFormat.JSON
 
-    def __init__(self, format: MessageFormat):
+    def __init__(self, format: MessageFormat = MessageFormat.JSON):
         self.format = format
+        self.codec = _codecs[format]()
+
+    @property
+    def binary(self) -> bool:
+        # true if the format produces bytes
+        return self.codec.binary
+
+    def from_string(self, message: MessageData) -> list[Any]:
+        return self.codec.decode(message)
 
-    def from_string(self, message: str) -> list[Any]:
-        return json.loads(message)
+    def to_string(self, data: list[Any]) -> MessageData:
+        return self.codec.encode(data)
 
-    def to_string(self, data: list[Any]) -> str:
-        return json.dumps(data)
+    def join_frames(self, msg_type: MsgType, frames: list[MessageData]) -> MessageData:
+        # join encoded frames into the frame of the message [msg_type, [msg, ...]]
+        return self.codec.encode_batch(msg_type, frames)
 
 
-WriteMessageFunc = Callable[[str], None]
+WriteMessageFunc = Callable[[MessageData], None]
 
 
-class LogLevel:
-    DEBUG = (1,)
-    INFO = (2,)
-    WARNING = (3,)
-    ERROR = (4,)
+class LogLevel(IntEnum):
+    DEBUG = 1
+    INFO = 2
+    WARNING = 3
+    ERROR = 4
 
 
 WriteLogFunc = Callable[[LogLevel, str], None]
@@ -81,10 +117,22 @@ class ILogger(ProptocolType):
 
 class Base:
     log_func: WriteLogFunc = None
+    # messages below the log level are skipped without formatting
+    log_level: LogLevel = LogLevel.DEBUG
 
-    def on_log(self, func: WriteLogFunc):
+    def on_log(self, func: WriteLogFunc, level: Optional[LogLevel] = None):
         self.log_func = func
+        if level is not None:
+            self.log_level = level
+
+    def set_log_level(self, level: LogLevel) -> None:
+        self.log_level = level
+
+    def is_log_enabled(self, level: LogLevel) -> bool:
+        # true if a message of the level would be written
+        return self.log_func is not None and level >= self.log_level
 
-    def emit_log(self, level: LogLevel, msg: str):
-        if self.log_func:
-            self.log_func(level, msg)
+    def emit_log(self, level: LogLevel, msg: str, *args: Any):
+        # args are formatted into msg using %, only if the level is enabled
+        if self.log_func and level >= self.log_level:
+            self.log_func(level, msg % args if args else msg)
@@ -1,6 +1,6 @@
 from typing import Any, Optional
 from olink.core import Name
-from olink.client import ClientNode, IObjectSink, InvokeReplyArg
+from olink.client import ClientNode, ClientRegistry, IObjectSink, InvokeReplyArg
 
 
 class MockSink(IObjectSink):
@@ -9,9 +9,12 @@ class MockSink(IObjectSink):
     node: Optional[ClientNode] = None
     properties: dict[str, Any] = {}
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, registry: Optional[ClientRegistry] = None):
         self.name = name
-        self.node = ClientNode.register_sink(self)
+        if registry:
+            self.node = registry.register_sink(self)
+        else:
+            self.node = ClientNode.register_sink(self)
 
     def invoke(self, name: str, args: list[Any]):
         if self.node:
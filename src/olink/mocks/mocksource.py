@@ -1,6 +1,6 @@
-from typing import Any
+from typing import Any, Optional
 from olink.core import Name
-from olink.remote import IObjectSource, RemoteNode
+from olink.remote import IObjectSource, RemoteNode, RemoteRegistry, get_remote_registry
 
 
 class MockSource(IObjectSource):
@@ -9,14 +9,15 @@ class MockSource(IObjectSource):
     properties: dict[str, Any] = {}
     node: RemoteNode = None
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, registry: Optional[RemoteRegistry] = None):
         self.name = name
+        self.registry = registry or get_remote_registry()
 
     def set_property(self, name: str, value: Any):
-        RemoteNode.notify_property_change(name, value)
+        self.registry.notify_property_change(name, value)
 
     def notify_signal(self, name: str, args: list[Any]):
-        RemoteNode.notify_signal(name, args)
+        self.registry.notify_signal(name, args)
 
     def olink_object_name(self) -> str:
         return self.name
@@ -31,12 +32,12 @@ class MockSource(IObjectSource):
         if not path in self.properties:
             # assign new value
             self.properties[path] = value
-            RemoteNode.notify_property_change(name, value)
+            self.registry.notify_property_change(name, value)
         else:
             # update existing value
             if not self.properties[path] == value:
                 self.properties[path] = value
-                RemoteNode.notify_property_change(name, value)
+                self.registry.notify_property_change(name, value)
 
     def olink_linked(self, name: str, node: RemoteNode):
         self.events.append({"type": "linked", "name": name})
@@ -1,4 +1,10 @@
 from .source import IObjectSource as IObjectSource
 from .registry import RemoteRegistry as RemoteRegistry
 from .registry import get_remote_registry as get_remote_registry
-from .node import RemoteNode as RemoteNode
\ No newline at end of file
+from .node import RemoteNode as RemoteNode
+from .conflation import PropertyConflator as PropertyConflator
+from .offload import InvokePool as InvokePool
+from .offload import InvokePoolFull as InvokePoolFull
+from .filter import SubscriptionFilter as SubscriptionFilter
+from .throttle import RateLimit as RateLimit
+from .signals import SignalBatcher as SignalBatcher
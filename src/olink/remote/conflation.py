@@ -0,0 +1,70 @@
+import time
+from typing import Any, Callable, Optional
+from olink.core import Base, Name
+from olink.core.timer import call_later
+
+SendPropertyFunc = Callable[[str, Any], None]
+
+
+class PropertyConflator(Base):
+    # latest value wins conflation of property changes
+    # a conflated name is either an object name (all properties of the source)
+    # or a property name, a property setting overrides the object setting.
+    # pending changes are grouped by interval and sent once per flush tick.
+    def __init__(self, send_func: SendPropertyFunc):
+        self.send_func = send_func
+        self.intervals: dict[str, float] = {}
+        self.pending: dict[float, dict[str, Any]] = {}
+        self.started: dict[float, float] = {}
+        self.timers: dict[float, Any] = {}
+        # number of changes replaced by a later value
+        self.conflated = 0
+
+    def set_interval(self, name: str, interval: Optional[float]) -> None:
+        # set the flush interval in seconds for a name, None removes conflation
+        self.flush()
+        if interval:
+            self.intervals[name] = interval
+        else:
+            self.intervals.pop(name, None)
+
+    def interval(self, name: str) -> Optional[float]:
+        # return the flush interval for a property name
+        interval = self.intervals.get(name)
+        if interval is None:
+            interval = self.intervals.get(Name.resource_from_name(name))
+        return interval
+
+    def conflate(self, name: str, value: Any) -> bool:
+        # keep the change as pending, returns false if the name is not conflated
+        if not self.intervals:
+            return False
+        interval = self.interval(name)
+        if interval is None:
+            return False
+        pending = self.pending.get(interval)
+        if pending is None:
+            pending = self.pending[interval] = {}
+            self.started[interval] = time.monotonic()
+            self.timers[interval] = call_later(interval, lambda: self.flush(interval))
+        elif name in pending:
+            self.conflated += 1
+        pending[name] = value
+        if not self.timers[interval]:
+            # without an event loop the interval is checked on every change
+            if time.monotonic() - self.started[interval] >= interval:
+                self.flush(interval)
+        return True
+
+    def flush(self, interval: Optional[float] = None) -> None:
+        # send the latest value of all pending changes, or of the given interval
+        intervals = list(self.pending) if interval is None else [interval]
+        for interval in intervals:
+            pending = self.pending.pop(interval, None)
+            self.started.pop(interval, None)
+            timer = self.timers.pop(interval, None)
+            if timer:
+                timer.cancel()
+            if pending:
+                for name, value in pending.items():
+                    self.send_func(name, value)
@@ -0,0 +1,37 @@
+from typing import Any, Iterable
+
+
+class SubscriptionFilter:
+    # property and signal paths a node subscribed to when linking an object
+    # a pattern ending with "*" matches all paths starting with the pattern
+    def __init__(self, patterns: Iterable[str]):
+        patterns = sorted(set(patterns))
+        self.paths = frozenset(p for p in patterns if not p.endswith("*"))
+        self.prefixes = tuple(p[:-1] for p in patterns if p.endswith("*"))
+        # identifies equal filters, used to cache trimmed init frames
+        self.key = tuple(patterns)
+
+    def matches(self, path: str) -> bool:
+        # true if the property or signal path is subscribed
+        if path in self.paths:
+            return True
+        return bool(self.prefixes) and path.startswith(self.prefixes)
+
+    def trim(self, props: Any) -> Any:
+        # return the subscribed properties of an init snapshot
+        if not isinstance(props, dict):
+            return props
+        return {key: value for key, value in props.items() if self.matches(key)}
+
+    @staticmethod
+    def from_options(options: Any) -> "SubscriptionFilter":
+        # returns the filter of link options, None if the options have no filter
+        # raises ValueError if the filter is not a list of paths
+        patterns = options.get("filter") if isinstance(options, dict) else None
+        if patterns is None:
+            return None
+        if not isinstance(patterns, list) or not all(
+            isinstance(pattern, str) for pattern in patterns
+        ):
+            raise ValueError(f"invalid subscription filter: {patterns!r}")
+        return SubscriptionFilter(patterns)
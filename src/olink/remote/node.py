@@ -1,78 +1,351 @@
-from typing import Any
-from olink.core import Protocol, BaseNode
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Optional
+from olink.core import (
+    LogLevel,
+    MsgType,
+    Name,
+    Protocol,
+    BaseNode,
+    MessageData,
+    MessageFormat,
+    SendQueue,
+)
+from .filter import SubscriptionFilter
+from .offload import InvokePool
 from .registry import RemoteRegistry, get_remote_registry
 from .source import IObjectSource
+from .throttle import RateLimit
 
 class RemoteNode(BaseNode):
     # a remote node is a node that is linked to a remote source
-    def __init__(self):
+    # maximum number of concurrently running awaitable invokes, None is unlimited
+    max_concurrent_invokes: Optional[int] = None
+
+    def __init__(
+        self,
+        format: MessageFormat = MessageFormat.JSON,
+        max_concurrent_invokes: Optional[int] = None,
+        registry: Optional[RemoteRegistry] = None,
+    ):
         # initialise node and attaches this node to registry
-        super().__init__()
+        # without a registry the node uses the global registry
+        super().__init__(format)
+        self._registry = registry or get_remote_registry()
+        self.max_concurrent_invokes = max_concurrent_invokes
+        self.invoke_tasks: set[asyncio.Task] = set()
+        self._invoke_semaphore: Optional[asyncio.Semaphore] = None
+        # throttled properties by name, [time of the last sent change, pending change]
+        self.throttled: dict[str, list[Any]] = {}
 
     def detach(self):
-        # detach this node from registry
+        # detach this node from registry and cancel running invokes
         self.registry().remove_node(self)
+        self.throttled.clear()
+        for task in list(self.invoke_tasks):
+            task.cancel()
+
+    def set_send_queue(self, queue: Optional[SendQueue]) -> None:
+        # a dropped property change or patch breaks the patches of the property,
+        # the queue replaces its next patch by the full value
+        super().set_send_queue(queue)
+        if queue and not queue.on_drop:
+            queue.on_drop = self._full_change
+
+    def _full_change(self, queue: SendQueue, name: str) -> Optional[MessageData]:
+        # returns the encoded full change of a patched property, None if unknown
+        msg = self.registry().full_change_message(name)
+        return self.converter.to_string(msg) if msg else None
+
+    def throttle_property_change(
+        self, name: str, msg: list[Any], interval: float
+    ) -> None:
+        # send a property change at most once per interval (seconds), the latest
+        # change within an interval is sent when the interval has passed
+        wheel = self.registry().get_timer_wheel()
+        if not wheel.handle:
+            # without a running loop due changes are sent on the next change
+            wheel.advance()
+        now = time.monotonic()
+        state = self.throttled.get(name)
+        if state is None:
+            self.throttled[name] = [now, None]
+            self.emit_write(msg)
+            return
+        if state[1] is None and now - state[0] >= interval:
+            state[0] = now
+            self.emit_write(msg)
+            return
+        if state[1] is None:
+            wheel.schedule(
+                state[0] + interval - now, lambda: self._send_throttled(name)
+            )
+        state[1] = msg
 
-    def handle_link(self, name: str) -> None:
+    def _send_throttled(self, name: str) -> None:
+        # send the pending change of a throttled property
+        state = self.throttled.get(name)
+        if state and state[1] is not None:
+            msg = state[1]
+            state[0] = time.monotonic()
+            state[1] = None
+            self.emit_write(msg)
+
+    def handle_link(self, name: str, options: Optional[dict[str, Any]] = None) -> None:
         # handle link message from client node
-        # sends init message to client node
-        source = RemoteNode.get_source(name)
+        # sends init message to client node, trimmed to the subscription filter
+        # of the options
+        data = self._link(name, options)
+        if data is not None:
+            if self.metrics:
+                self.metrics.count_out(MsgType.INIT)
+            self.write_data(data)
+
+    def handle_multi_link(self, names: list[str]) -> None:
+        # handle multi link message from client node
+        # sends the init messages of all linked names as one multi init message,
+        # which is also sent without init messages to confirm the multi link
+        frames = []
+        for name in names:
+            data = self._link(name)
+            if data is not None:
+                frames.append(data)
+        if self.can_write():
+            if self.metrics:
+                self.metrics.count_out(MsgType.MULTI_INIT)
+            self.write_data(self.converter.join_frames(MsgType.MULTI_INIT, frames))
+
+    def _link(
+        self, name: str, options: Optional[dict[str, Any]] = None
+    ) -> Optional[MessageData]:
+        # link the named source, returns the encoded init message
+        registry = self.registry()
+        source = registry.get_source(name)
         if source:
-            self.registry().add_node_to_source(name, self)
-            source.olink_linked(name, self)
-            props = source.olink_collect_properties()
-            self.emit_write(Protocol.init_message(name, props))
+            try:
+                filter = SubscriptionFilter.from_options(options)
+                rate_limit = RateLimit.from_options(options)
+                patch = options.get("patch", False) if options else False
+                if not isinstance(patch, bool):
+                    raise ValueError(f"invalid patch option: {patch!r}")
+            except ValueError as e:
+                self.emit_log(LogLevel.WARNING, "link failed: %s %s", name, e)
+                self.emit_write(Protocol.error_message(MsgType.LINK, 0, str(e)))
+                return None
+            registry.add_node_to_source(name, self, filter, rate_limit, patch)
+            if self.tracer:
+                self.trace_call(MsgType.LINK, name, source.olink_linked, name, self)
+            else:
+                source.olink_linked(name, self)
+            if self.can_write():
+                return registry.init_frame(name, self.converter, filter)
+            self.emit_log(LogLevel.DEBUG, "write not set on protocol: %s", name)
+        return None
 
     def handle_unlink(self, name: str):
         # unlinks names source from registry
-        source = self.get_source(name)
+        source = self.registry().get_source(name)
         if source:
-            source.olink_unlinked(name, self)
+            if self.tracer:
+                self.trace_call(MsgType.UNLINK, name, source.olink_unlinked, name, self)
+            else:
+                source.olink_unlinked(name, self)
             self.registry().remove_node_from_source(name, self)
+            if self.throttled:
+                resource = Name.resource_from_name(name)
+                for key in [
+                    key for key in self.throttled if key.startswith(resource + "/")
+                ]:
+                    del self.throttled[key]
 
     def handle_set_property(self, name: str, value: Any):
         # handle set property message from client node
         # calls set property on source
-        source = self.get_source(name)
+        source = self.registry().get_source(name)
         if source:
-            source.olink_set_property(name, value)
+            if self.tracer:
+                self.trace_call(
+                    MsgType.SET_PROPERTY, name, source.olink_set_property, name, value
+                )
+            else:
+                source.olink_set_property(name, value)
 
     def handle_invoke(self, id: int, name: str, args: list[Any]) -> None:
         # handle invoke message from client node
         # calls invoke on source
         # returns invoke reply message to client node
-        source = self.get_source(name)
+        # an awaitable result runs concurrently and replies when completed
+        source = self.registry().get_source(name)
         if source:
-            value = source.olink_invoke(name, args)
+            pool = self.registry().get_invoke_pool(name)
+            if pool:
+                self.offload_invoke(pool, source, id, name, args)
+                return
+            try:
+                if self.tracer:
+                    value = self.trace_call(
+                        MsgType.INVOKE, name, source.olink_invoke, name, args
+                    )
+                else:
+                    value = source.olink_invoke(name, args)
+            except Exception as e:
+                self.emit_invoke_error(id, name, e)
+                return
+            if inspect.isawaitable(value):
+                self.schedule_invoke(id, name, value)
+            else:
+                self.emit_write(Protocol.invoke_reply_message(id, name, value))
+
+    def offload_invoke(
+        self,
+        pool: InvokePool,
+        source: IObjectSource,
+        id: int,
+        name: str,
+        args: list[Any],
+    ) -> None:
+        # run the invoke on the pool and reply on the running loop
+        # without a running loop the reply is written from the pool thread
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        try:
+            future = pool.submit(source.olink_invoke, name, args)
+        except Exception as e:
+            # a full queue or an executor which does not accept invokes
+            self.emit_invoke_error(id, name, e)
+            return
+        if loop:
+            self.schedule_invoke(id, name, asyncio.wrap_future(future, loop=loop))
+        else:
+            future.add_done_callback(
+                lambda future: self._reply_future(id, name, future)
+            )
+
+    def _reply_future(self, id: int, name: str, future) -> None:
+        # reply with the result of a completed concurrent future
+        error = "cancelled" if future.cancelled() else future.exception()
+        if error:
+            self.emit_invoke_error(id, name, error)
+        else:
+            self.emit_write(Protocol.invoke_reply_message(id, name, future.result()))
+
+    def schedule_invoke(self, id: int, name: str, awaitable: Awaitable) -> None:
+        # run an awaitable invoke as task on the running loop
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError as e:
+            # no running event loop to run the invoke
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            self.emit_invoke_error(id, name, e)
+            return
+        task = loop.create_task(self._run_invoke(id, name, awaitable))
+        self.invoke_tasks.add(task)
+        task.add_done_callback(self.invoke_tasks.discard)
+
+    async def _run_invoke(self, id: int, name: str, awaitable: Awaitable) -> None:
+        # await the invoke, limited by max_concurrent_invokes, and send the reply
+        try:
+            if self.max_concurrent_invokes:
+                if not self._invoke_semaphore:
+                    self._invoke_semaphore = asyncio.Semaphore(
+                        self.max_concurrent_invokes
+                    )
+                async with self._invoke_semaphore:
+                    value = await awaitable
+            else:
+                value = await awaitable
+        except Exception as e:
+            self.emit_invoke_error(id, name, e)
+        else:
             self.emit_write(Protocol.invoke_reply_message(id, name, value))
 
+    def emit_invoke_error(self, id: int, name: str, error: Exception) -> None:
+        # reply a failed invoke with an error message
+        self.emit_log(LogLevel.ERROR, "invoke failed: %s %s %s", id, name, error)
+        self.emit_write(Protocol.error_message(MsgType.INVOKE, id, str(error)))
+
     def registry(self) -> RemoteRegistry:
-        # returns global registry
-        return get_remote_registry()
+        # returns the registry of this node
+        return self._registry
 
     @staticmethod
     def get_source(name) -> IObjectSource:
-        # get object source from registry
+        # get object source from global registry
         return get_remote_registry().get_source(name)
 
     @staticmethod
     def register_source(source: IObjectSource):
-        # add object source to registry
+        # add object source to global registry
         return get_remote_registry().add_source(source)
 
     @staticmethod
     def unregister_source(source: IObjectSource):
-        # remove object source from registry
+        # remove object source from global registry
         return get_remote_registry().remove_source(source)
 
+    @staticmethod
+    def offload(name: str, pool: Optional[InvokePool]) -> None:
+        # run invokes of an object or a single method on the pool
+        # a pool of None runs the invokes again on the calling thread
+        get_remote_registry().set_invoke_pool(name, pool)
+
+    @staticmethod
+    def invalidate_snapshot(name: str) -> None:
+        # drop the cached init frames of a source of the global registry
+        get_remote_registry().invalidate_snapshot(name)
+
     @staticmethod
     def notify_property_change(name: str, value: Any) -> None:
-        # notify property change to all named client nodes
-        for node in get_remote_registry().get_nodes(name):
-            node.emit_write(Protocol.property_change_message(name, value))
+        # notify property change to all named client nodes of the global registry
+        get_remote_registry().notify_property_change(name, value)
+
+    @staticmethod
+    def send_property_change(name: str, value: Any) -> None:
+        # send property change to all named client nodes, bypassing conflation
+        get_remote_registry().send_property_change(name, value)
+
+    @staticmethod
+    def set_conflation(name: str, interval: Optional[float]) -> None:
+        # send only the latest value of property changes once per interval (seconds)
+        # name is an object name for all properties or a single property name
+        # an interval of None disables conflation for the name
+        get_remote_registry().set_conflation(name, interval)
+
+    @staticmethod
+    def set_patching(name: str, enabled: bool) -> None:
+        # send changes of an object or a single property as patch of the last value
+        get_remote_registry().set_patching(name, enabled)
+
+    @staticmethod
+    def flush_property_changes() -> None:
+        # send all pending conflated property changes
+        get_remote_registry().flush_property_changes()
 
     @staticmethod
     def notify_signal(name: str, args: list[Any]):
-        # notify signal to all named client nodes
-        for node in get_remote_registry().get_nodes(name):
-            node.emit_write(Protocol.signal_message(name, args))
+        # notify signal to all named client nodes of the global registry
+        get_remote_registry().notify_signal(name, args)
+
+    @staticmethod
+    def set_signal_batching(
+        name: str,
+        enabled: bool,
+        max_events: Optional[int] = 100,
+        max_delay: float = 0.01,
+        capacity: int = 1000,
+    ) -> None:
+        # send signals of an object or a single signal as batches of max_events
+        # or after max_delay (seconds), at most capacity events are kept pending
+        # and the oldest are dropped first
+        get_remote_registry().set_signal_batching(
+            name, enabled, max_events, max_delay, capacity
+        )
+
+    @staticmethod
+    def flush_signals() -> None:
+        # send all pending batched signals
+        get_remote_registry().flush_signals()
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from olink.core import Base
+
+
+class InvokePoolFull(Exception):
+    # raised when an invoke pool reached its queue depth limit
+    pass
+
+
+class InvokePool(Base):
+    # runs blocking source invokes on a concurrent.futures executor
+    # max_queue limits the number of submitted but not completed invokes
+    # with a ProcessPoolExecutor the source is pickled for every invoke,
+    # so it needs to be picklable and state changes stay in the worker process
+    def __init__(
+        self, executor: Optional[Executor] = None, max_queue: Optional[int] = None
+    ):
+        self.executor = executor or ThreadPoolExecutor(thread_name_prefix="olink")
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.pending = 0
+        self.max_pending = 0
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        # submit func to the executor, raises InvokePoolFull if the queue is full
+        with self._lock:
+            if self.max_queue is not None and self.pending >= self.max_queue:
+                self.rejected += 1
+                raise InvokePoolFull(f"invoke queue full: {self.pending}")
+            self.submitted += 1
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            # e.g. a shut down executor, the invoke never runs
+            with self._lock:
+                self.submitted -= 1
+                self.pending -= 1
+                self.rejected += 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        # update stats when an invoke completed
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception():
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def stats(self) -> dict[str, int]:
+        # returns a snapshot of the pool counters
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        # shutdown the executor
+        self.executor.shutdown(wait=wait)
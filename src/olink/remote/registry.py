@@ -1,25 +1,88 @@
-from olink.core import Base, LogLevel, Name
+from typing import Any, Optional
+from olink.core import (
+    Base,
+    BaseNode,
+    LogLevel,
+    MessageConverter,
+    MessageData,
+    Metrics,
+    MsgType,
+    Name,
+    Protocol,
+)
+from olink.core.timer import TimerWheel
+from olink.core.patch import apply, copy_value, diff
+from .conflation import PropertyConflator
+from .filter import SubscriptionFilter
+from .offload import InvokePool
+from .signals import SignalBatcher
+from .throttle import RateLimit
 from .source import IObjectSource
 
+_missing = object()
+
+
 class SourceToNodeEntry:
     # entry in the remote registry
     source: IObjectSource = None
     nodes: set["RemoteNode"] = set()
+    # encoded init frames by linked name and message format
+    snapshots: dict[tuple, MessageData] = {}
+    # incremented on every property change of the source
+    version: int = 0
+    # subscription filters of the nodes linked with a filter
+    filters: dict["RemoteNode", SubscriptionFilter] = {}
+    # rate limits of the nodes linked with a maximum rate
+    rate_limits: dict["RemoteNode", RateLimit] = {}
+    # nodes linked with patch, they receive changes of patched properties as
+    # PROPERTY_PATCH messages
+    patch_nodes: set["RemoteNode"] = set()
 
     def __init__(self, source=None):
         self.source = source
         self.nodes = set()
+        self.snapshots = {}
+        self.version = 0
+        self.filters = {}
+        self.rate_limits = {}
+        self.patch_nodes = set()
 
 
 class RemoteRegistry(Base):
     # registry of remote sources
-    # links sources to nodes
+    # links sources to nodes, each registry is an isolated set of sources
     entries: dict[str, SourceToNodeEntry] = {}
+    # conflation of property changes, created on first use
+    conflator: PropertyConflator = None
+    # collects the fan-out of property changes and signals if set
+    metrics: Metrics = None
+    # timers of throttled property changes, created on first use
+    timer_wheel: TimerWheel = None
+
+    def __init__(self, cache_snapshots: bool = False):
+        # with cache_snapshots the encoded init frame of a source is reused for
+        # every link until a property change is notified, sources need to notify
+        # all property changes or call invalidate_snapshot
+        self.cache_snapshots = cache_snapshots
+        self.entries = {}
+        # reverse index of the resources a node is linked to
+        self.node_links: dict["RemoteNode", set[str]] = {}
+        # invoke pools by object name or method name
+        self.invoke_pools: dict[str, InvokePool] = {}
+        # object names or property names sending changes as patches
+        self.patch_names: set[str] = set()
+        # last sent value of patched properties, the base of the next patch
+        self.patch_values: dict[str, Any] = {}
+        # signal batching settings (max_events, max_delay, capacity) by object
+        # name or signal name
+        self.signal_batching: dict[str, tuple[Optional[int], float, int]] = {}
+        # batchers of the emitted batched signals by signal name
+        self.signal_batchers: dict[str, SignalBatcher] = {}
 
     def add_source(self, source: IObjectSource):
         # add a source to registry by object name
         name = source.olink_object_name()
-        self.emit_log(LogLevel.DEBUG, f"RemoteRegistry.add_object_source: {name}")
+        self.emit_log(LogLevel.DEBUG, "RemoteRegistry.add_object_source: %s", name)
         self._entry(name).source = source
 
     def remove_source(self, source: IObjectSource):
@@ -31,30 +94,333 @@ class RemoteRegistry(Base):
         # return the source for the given name
         return self._entry(name).source
 
+    def set_invoke_pool(self, name: str, pool: Optional[InvokePool]):
+        # offload invokes of an object or a single method to the pool, None removes it
+        if pool:
+            self.invoke_pools[name] = pool
+        else:
+            self.invoke_pools.pop(name, None)
+
+    def get_invoke_pool(self, name: str) -> Optional[InvokePool]:
+        # return the pool for a method name, a method pool overrides an object pool
+        pools = self.invoke_pools
+        if not pools:
+            return None
+        pool = pools.get(name)
+        if pool is None:
+            pool = pools.get(Name.resource_from_name(name))
+        return pool
+
     def get_nodes(self, name: str):
         # return nodes attached to the named source
         return self._entry(name).nodes
 
+    def get_subscribed_nodes(self, name: str):
+        # return nodes attached to the named source without nodes which filtered
+        # out the named property or signal
+        return self._subscribed_nodes(self._entry(name), name)
+
+    def _subscribed_nodes(self, entry: SourceToNodeEntry, name: str):
+        nodes = entry.nodes
+        filters = entry.filters
+        if filters and nodes:
+            path = Name.path_from_name(name)
+            nodes = [
+                node
+                for node in nodes
+                if node not in filters or filters[node].matches(path)
+            ]
+        return nodes
+
+    def notify_property_change(self, name: str, value: Any) -> None:
+        # notify property change to all named nodes, conflated if enabled
+        self.invalidate_snapshot(name)
+        conflator = self.conflator
+        if conflator and conflator.conflate(name, value):
+            return
+        self._send_property_change(name, value)
+
+    def send_property_change(self, name: str, value: Any) -> None:
+        # send property change to all named nodes, bypassing conflation
+        self.invalidate_snapshot(name)
+        self._send_property_change(name, value)
+
+    def _send_property_change(self, name: str, value: Any) -> None:
+        # send property change, the snapshot is already invalidated
+        entry = self._entry(name)
+        if self.patch_names and self.is_patched(name):
+            if entry.patch_nodes:
+                msg = self._patch_message(name, value)
+                if msg is None:
+                    return
+            else:
+                # no node takes patches, the next patch needs a new base
+                self.patch_values.pop(name, None)
+                msg = Protocol.property_change_message(name, value)
+        else:
+            msg = Protocol.property_change_message(name, value)
+        nodes = self._subscribed_nodes(entry, name)
+        if self.metrics:
+            self.metrics.observe_fanout(len(nodes))
+        if nodes:
+            if entry.rate_limits:
+                nodes = self._throttle(entry.rate_limits, nodes, name, value, msg)
+            if msg[0] == MsgType.PROPERTY_PATCH:
+                # nodes linked without patch get the full value
+                full = [node for node in nodes if node not in entry.patch_nodes]
+                if full:
+                    change = Protocol.property_change_message(name, value)
+                    BaseNode.broadcast(full, change)
+                    nodes = [node for node in nodes if node in entry.patch_nodes]
+            BaseNode.broadcast(nodes, msg)
+
+    def _throttle(self, rate_limits, nodes, name: str, value: Any, msg: list[Any]):
+        # pass the change to the nodes with a rate limit for the property and
+        # return the other nodes, throttled nodes skip changes so they always
+        # get the full value instead of a patch
+        path = Name.path_from_name(name)
+        direct = []
+        change = None
+        for node in nodes:
+            limit = rate_limits.get(node)
+            interval = limit.get_interval(path) if limit else None
+            if interval:
+                if change is None:
+                    change = msg
+                    if msg[0] != MsgType.PROPERTY_CHANGE:
+                        change = Protocol.property_change_message(name, value)
+                node.throttle_property_change(name, change, interval)
+            else:
+                direct.append(node)
+        return direct
+
+    def get_timer_wheel(self) -> TimerWheel:
+        # returns the timer wheel of throttled property changes
+        if not self.timer_wheel:
+            self.timer_wheel = TimerWheel()
+        return self.timer_wheel
+
+    def set_patching(self, name: str, enabled: bool) -> None:
+        # send changes of an object or a single property as patch of the last value
+        # to the nodes linked with patch, the other nodes get the full value
+        if enabled:
+            self.patch_names.add(name)
+        else:
+            self.patch_names.discard(name)
+            for key in [key for key in self.patch_values if not self.is_patched(key)]:
+                del self.patch_values[key]
+
+    def is_patched(self, name: str) -> bool:
+        # true if changes of the property are sent as patches
+        names = self.patch_names
+        return name in names or Name.resource_from_name(name) in names
+
+    def full_change_message(self, name: str) -> Optional[list[Any]]:
+        # returns a change message of the last sent value of a patched property,
+        # sent in place of a patch that misses its base, None if there is no value
+        value = self.patch_values.get(name, _missing)
+        if value is _missing:
+            return None
+        return Protocol.property_change_message(name, value)
+
+    def _patch_message(self, name: str, value: Any) -> Optional[list[Any]]:
+        # return a patch message against the last sent value, a change message
+        # if there is no last value and None if the value did not change
+        old = self.patch_values.get(name, _missing)
+        if old is _missing:
+            self.patch_values[name] = copy_value(value)
+            return Protocol.property_change_message(name, value)
+        ops = diff(old, value)
+        if not ops:
+            return None
+        # the stored value is updated copy-on-write, ops may share the source values
+        self.patch_values[name] = apply(old, copy_value(ops))
+        if len(ops) == 1 and not ops[0][0]:
+            # the value was replaced as a whole
+            return Protocol.property_change_message(name, value)
+        return Protocol.property_patch_message(name, ops)
+
+    def notify_signal(self, name: str, args: list[Any]) -> None:
+        # notify signal to all named nodes, batched if enabled
+        if self.signal_batching:
+            batcher = self.get_signal_batcher(name)
+            if batcher:
+                batcher.add(args)
+                return
+        nodes = self.get_subscribed_nodes(name)
+        if self.metrics:
+            self.metrics.observe_fanout(len(nodes))
+        if nodes:
+            BaseNode.broadcast(nodes, Protocol.signal_message(name, args))
+
+    def send_signal_batch(self, name: str, batch: list[list[Any]]) -> None:
+        # send the args of several emits of a signal to all named nodes
+        nodes = self.get_subscribed_nodes(name)
+        if self.metrics:
+            self.metrics.observe_fanout(len(nodes))
+        if nodes:
+            BaseNode.broadcast(nodes, Protocol.signal_batch_message(name, batch))
+
+    def set_signal_batching(
+        self,
+        name: str,
+        enabled: bool,
+        max_events: Optional[int] = 100,
+        max_delay: float = 0.01,
+        capacity: int = 1000,
+    ) -> None:
+        # batch the signals of an object or a single signal, see SignalBatcher
+        # linked clients need to support SIGNAL_BATCH messages
+        # disabling sends the pending events of the name
+        batchers = self.signal_batchers
+        for key in [
+            key for key in batchers if key == name or key.startswith(name + "/")
+        ]:
+            batchers.pop(key).flush()
+        if enabled:
+            self.signal_batching[name] = (max_events, max_delay, capacity)
+        else:
+            self.signal_batching.pop(name, None)
+
+    def get_signal_batcher(self, name: str) -> Optional[SignalBatcher]:
+        # return the batcher of a signal name, a signal setting overrides an
+        # object setting, None if the signal is not batched
+        batcher = self.signal_batchers.get(name)
+        if batcher is None:
+            settings = self.signal_batching.get(name)
+            if settings is None:
+                settings = self.signal_batching.get(Name.resource_from_name(name))
+            if settings is None:
+                return None
+            batcher = SignalBatcher(name, self.send_signal_batch, *settings)
+            self.signal_batchers[name] = batcher
+        return batcher
+
+    def flush_signals(self) -> None:
+        # send all pending batched signals
+        for batcher in self.signal_batchers.values():
+            batcher.flush()
+
+    def set_metrics(self, metrics: Optional[Metrics]) -> None:
+        # collect the fan-out of property changes and signals, None disables it
+        self.metrics = metrics
+
+    def init_frame(
+        self,
+        name: str,
+        converter: MessageConverter,
+        filter: Optional[SubscriptionFilter] = None,
+    ) -> MessageData:
+        # return the encoded init message of the named source, trimmed to the filter
+        # the frame is cached per property version if cache_snapshots is enabled
+        entry = self._entry(name)
+        if not self.cache_snapshots:
+            return converter.to_string(self._init_message(entry, name, filter))
+        key = (name, converter.format, filter.key if filter else None)
+        data = entry.snapshots.get(key)
+        if data is None:
+            data = converter.to_string(self._init_message(entry, name, filter))
+            entry.snapshots[key] = data
+        return data
+
+    def _init_message(
+        self, entry: SourceToNodeEntry, name: str, filter: Optional[SubscriptionFilter]
+    ) -> list[Any]:
+        props = entry.source.olink_collect_properties()
+        if filter:
+            props = filter.trim(props)
+        return Protocol.init_message(name, props)
+
+    def invalidate_snapshot(self, name: str) -> None:
+        # drop the cached init frames of the named source and bump its version
+        entry = self.entries.get(Name.resource_from_name(name))
+        if entry:
+            entry.version += 1
+            if entry.snapshots:
+                entry.snapshots.clear()
+
+    def snapshot_version(self, name: str) -> int:
+        # return the property version of the named source
+        return self._entry(name).version
+
+    def set_conflation(self, name: str, interval: Optional[float]) -> None:
+        # conflate property changes of an object or a single property
+        # an interval of None disables conflation for the name
+        if not self.conflator:
+            self.conflator = PropertyConflator(self._send_property_change)
+        self.conflator.set_interval(name, interval)
+
+    def flush_property_changes(self) -> None:
+        # send all pending conflated property changes
+        if self.conflator:
+            self.conflator.flush()
+
     def remove_node(self, node: "RemoteNode"):
-        # remove the given node from the registry
+        # remove the given node from all sources it is linked to
         self.emit_log(LogLevel.DEBUG, "RemoteRegistry.detach_remote_node")
-        for entry in self.entries.values():
-            if node in entry.nodes:
-                entry.nodes.remove(node)
+        for resource in self.node_links.pop(node, ()):
+            entry = self.entries.get(resource)
+            if entry:
+                entry.nodes.discard(node)
+                if entry.filters:
+                    entry.filters.pop(node, None)
+                if entry.rate_limits:
+                    entry.rate_limits.pop(node, None)
+                entry.patch_nodes.discard(node)
 
-    def add_node_to_source(self, name: str, node: "RemoteNode"):
-        # add a node to the named source
-        self._entry(name).nodes.add(node)
+    def add_node_to_source(
+        self,
+        name: str,
+        node: "RemoteNode",
+        filter: Optional[SubscriptionFilter] = None,
+        rate_limit: Optional[RateLimit] = None,
+        patch: bool = False,
+    ):
+        # add a node to the named source, with a filter the node only receives
+        # the subscribed property changes and signals, with a rate limit the
+        # property changes are throttled by the node, with patch the node
+        # receives changes of patched properties as patches
+        entry = self._entry(name)
+        entry.nodes.add(node)
+        if filter:
+            entry.filters[node] = filter
+        elif entry.filters:
+            entry.filters.pop(node, None)
+        if rate_limit:
+            entry.rate_limits[node] = rate_limit
+        elif entry.rate_limits:
+            entry.rate_limits.pop(node, None)
+        if patch:
+            # the node starts from the init values, the next changes are sent in full
+            entry.patch_nodes.add(node)
+            prefix = Name.resource_from_name(name) + "/"
+            for key in [key for key in self.patch_values if key.startswith(prefix)]:
+                del self.patch_values[key]
+        else:
+            entry.patch_nodes.discard(node)
+        links = self.node_links.get(node)
+        if links is None:
+            links = self.node_links[node] = set()
+        links.add(Name.resource_from_name(name))
 
     def remove_node_from_source(self, name: str, node: "RemoteNode"):
         # remove the given node from the named source
-        self._entry(name).nodes.remove(node)
+        entry = self._entry(name)
+        entry.nodes.remove(node)
+        entry.filters.pop(node, None)
+        entry.rate_limits.pop(node, None)
+        entry.patch_nodes.discard(node)
+        links = self.node_links.get(node)
+        if links:
+            links.discard(Name.resource_from_name(name))
+            if not links:
+                del self.node_links[node]
 
     def _entry(self, name: str) -> SourceToNodeEntry:
         # returns the entry for the given resource part of the name
         resource = Name.resource_from_name(name)
         if not resource in self.entries:
-            self.emit_log(LogLevel.DEBUG, f"add new resource: {resource}")
+            self.emit_log(LogLevel.DEBUG, "add new resource: %s", resource)
             self.entries[resource] = SourceToNodeEntry()
         return self.entries[resource]
 
@@ -66,7 +432,7 @@ class RemoteRegistry(Base):
         else:
             self.emit_log(
                 LogLevel.DEBUG,
-                f"remove resource failed, resource not exists: {resource}",
+                "remove resource failed, resource not exists: %s", resource,
             )
 
     def _has_entry(self, name: str) -> SourceToNodeEntry:
@@ -82,11 +448,13 @@ class RemoteRegistry(Base):
 
     def clear(self):
         self.entries = {}
+        self.node_links = {}
 
 
+# global remote registry, used by nodes created without a registry
 _registry = RemoteRegistry()
 
 
 def get_remote_registry() -> RemoteRegistry:
-    # returns the remote registry
+    # returns the global remote registry
     return _registry
@@ -0,0 +1,60 @@
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+from olink.core import Base
+from olink.core.timer import call_later
+
+SendBatchFunc = Callable[[str, list[list[Any]]], None]
+
+
+class SignalBatcher(Base):
+    # collects the args of a high-frequency signal in a bounded ring buffer and
+    # sends them as one signal batch message, when max_events are pending or
+    # max_delay (seconds) has passed since the first pending event.
+    # a full buffer drops the oldest event, dropped counts the lost events.
+    def __init__(
+        self,
+        name: str,
+        send_func: SendBatchFunc,
+        max_events: Optional[int] = 100,
+        max_delay: float = 0.01,
+        capacity: int = 1000,
+    ):
+        self.name = name
+        self.send_func = send_func
+        self.max_events = max_events
+        self.max_delay = max_delay
+        self.events: deque[list[Any]] = deque(maxlen=capacity)
+        self.started = 0.0
+        self.timer = None
+        # number of events dropped from a full buffer
+        self.dropped = 0
+        # number of sent batches
+        self.batches = 0
+
+    def add(self, args: list[Any]) -> None:
+        # add the args of an emitted signal to the pending batch
+        events = self.events
+        if not events:
+            self.started = time.monotonic()
+            self.timer = call_later(self.max_delay, self.flush)
+        elif len(events) == events.maxlen:
+            self.dropped += 1
+        events.append(args)
+        if self.max_events and len(events) >= self.max_events:
+            self.flush()
+        elif not self.timer:
+            # without an event loop the delay is checked on every event
+            if time.monotonic() - self.started >= self.max_delay:
+                self.flush()
+
+    def flush(self) -> None:
+        # send the pending events as one batch
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        if self.events:
+            batch = list(self.events)
+            self.events.clear()
+            self.batches += 1
+            self.send_func(self.name, batch)
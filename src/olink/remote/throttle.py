@@ -0,0 +1,47 @@
+from numbers import Real
+from typing import Any, Optional
+
+
+def _valid_rate(rate: Any) -> bool:
+    return isinstance(rate, Real) and not isinstance(rate, bool) and rate > 0
+
+
+class RateLimit:
+    # maximum property change rates (changes per second) a node requested when
+    # linking an object, rate applies to all properties and rates to single
+    # property paths, a property rate overrides the object rate
+    def __init__(
+        self, rate: Optional[float] = None, rates: Optional[dict[str, float]] = None
+    ):
+        self.interval = 1.0 / rate if rate else None
+        self.intervals = {path: 1.0 / value for path, value in (rates or {}).items()}
+
+    def get_interval(self, path: str) -> Optional[float]:
+        # returns the minimum seconds between two changes of the property
+        if self.intervals:
+            interval = self.intervals.get(path)
+            if interval is not None:
+                return interval
+        return self.interval
+
+    @staticmethod
+    def from_options(options: Any) -> "RateLimit":
+        # returns the rate limit of link options, None if the options have none
+        # raises ValueError if a rate is not a positive number
+        if not isinstance(options, dict):
+            return None
+        rate = options.get("rate")
+        rates = options.get("rates")
+        if rate is None and rates is None:
+            return None
+        if rate is not None and not _valid_rate(rate):
+            raise ValueError(f"invalid rate: {rate!r}")
+        if rates is not None and not (
+            isinstance(rates, dict)
+            and all(
+                isinstance(path, str) and _valid_rate(value)
+                for path, value in rates.items()
+            )
+        ):
+            raise ValueError(f"invalid rates: {rates!r}")
+        return RateLimit(rate, rates)
@@ -0,0 +1,70 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional
+from olink.client import ClientNode
+from olink.core import Base, LogLevel
+
+
+class Backoff:
+    # exponential backoff with full jitter
+    # the delay of an attempt is random between 0 and initial * factor ** attempt,
+    # limited to maximum, the jitter spreads the reconnects of many clients
+    def __init__(
+        self, initial: float = 0.1, maximum: float = 30.0, factor: float = 2.0
+    ):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.attempt = 0
+
+    def next(self) -> float:
+        # returns the delay before the next attempt
+        delay = min(self.maximum, self.initial * self.factor**self.attempt)
+        self.attempt += 1
+        return random.uniform(0, delay)
+
+    def reset(self) -> None:
+        # start again with the initial delay, called after a successful connect
+        self.attempt = 0
+
+
+class Reconnector(Base):
+    # keeps a client node connected, the connection is opened again after it
+    # was lost or failed to open, with a backoff delay between the attempts
+    # the node links its resources again and replays invokes on every connect,
+    # see ClientNode.handle_connect and ClientNode.handle_disconnect
+    def __init__(
+        self,
+        node: ClientNode,
+        connect: Callable[[], Awaitable[None]],
+        wait_closed: Callable[[], Awaitable[None]],
+        backoff: Optional[Backoff] = None,
+    ):
+        self.node = node
+        self.connect = connect
+        self.wait_closed = wait_closed
+        self.backoff = backoff or Backoff()
+        self.stopped = False
+        self.connects = 0
+
+    async def run(self) -> None:
+        # connect until stop is called
+        self.stopped = False
+        while not self.stopped:
+            try:
+                await self.connect()
+            except Exception as e:
+                self.emit_log(LogLevel.INFO, "connect failed: %s", e)
+                await asyncio.sleep(self.backoff.next())
+                continue
+            self.connects += 1
+            self.backoff.reset()
+            self.node.handle_connect()
+            await self.wait_closed()
+            self.node.handle_disconnect()
+            if not self.stopped:
+                await asyncio.sleep(self.backoff.next())
+
+    def stop(self) -> None:
+        # stop reconnecting, the current connection is closed by the client
+        self.stopped = True
@@ -0,0 +1,320 @@
+import asyncio
+import struct
+from typing import Any, Callable, Optional
+from olink.client import ClientNode
+from olink.core import (
+    Base,
+    BaseNode,
+    LogLevel,
+    MessageFormat,
+    Metrics,
+    OverflowPolicy,
+    SendQueue,
+)
+from olink.remote import RemoteNode, RemoteRegistry
+from .reconnect import Backoff, Reconnector
+
+# frames are prefixed with their payload size as unsigned 32 bit big endian
+_header = struct.Struct(">I")
+HEADER_SIZE = _header.size
+
+# creates the send queue of a connection
+QueueFactory = Callable[[], SendQueue]
+
+
+class StreamConnection(asyncio.BufferedProtocol, Base):
+    # length prefixed frames over a stream transport (tcp or unix socket)
+    # the loop receives directly into a reusable buffer, complete frames of binary
+    # formats are handed to the node as memoryview slices of it without a copy and
+    # decoded before the buffer is reused. text frames are copied once to bytes
+    # and decoded from utf-8. outgoing frames are taken from the send queue of the
+    # node and written with their header in one writelines call. a blocked send
+    # queue pauses reading until the writer drained it
+    def __init__(
+        self,
+        node: BaseNode,
+        queue: SendQueue,
+        on_close: Optional[Callable[["StreamConnection"], None]] = None,
+        buffer_size: int = 65536,
+        max_frame_size: int = 16 * 1024 * 1024,
+    ):
+        self.node = node
+        self.queue = queue
+        self.on_close = on_close
+        self.max_frame_size = max_frame_size
+        self.binary = node.converter.binary
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        # unparsed bytes are buffer[start:end]
+        self.start = 0
+        self.end = 0
+        self.transport: Optional[asyncio.Transport] = None
+        self.closed: Optional[asyncio.Future] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._resume: Optional[asyncio.Future] = None
+        # true while reading is paused by a blocked send queue
+        self.reading_paused = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        loop = asyncio.get_running_loop()
+        self.closed = loop.create_future()
+        self.node.set_send_queue(self.queue)
+        self._writer = loop.create_task(self._send_frames())
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if exc:
+            self.emit_log(LogLevel.DEBUG, "connection lost: %s", exc)
+        self.queue.close()
+        if self._writer:
+            self._writer.cancel()
+        if self._resume and not self._resume.done():
+            self._resume.set_result(None)
+        if self.on_close:
+            self.on_close(self)
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        # return the free tail of the buffer, pending bytes are moved to the front
+        if self.end == len(self.buffer) and self.start:
+            size = self.end - self.start
+            self.buffer[:size] = self.view[self.start : self.end]
+            self.start = 0
+            self.end = size
+        if self.end == len(self.buffer):
+            # a frame larger than the buffer, grow it to the frame size
+            self._grow(max(len(self.buffer) * 2, self._frame_end() - self.start))
+        return self.view[self.end :]
+
+    def _frame_end(self) -> int:
+        # end of the pending frame in the buffer, the header is complete here
+        return (
+            self.start + HEADER_SIZE + _header.unpack_from(self.buffer, self.start)[0]
+        )
+
+    def _grow(self, size: int) -> None:
+        pending = self.view[self.start : self.end]
+        buffer = bytearray(size)
+        buffer[: len(pending)] = pending
+        pending.release()
+        self.view.release()
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.end -= self.start
+        self.start = 0
+
+    def buffer_updated(self, nbytes: int) -> None:
+        # dispatch all complete frames of the buffer
+        self.end += nbytes
+        view = self.view
+        start = self.start
+        end = self.end
+        handle = self.node.handle_message
+        binary = self.binary
+        while end - start >= HEADER_SIZE:
+            size = _header.unpack_from(self.buffer, start)[0]
+            if size > self.max_frame_size:
+                self.emit_log(LogLevel.ERROR, "frame too large: %s", size)
+                self.transport.close()
+                return
+            frame_end = start + HEADER_SIZE + size
+            if frame_end > end:
+                break
+            frame = view[start + HEADER_SIZE : frame_end]
+            start = frame_end
+            self.start = start
+            # text frames are passed as bytes, invalid utf-8 fails as decode error
+            handle(frame if binary else bytes(frame))
+            frame.release()
+        if start == end:
+            start = end = 0
+            self.end = 0
+        self.start = start
+        if self.queue.blocked and not self.reading_paused:
+            self.reading_paused = True
+            self.transport.pause_reading()
+
+    def eof_received(self) -> bool:
+        return False
+
+    def pause_writing(self) -> None:
+        self._resume = asyncio.get_running_loop().create_future()
+
+    def resume_writing(self) -> None:
+        if self._resume and not self._resume.done():
+            self._resume.set_result(None)
+        self._resume = None
+
+    async def _send_frames(self) -> None:
+        # writer task, writes all pending frames of the queue at once
+        queue = self.queue
+        pack = _header.pack
+        binary = self.binary
+        while True:
+            data = await queue.get()
+            chunks = []
+            while data is not None:
+                if not binary:
+                    data = data.encode("utf-8")
+                chunks.append(pack(len(data)))
+                chunks.append(data)
+                data = queue.pop()
+            self.transport.writelines(chunks)
+            if self._resume:
+                await self._resume
+            if self.reading_paused and not queue.blocked:
+                self.reading_paused = False
+                self.transport.resume_reading()
+
+    def close(self) -> None:
+        # close the transport, pending frames are flushed by the transport
+        if self.transport:
+            self.transport.close()
+
+
+class StreamServer(Base):
+    # tcp or unix socket server with a remote node per connection
+    # the node is detached when the connection closes
+    def __init__(
+        self,
+        registry: Optional[RemoteRegistry] = None,
+        format: MessageFormat = MessageFormat.JSON,
+        queue_factory: Optional[QueueFactory] = None,
+        max_concurrent_invokes: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        max_frame_size: int = 16 * 1024 * 1024,
+    ):
+        self.registry = registry
+        self.format = format
+        self.queue_factory = queue_factory or SendQueue
+        self.max_concurrent_invokes = max_concurrent_invokes
+        # metrics collector of the connection nodes
+        self.metrics = metrics
+        self.max_frame_size = max_frame_size
+        self.nodes: set[RemoteNode] = set()
+        self.connections: set[StreamConnection] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start_tcp(self, host: str = "localhost", port: int = 8283, **kwargs: Any):
+        # listen on tcp, kwargs are passed on to loop.create_server
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            self.create_connection, host, port, **kwargs
+        )
+        return self.server
+
+    async def start_unix(self, path: str, **kwargs: Any):
+        # listen on a unix socket, kwargs are passed on to loop.create_unix_server
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_unix_server(
+            self.create_connection, path, **kwargs
+        )
+        return self.server
+
+    @property
+    def port(self) -> int:
+        # the listening tcp port, useful when started with port 0
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        # stop listening and close all connections
+        if self.server:
+            self.server.close()
+            for connection in list(self.connections):
+                connection.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def create_node(self) -> RemoteNode:
+        # create the remote node for a new connection
+        node = RemoteNode(
+            self.format,
+            max_concurrent_invokes=self.max_concurrent_invokes,
+            registry=self.registry,
+        )
+        if self.metrics:
+            node.set_metrics(self.metrics)
+        return node
+
+    def create_connection(self) -> StreamConnection:
+        # protocol factory, creates the node and queue of a new connection
+        node = self.create_node()
+        queue = self.queue_factory()
+        connection = StreamConnection(
+            node, queue, self._closed, max_frame_size=self.max_frame_size
+        )
+        if queue.policy == OverflowPolicy.DISCONNECT:
+            queue.on_overflow = lambda queue: connection.close()
+        self.nodes.add(node)
+        self.connections.add(connection)
+        return connection
+
+    def _closed(self, connection: StreamConnection) -> None:
+        self.nodes.discard(connection.node)
+        self.connections.discard(connection)
+        connection.node.detach()
+
+
+class StreamClient(Base):
+    # connects a client node to a stream server
+    def __init__(
+        self,
+        node: ClientNode,
+        queue_factory: Optional[QueueFactory] = None,
+        max_frame_size: int = 16 * 1024 * 1024,
+    ):
+        self.node = node
+        self.queue_factory = queue_factory or SendQueue
+        self.max_frame_size = max_frame_size
+        self.connection: Optional[StreamConnection] = None
+        self.reconnector: Optional[Reconnector] = None
+
+    def create_connection(self) -> StreamConnection:
+        self.connection = StreamConnection(
+            self.node, self.queue_factory(), max_frame_size=self.max_frame_size
+        )
+        return self.connection
+
+    async def connect_tcp(self, host: str, port: int, **kwargs: Any) -> None:
+        # open a tcp connection, kwargs are passed on to loop.create_connection
+        loop = asyncio.get_running_loop()
+        await loop.create_connection(self.create_connection, host, port, **kwargs)
+
+    async def connect_unix(self, path: str, **kwargs: Any) -> None:
+        # open a unix socket connection
+        loop = asyncio.get_running_loop()
+        await loop.create_unix_connection(self.create_connection, path, **kwargs)
+
+    async def run_tcp(
+        self, host: str, port: int, backoff: Optional[Backoff] = None, **kwargs: Any
+    ) -> None:
+        # keep the node connected over tcp until close is called, see Reconnector
+        await self._run(lambda: self.connect_tcp(host, port, **kwargs), backoff)
+
+    async def run_unix(
+        self, path: str, backoff: Optional[Backoff] = None, **kwargs: Any
+    ) -> None:
+        # keep the node connected over a unix socket until close is called
+        await self._run(lambda: self.connect_unix(path, **kwargs), backoff)
+
+    async def _run(self, connect, backoff: Optional[Backoff]) -> None:
+        self.reconnector = Reconnector(self.node, connect, self.wait_closed, backoff)
+        await self.reconnector.run()
+
+    async def wait_closed(self) -> None:
+        # wait until the connection is closed
+        if self.connection:
+            await asyncio.shield(self.connection.closed)
+
+    async def close(self) -> None:
+        # close the connection and stop reconnecting
+        if self.reconnector:
+            self.reconnector.stop()
+        if self.connection:
+            connection = self.connection
+            connection.close()
+            if connection.closed:
+                await connection.closed
+            if self.connection is connection:
+                self.connection = None
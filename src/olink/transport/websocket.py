@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Callable, Optional
+from olink.client import ClientNode
+from olink.core import Base, LogLevel, MessageFormat, Metrics, OverflowPolicy, SendQueue
+from olink.remote import RemoteNode, RemoteRegistry
+from .reconnect import Backoff, Reconnector
+
+try:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+except ImportError:  # pragma: no cover
+    connect = serve = None
+    ConnectionClosed = Exception
+
+# creates the send queue of a connection
+QueueFactory = Callable[[], SendQueue]
+
+
+def _require_websockets():
+    if serve is None:
+        raise ImportError("websockets>=13 is required for olink.transport.websocket")
+
+
+async def _send_frames(ws: Any, queue: SendQueue) -> None:
+    # writer task, sends frames from the queue until the connection closes
+    while True:
+        data = await queue.get()
+        await ws.send(data)
+
+
+class WebSocketServer(Base):
+    # websocket server with a remote node per connection
+    # each connection has a reader loop and a writer task draining the send queue
+    # of its node, the node is detached when the connection closes. the reader
+    # waits for a blocked send queue to drain before it receives the next message
+    def __init__(
+        self,
+        registry: Optional[RemoteRegistry] = None,
+        format: MessageFormat = MessageFormat.JSON,
+        queue_factory: Optional[QueueFactory] = None,
+        max_concurrent_invokes: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        _require_websockets()
+        self.registry = registry
+        self.format = format
+        self.queue_factory = queue_factory or SendQueue
+        self.max_concurrent_invokes = max_concurrent_invokes
+        # metrics collector of the connection nodes
+        self.metrics = metrics
+        self.nodes: set[RemoteNode] = set()
+        self.server = None
+
+    async def start(self, host: str = "localhost", port: int = 8282, **kwargs: Any):
+        # start listening, kwargs are passed on to websockets serve
+        self.server = await serve(self.handle, host, port, **kwargs)
+        return self.server
+
+    @property
+    def port(self) -> int:
+        # the listening port, useful when started with port 0
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        # stop listening and close all connections
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def create_node(self) -> RemoteNode:
+        # create the remote node for a new connection
+        node = RemoteNode(
+            self.format,
+            max_concurrent_invokes=self.max_concurrent_invokes,
+            registry=self.registry,
+        )
+        if self.metrics:
+            node.set_metrics(self.metrics)
+        return node
+
+    async def handle(self, ws: Any) -> None:
+        # serve one connection until it is closed
+        node = self.create_node()
+        queue = self.queue_factory()
+        if queue.policy == OverflowPolicy.DISCONNECT:
+            queue.on_overflow = lambda queue: asyncio.ensure_future(ws.close(1008))
+        node.set_send_queue(queue)
+        self.nodes.add(node)
+        writer = asyncio.ensure_future(_send_frames(ws, queue))
+        try:
+            async for data in ws:
+                node.handle_message(data)
+                if queue.blocked:
+                    await queue.writable()
+        except ConnectionClosed:
+            pass
+        finally:
+            self.nodes.discard(node)
+            node.detach()
+            queue.close()
+            writer.cancel()
+            self.emit_log(LogLevel.DEBUG, "connection closed: %s", ws.remote_address)
+
+
+class WebSocketClient(Base):
+    # connects a client node to a websocket server
+    def __init__(self, node: ClientNode, queue_factory: Optional[QueueFactory] = None):
+        _require_websockets()
+        self.node = node
+        self.queue_factory = queue_factory or SendQueue
+        self.queue: Optional[SendQueue] = None
+        self.ws = None
+        self.reconnector: Optional[Reconnector] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def connect(self, url: str, **kwargs: Any) -> None:
+        # open the connection and start the reader and writer tasks
+        self.ws = await connect(url, **kwargs)
+        self.queue = self.queue_factory()
+        self.node.set_send_queue(self.queue)
+        writer = asyncio.ensure_future(_send_frames(self.ws, self.queue))
+        self._tasks = [asyncio.ensure_future(self._reader(self.ws, writer)), writer]
+
+    async def run(
+        self, url: str, backoff: Optional[Backoff] = None, **kwargs: Any
+    ) -> None:
+        # keep the node connected until close is called, see Reconnector
+        self.reconnector = Reconnector(
+            self.node, lambda: self.connect(url, **kwargs), self.wait_closed, backoff
+        )
+        await self.reconnector.run()
+
+    async def _reader(self, ws: Any, writer: asyncio.Task) -> None:
+        try:
+            async for data in ws:
+                self.node.handle_message(data)
+                if self.queue.blocked:
+                    await self.queue.writable()
+        except ConnectionClosed:
+            pass
+        finally:
+            self.queue.close()
+            writer.cancel()
+
+    async def wait_closed(self) -> None:
+        # wait until the connection is closed
+        if self._tasks:
+            await asyncio.shield(self._tasks[0])
+
+    async def close(self) -> None:
+        # close the connection and stop reconnecting
+        if self.reconnector:
+            self.reconnector.stop()
+        if self.ws:
+            await self.ws.close()
+            self.ws = None
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
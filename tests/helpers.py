@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any, Optional
+from olink.client import ClientNode, ClientRegistry
+from olink.core import MessageConverter, MessageFormat
+from olink.mocks import MockSink, MockSource
+from olink.remote import RemoteNode, RemoteRegistry
+
+
+def add_source(
+    registry: RemoteRegistry,
+    name: str,
+    properties: Optional[dict[str, Any]] = None,
+    source_class: type = MockSource,
+) -> MockSource:
+    # mock source of the given properties, added to the registry
+    source = source_class(name, registry)
+    source.clear()
+    source.properties = dict(properties or {})
+    registry.add_source(source)
+    return source
+
+
+def add_sink(
+    registry: ClientRegistry, name: str, sink_class: type = MockSink
+) -> MockSink:
+    # mock sink registered in the client registry
+    sink = sink_class(name, registry)
+    sink.clear()
+    return sink
+
+
+def create_registry(
+    name: str,
+    properties: Optional[dict[str, Any]] = None,
+    cache_snapshots: bool = False,
+    source_class: type = MockSource,
+) -> tuple[RemoteRegistry, MockSource]:
+    # remote registry with a mock source of the given properties
+    registry = RemoteRegistry(cache_snapshots)
+    return registry, add_source(registry, name, properties, source_class)
+
+
+def connect(client: ClientNode, remote: RemoteNode) -> tuple[list, list]:
+    # write the frames of the nodes back to back, returns the frames written by
+    # the client and by the remote node
+    client_writes = []
+    remote_writes = []
+
+    def client_write(data):
+        client_writes.append(data)
+        remote.handle_message(data)
+
+    def remote_write(data):
+        remote_writes.append(data)
+        client.handle_message(data)
+
+    client.on_write(client_write)
+    remote.on_write(remote_write)
+    return client_writes, remote_writes
+
+
+def create_remote(
+    registry: RemoteRegistry, format: MessageFormat = MessageFormat.JSON
+) -> tuple[RemoteNode, list]:
+    # remote node of the registry, the frames it writes are recorded
+    remote = RemoteNode(format, registry=registry)
+    writes = []
+    remote.on_write(writes.append)
+    return remote, writes
+
+
+def create_client(
+    registry: RemoteRegistry,
+    name: str,
+    sink_class: type = MockSink,
+    format: MessageFormat = MessageFormat.JSON,
+) -> tuple[ClientNode, RemoteNode, MockSink, list]:
+    # client node with a sink for name, connected back to back with a remote node
+    # of the registry, the frames written by the remote node are recorded
+    client = ClientNode(format, registry=ClientRegistry())
+    sink = add_sink(client.registry(), name, sink_class)
+    remote = RemoteNode(format, registry=registry)
+    _, writes = connect(client, remote)
+    return client, remote, sink, writes
+
+
+def decode(frames: list, format: MessageFormat = MessageFormat.JSON) -> list:
+    # messages of the recorded frames
+    converter = MessageConverter(format)
+    return [converter.from_string(data) for data in frames]
+
+
+async def wait_for(predicate, timeout: float = 5) -> None:
+    # wait until predicate is true, fails after timeout seconds
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < end
+        await asyncio.sleep(0.005)
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from olink.core import MessageConverter, MessageFormat, MsgType, Protocol
+from .helpers import create_client, create_registry
+
+name = "demo.Batch"
+propName = "demo.Batch/total"
+msgs = [
+    Protocol.property_change_message(propName, 1),
+    Protocol.signal_message("demo.Batch/down", [1, "a"]),
+]
+
+formats = [
+    (MessageFormat.JSON, None),
+    (MessageFormat.MSGPACK, "msgpack"),
+    (MessageFormat.CBOR, "cbor2"),
+    (MessageFormat.BSON, "bson"),
+]
+
+
+@pytest.mark.parametrize("format,module", formats)
+def test_join_frames(format, module):
+    if module:
+        pytest.importorskip(module)
+    converter = MessageConverter(format)
+    frames = [converter.to_string(msg) for msg in msgs]
+    data = converter.join_frames(MsgType.BATCH, frames)
+    assert converter.from_string(data) == Protocol.batch_message(msgs)
+
+
+def test_join_many_frames():
+    pytest.importorskip("cbor2")
+    converter = MessageConverter(MessageFormat.CBOR)
+    batch = [Protocol.signal_message(name, [i]) for i in range(300)]
+    frames = [converter.to_string(msg) for msg in batch]
+    data = converter.join_frames(MsgType.BATCH, frames)
+    assert converter.from_string(data) == Protocol.batch_message(batch)
+
+
+def create_nodes():
+    # remote node linked to a client, the frames it writes are recorded
+    registry, source = create_registry(name)
+    client, remote, sink, writes = create_client(registry, name)
+    client.link_remote(name)
+    writes.clear()
+    return remote, sink, source, writes
+
+
+def test_batch_on_max_messages():
+    remote, sink, source, writes = create_nodes()
+    remote.enable_batching(max_messages=3, max_delay=60)
+    for value in range(5):
+        source.set_property(propName, value)
+    assert len(writes) == 1
+    assert sink.properties["total"] == 2
+    remote.flush()
+    assert len(writes) == 2
+    assert sink.properties["total"] == 4
+    assert len(sink.events) == 6
+
+
+def test_batch_on_max_bytes():
+    remote, sink, source, writes = create_nodes()
+    remote.enable_batching(max_messages=100, max_bytes=1, max_delay=60)
+    source.set_property(propName, 1)
+    assert len(writes) == 1
+
+
+def test_batch_without_delay():
+    remote, sink, source, writes = create_nodes()
+    remote.enable_batching(max_messages=100, max_delay=0)
+    source.set_property(propName, 1)
+    source.set_property(propName, 2)
+    assert len(writes) == 2
+
+
+def test_disable_batching_flushes():
+    remote, sink, source, writes = create_nodes()
+    remote.enable_batching(max_messages=100, max_delay=60)
+    source.set_property(propName, 1)
+    source.notify_signal("demo.Batch/down", [1])
+    assert len(writes) == 0
+    remote.disable_batching()
+    assert len(writes) == 1
+    assert [event["type"] for event in sink.events] == [
+        "init",
+        "property_change",
+        "signal",
+    ]
+
+
+def test_batch_on_max_delay():
+    remote, sink, source, writes = create_nodes()
+
+    async def main():
+        remote.enable_batching(max_messages=100, max_delay=0.01)
+        source.set_property(propName, 1)
+        source.set_property(propName, 2)
+        assert len(writes) == 0
+        await asyncio.sleep(0.05)
+        assert len(writes) == 1
+
+    asyncio.run(main())
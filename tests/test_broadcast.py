@@ -0,0 +1,44 @@
+import pytest
+from olink.core import MessageFormat, Protocol
+from olink.remote import RemoteRegistry
+from .helpers import create_remote, decode
+
+name = "demo.Broadcast"
+sigName = "demo.Broadcast/down"
+propName = "demo.Broadcast/total"
+
+
+def create_nodes(registry: RemoteRegistry, format: MessageFormat, count: int):
+    # remote nodes linked to name, returns the nodes and their written frames
+    nodes = []
+    frames = []
+    for _ in range(count):
+        node, writes = create_remote(registry, format)
+        registry.add_node_to_source(name, node)
+        nodes.append(node)
+        frames.append(writes)
+    return nodes, frames
+
+
+def test_broadcast_encodes_once_per_format():
+    pytest.importorskip("msgpack")
+    registry = RemoteRegistry()
+    _, json_writes = create_nodes(registry, MessageFormat.JSON, 3)
+    _, msgpack_writes = create_nodes(registry, MessageFormat.MSGPACK, 2)
+    registry.notify_signal(sigName, [1, 2])
+    json_frames = [writes[0] for writes in json_writes]
+    msgpack_frames = [writes[0] for writes in msgpack_writes]
+    assert all(frame is json_frames[0] for frame in json_frames)
+    assert all(frame is msgpack_frames[0] for frame in msgpack_frames)
+    msg = Protocol.signal_message(sigName, [1, 2])
+    assert decode(json_frames[:1]) == [msg]
+    assert decode(msgpack_frames[:1], MessageFormat.MSGPACK) == [msg]
+
+
+def test_broadcast_skips_nodes_without_writer():
+    registry = RemoteRegistry()
+    nodes, frames = create_nodes(registry, MessageFormat.JSON, 2)
+    nodes[0].on_write(None)
+    registry.notify_property_change(propName, 1)
+    assert frames[0] == []
+    assert len(frames[1]) == 1
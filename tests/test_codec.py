@@ -0,0 +1,45 @@
+import pytest
+from olink.core import MessageConverter, MessageFormat, MsgType, Protocol
+from .helpers import create_client, create_registry
+
+name = "demo.Codec"
+propName = "demo.Codec/total"
+msg = Protocol.init_message(name, {"total": 1, "items": [1.5, "a", None, True]})
+
+formats = [
+    (MessageFormat.JSON, None),
+    (MessageFormat.MSGPACK, "msgpack"),
+    (MessageFormat.CBOR, "cbor2"),
+    (MessageFormat.BSON, "bson"),
+]
+
+
+@pytest.mark.parametrize("format,module", formats)
+def test_roundtrip(format, module):
+    if module:
+        pytest.importorskip(module)
+    converter = MessageConverter(format)
+    data = converter.to_string(msg)
+    assert isinstance(data, bytes) == converter.binary
+    assert converter.from_string(data) == msg
+    assert converter.from_string(data)[0] == MsgType.INIT
+
+
+def test_json_is_default():
+    converter = MessageConverter()
+    assert converter.format == MessageFormat.JSON
+    assert isinstance(converter.to_string(msg), str)
+
+
+def test_binary_link():
+    pytest.importorskip("msgpack")
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(
+        registry, name, format=MessageFormat.MSGPACK
+    )
+    client.link_remote(name)
+    source.set_property(propName, 2)
+    assert all(isinstance(frame, bytes) for frame in frames)
+    assert [event["type"] for event in sink.events] == ["init", "property_change"]
+    assert sink.events[1] == {"type": "property_change", "name": propName, "value": 2}
+    client.unlink_remote(name)
@@ -0,0 +1,60 @@
+import asyncio
+from .helpers import create_client, create_registry
+
+name = "demo.Telemetry"
+speedName = "demo.Telemetry/speed"
+modeName = "demo.Telemetry/mode"
+
+
+def create_nodes():
+    # remote registry with a source linked to a client with sink
+    registry, source = create_registry(name)
+    client, remote, sink, writes = create_client(registry, name)
+    client.link_remote(name)
+    return registry, sink, source
+
+
+def changes(sink):
+    return [
+        (event["name"], event["value"])
+        for event in sink.events
+        if event["type"] == "property_change"
+    ]
+
+
+def test_conflate_object():
+    registry, sink, source = create_nodes()
+    registry.set_conflation(name, 60)
+    for value in range(100):
+        source.set_property(speedName, value)
+    source.set_property(modeName, "fast")
+    assert changes(sink) == []
+    registry.flush_property_changes()
+    assert changes(sink) == [(speedName, 99), (modeName, "fast")]
+
+
+def test_conflate_property():
+    registry, sink, source = create_nodes()
+    registry.set_conflation(speedName, 60)
+    source.set_property(speedName, 1)
+    source.set_property(speedName, 2)
+    source.set_property(modeName, "slow")
+    assert changes(sink) == [(modeName, "slow")]
+    registry.set_conflation(speedName, None)
+    assert changes(sink) == [(modeName, "slow"), (speedName, 2)]
+    source.set_property(speedName, 3)
+    assert changes(sink)[-1] == (speedName, 3)
+
+
+def test_conflate_on_interval():
+    registry, sink, source = create_nodes()
+
+    async def main():
+        registry.set_conflation(name, 0.01)
+        for value in range(10):
+            source.set_property(speedName, value)
+        assert changes(sink) == []
+        await asyncio.sleep(0.05)
+        assert changes(sink) == [(speedName, 9)]
+
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+from olink.core import MessageConverter, MsgType, Protocol
+from olink.remote import SubscriptionFilter
+from .helpers import create_client, create_registry
+
+name = "demo.Filter"
+props = {"count": 1, "speed": 2, "temp_in": 3, "temp_out": 4}
+
+
+def test_filter():
+    filter = SubscriptionFilter(["count", "temp*"])
+    assert filter.matches("count")
+    assert filter.matches("temp_in")
+    assert not filter.matches("speed")
+    assert filter.trim(props) == {"count": 1, "temp_in": 3, "temp_out": 4}
+    assert SubscriptionFilter.from_options({}) is None
+    assert SubscriptionFilter.from_options({"filter": ["a"]}).key == ("a",)
+
+
+def test_link_message():
+    assert Protocol.link_message(name) == [MsgType.LINK, name]
+    options = {"filter": ["count"]}
+    assert Protocol.link_message(name, options) == [MsgType.LINK, name, options]
+
+
+def test_filtered_link():
+    registry, source = create_registry(name, props)
+    client, remote, sink, writes = create_client(registry, name)
+    other, other_remote, other_sink, other_writes = create_client(registry, name)
+    client.link_remote(name, ["count", "temp*"])
+    other.link_remote(name)
+    assert sink.properties == {"count": 1, "temp_in": 3, "temp_out": 4}
+    assert other_sink.properties == props
+    writes.clear()
+    other_writes.clear()
+    source.set_property("demo.Filter/speed", 5)
+    source.set_property("demo.Filter/temp_in", 6)
+    source.notify_signal("demo.Filter/count", [])
+    source.notify_signal("demo.Filter/stopped", [])
+    assert len(writes) == 2
+    assert len(other_writes) == 4
+    assert [event["name"] for event in sink.events[1:]] == [
+        "demo.Filter/temp_in",
+        "demo.Filter/count",
+    ]
+
+
+def test_unlink_removes_filter():
+    registry, source = create_registry(name, props)
+    client, remote, sink, writes = create_client(registry, name)
+    client.link_remote(name, ["count"])
+    assert registry.entries[name].filters
+    client.unlink_remote(name)
+    assert registry.entries[name].filters == {}
+    assert client.link_options == {}
+    client.link_remote(name, ["count"])
+    remote.detach()
+    assert registry.entries[name].filters == {}
+
+
+def test_cached_snapshot_per_filter():
+    registry, source = create_registry(name, props, cache_snapshots=True)
+    client, remote, sink, writes = create_client(registry, name)
+    client.link_remote(name, ["speed"])
+    other, other_remote, other_sink, other_writes = create_client(registry, name)
+    other.link_remote(name)
+    assert sink.properties == {"speed": 2}
+    assert other_sink.properties == props
+    assert len(registry.entries[name].snapshots) == 2
+
+
+def test_relink_sends_filter():
+    registry, source = create_registry(name, props)
+    client, remote, sink, writes = create_client(registry, name)
+    sent = []
+    client.link_remote(name, ["count"])
+    client.on_write(lambda data: sent.append(MessageConverter().from_string(data)))
+    client.handle_disconnect()
+    client.handle_connect()
+    assert sent == [[MsgType.LINK, name, {"filter": ["count"]}]]
+
+
+def test_invalid_filter():
+    registry, source = create_registry(name, props)
+    client, remote, sink, writes = create_client(registry, name)
+    remote.handle_link(name, {"filter": "count"})
+    assert registry.get_nodes(name) == set()
+    assert MessageConverter().from_string(writes[0])[:2] == [
+        MsgType.ERROR,
+        MsgType.LINK,
+    ]
@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from olink.client import ClientNode, ClientRegistry, InvokeError
+from olink.remote import RemoteNode
+from .helpers import add_source, connect, create_client, create_registry
+
+name = "demo.Invoke"
+invokeName = "demo.Invoke/add"
+
+
+def test_invoke():
+    registry, source = create_registry(name)
+    client, remote, sink, writes = create_client(registry, name)
+
+    async def main():
+        return await client.invoke(invokeName, [1, 2], timeout=1)
+
+    assert asyncio.run(main()) == invokeName
+    assert client.invokes_pending == {}
+
+
+def test_invoke_timeout():
+    lost = ClientNode()
+    lost.on_write(lambda data: None)
+
+    async def main():
+        await lost.invoke(invokeName, [1], timeout=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+    assert lost.invokes_pending == {}
+
+
+def test_invoke_cancel():
+    lost = ClientNode()
+    lost.on_write(lambda data: None)
+
+    async def main():
+        task = asyncio.ensure_future(lost.invoke(invokeName, [1]))
+        await asyncio.sleep(0)
+        assert len(lost.invokes_pending) == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert lost.invokes_pending == {}
+
+
+def test_invoke_many():
+    pending = []
+    registry, source = create_registry(name)
+    delayed = ClientNode()
+    delayed.on_write(pending.append)
+    replier = RemoteNode(registry=registry)
+    replier.on_write(lambda data: delayed.handle_message(data))
+
+    async def main():
+        tasks = [
+            asyncio.ensure_future(delayed.invoke(invokeName, [i], timeout=1))
+            for i in range(1000)
+        ]
+        await asyncio.sleep(0)
+        assert len(delayed.invokes_pending) == 1000
+        for data in reversed(pending):
+            replier.handle_message(data)
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == [invokeName] * 1000
+    assert delayed.invokes_pending == {}
+
+
+class AsyncSource:
+    # source with an async invoke, sleeps args[0] seconds and returns args[1]
+    def __init__(self, name: str):
+        self.name = name
+        self.running = 0
+        self.max_running = 0
+
+    def olink_object_name(self):
+        return self.name
+
+    async def olink_invoke(self, name, args):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(args[0])
+            if args[1] == "fail":
+                raise ValueError("failed")
+            return args[1]
+        finally:
+            self.running -= 1
+
+
+asyncName = "demo.AsyncInvoke"
+
+
+def create_nodes(max_concurrent_invokes=None):
+    # client connected back to back with a remote node serving an async source
+    registry, source = create_registry(name)
+    async_source = AsyncSource(asyncName)
+    registry.add_source(async_source)
+    client = ClientNode(registry=ClientRegistry())
+    remote = RemoteNode(
+        max_concurrent_invokes=max_concurrent_invokes, registry=registry
+    )
+    connect(client, remote)
+    return client, remote, registry, async_source
+
+
+def test_async_invoke_out_of_order():
+    client, remote, registry, async_source = create_nodes()
+    replies = []
+
+    async def main():
+        async def call(delay, value):
+            value = await client.invoke(f"{asyncName}/run", [delay, value], timeout=1)
+            replies.append(value)
+
+        await asyncio.gather(call(0.03, "slow"), call(0.01, "fast"))
+
+    asyncio.run(main())
+    assert replies == ["fast", "slow"]
+    assert async_source.max_running == 2
+
+
+def test_async_invoke_error():
+    client, remote, registry, async_source = create_nodes()
+
+    async def main():
+        await client.invoke(f"{asyncName}/run", [0, "fail"], timeout=1)
+
+    with pytest.raises(InvokeError, match="failed"):
+        asyncio.run(main())
+    assert client.invokes_pending == {}
+
+
+def test_async_invoke_concurrency_limit():
+    client, remote, registry, async_source = create_nodes(max_concurrent_invokes=2)
+
+    async def main():
+        calls = [
+            client.invoke(f"{asyncName}/run", [0.01, i], timeout=1) for i in range(6)
+        ]
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(main()) == list(range(6))
+    assert async_source.max_running == 2
+
+
+def test_async_invoke_without_loop():
+    client, remote, registry, async_source = create_nodes()
+    errors = []
+    client.invoke_remote(f"{asyncName}/run", [0, "late"], errors.append)
+    assert errors[0].error == "no running event loop"
+    assert remote.invoke_tasks == set()
+    assert client.invokes_pending == {}
+
+
+def test_sync_invoke_error():
+    client, remote, registry, async_source = create_nodes()
+    failing = add_source(registry, "demo.InvokeError")
+
+    def olink_invoke(name, args):
+        raise ValueError("sync failed")
+
+    failing.olink_invoke = olink_invoke
+    errors = []
+    client.invoke_remote("demo.InvokeError/run", [], errors.append)
+    assert errors[0].error == "sync failed"
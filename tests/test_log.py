@@ -0,0 +1,53 @@
+from olink.client import ClientNode
+from olink.core import Base, LogLevel
+
+
+class CountingValue:
+    # counts how often the value is formatted
+    formatted = 0
+
+    def __repr__(self):
+        CountingValue.formatted += 1
+        return "value"
+
+
+def test_log_levels_are_ordered():
+    assert LogLevel.DEBUG < LogLevel.INFO < LogLevel.WARNING < LogLevel.ERROR
+
+
+def test_log_formats_args():
+    logs = []
+    base = Base()
+    base.on_log(lambda level, msg: logs.append((level, msg)))
+    base.emit_log(LogLevel.INFO, "count: %s %s", 1, "a")
+    base.emit_log(LogLevel.INFO, "100%")
+    assert logs == [(LogLevel.INFO, "count: 1 a"), (LogLevel.INFO, "100%")]
+
+
+def test_log_level_threshold():
+    logs = []
+    base = Base()
+    base.on_log(lambda level, msg: logs.append(msg), LogLevel.WARNING)
+    assert not base.is_log_enabled(LogLevel.INFO)
+    assert base.is_log_enabled(LogLevel.ERROR)
+    base.emit_log(LogLevel.INFO, "info")
+    base.emit_log(LogLevel.ERROR, "error")
+    assert logs == ["error"]
+    base.set_log_level(LogLevel.DEBUG)
+    base.emit_log(LogLevel.DEBUG, "debug")
+    assert logs == ["error", "debug"]
+
+
+def test_disabled_log_skips_formatting():
+    node = ClientNode()
+    value = CountingValue()
+    node.handle_signal("demo.Log/sig", [value])
+    assert not node.is_log_enabled(LogLevel.DEBUG)
+    logs = []
+    node.on_log(lambda level, msg: logs.append(msg), LogLevel.INFO)
+    node.handle_signal("demo.Log/sig", [value])
+    assert CountingValue.formatted == 0
+    node.set_log_level(LogLevel.DEBUG)
+    node.handle_signal("demo.Log/sig", [value])
+    assert CountingValue.formatted == 1
+    assert logs == ["ClientNode.handle_signal: demo.Log/sig [value]"]
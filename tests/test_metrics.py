@@ -0,0 +1,87 @@
+from olink.core import Metrics, MsgType, SendQueue
+from .helpers import create_client, create_registry
+
+name = "demo.Metrics"
+propName = "demo.Metrics/count"
+invokeName = "demo.Metrics/add"
+
+
+def create_nodes(metrics: Metrics):
+    registry, source = create_registry(name)
+    registry.set_metrics(metrics)
+    client, remote, _, _ = create_client(registry, name)
+    client.set_metrics(metrics)
+    remote.set_metrics(metrics)
+    return client, remote, source
+
+
+def test_message_counts():
+    metrics = Metrics()
+    client, remote, source = create_nodes(metrics)
+    client.link_remote(name)
+    source.set_property(propName, 1)
+    source.notify_signal("demo.Metrics/tick", [])
+    client.invoke_remote(invokeName, [1], lambda arg: None)
+    snapshot = metrics.snapshot()
+    assert snapshot["messages_out"] == {
+        "LINK": 1,
+        "INIT": 1,
+        "PROPERTY_CHANGE": 1,
+        "SIGNAL": 1,
+        "INVOKE": 1,
+        "INVOKE_REPLY": 1,
+    }
+    assert snapshot["messages_in"] == snapshot["messages_out"]
+    assert snapshot["frames_in"] == snapshot["frames_out"] == 6
+    assert snapshot["bytes_in"] == snapshot["bytes_out"] > 0
+    assert snapshot["invoke_latency_seconds"]["count"] == 1
+    assert snapshot["fanout_nodes"]["count"] == 2
+    assert snapshot["fanout_nodes"]["buckets"]["1"] == 2
+    assert snapshot["nodes"] == 2
+
+
+def test_batched_messages():
+    metrics = Metrics()
+    client, remote, source = create_nodes(metrics)
+    client.link_remote(name)
+    remote.enable_batching(max_messages=10, max_delay=60)
+    for value in range(3):
+        source.set_property(propName, value)
+    remote.flush()
+    snapshot = metrics.snapshot()
+    assert snapshot["messages_in"]["PROPERTY_CHANGE"] == 3
+    assert snapshot["messages_in"]["BATCH"] == 1
+    assert snapshot["frames_in"] == 3
+
+
+def test_decode_errors_and_gauges():
+    metrics = Metrics()
+    client, remote, source = create_nodes(metrics)
+    client.on_write(lambda data: None)
+    client.set_send_queue(SendQueue())
+    client.handle_message("not json")
+    client.invoke_remote(invokeName, [1], lambda arg: None)
+    snapshot = metrics.snapshot()
+    assert snapshot["decode_errors"] == 1
+    assert snapshot["invokes_pending"] == 1
+    assert snapshot["send_queue_depth"] == 1
+
+
+def test_disabled():
+    client, remote, source = create_nodes(None)
+    client.link_remote(name)
+    assert client.metrics is None
+    assert client.protocol.metrics is None
+
+
+def test_prometheus():
+    metrics = Metrics()
+    client, remote, source = create_nodes(metrics)
+    client.link_remote(name)
+    client.invoke_remote(invokeName, [1], lambda arg: None)
+    text = metrics.to_prometheus()
+    assert 'olink_messages_out_total{type="LINK"} 1' in text
+    assert "# TYPE olink_invoke_latency_seconds histogram" in text
+    assert 'olink_invoke_latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "olink_invokes_pending 0" in text
+    assert text.endswith("\n")
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from olink.client import ClientNode, ClientRegistry
+from olink.core import MessageFormat, MsgType, Protocol
+from olink.remote import RemoteNode, RemoteRegistry
+from .helpers import add_sink, add_source, connect, decode
+
+names = [f"demo.Multi{i}" for i in range(300)]
+
+
+def create_nodes(format=MessageFormat.JSON, count=len(names)):
+    registry = RemoteRegistry(cache_snapshots=True)
+    for name in names[:count]:
+        add_source(registry, name, {"index": name})
+    client = ClientNode(format, registry=ClientRegistry())
+    client.multi_link = True
+    sinks = [add_sink(client.registry(), name) for name in names[:count]]
+    remote = RemoteNode(format, registry=registry)
+    client_writes, remote_writes = connect(client, remote)
+    return client, remote, sinks, client_writes, remote_writes
+
+
+def in_loop(func, *args):
+    # call func on a running loop, multi link needs one for its timeout
+    async def main():
+        func(*args)
+
+    asyncio.run(main())
+
+
+def test_messages():
+    assert Protocol.multi_link_message(names[:2]) == [MsgType.MULTI_LINK, names[:2]]
+    inits = [Protocol.init_message(names[0], {})]
+    assert Protocol.multi_init_message(inits) == [MsgType.MULTI_INIT, inits]
+
+
+@pytest.mark.parametrize(
+    "format,module",
+    [(MessageFormat.JSON, None), (MessageFormat.MSGPACK, "msgpack")],
+)
+def test_multi_link(format, module):
+    if module:
+        pytest.importorskip(module)
+    client, remote, sinks, client_writes, remote_writes = create_nodes(format)
+    in_loop(client.link_remotes, names)
+    assert decode(client_writes, format) == [Protocol.multi_link_message(names)]
+    msgs = decode(remote_writes, format)
+    assert len(msgs) == 1
+    assert msgs[0][0] == MsgType.MULTI_INIT
+    assert len(msgs[0][1]) == len(names)
+    for name, sink in zip(names, sinks):
+        assert sink.properties == {"index": name}
+        assert sink.node is client
+    assert len(remote.registry().node_links[remote]) == len(names)
+    assert client.multi_link_pending == set()
+
+
+def test_multi_link_unknown_name():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=1)
+    in_loop(client.link_remotes, ["demo.Unknown", "demo.Missing"])
+    assert decode(remote_writes) == [Protocol.multi_init_message([])]
+    assert client.multi_link_pending == set()
+    assert client.multi_link
+
+
+def test_relink_uses_multi_link():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=3)
+    in_loop(client.link_remotes, names[:3])
+    client_writes.clear()
+    client.handle_disconnect()
+    in_loop(client.handle_connect)
+    assert decode(client_writes) == [Protocol.multi_link_message(names[:3])]
+
+
+def test_fallback_on_error():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=3)
+
+    def reject(data):
+        client_writes.append(data)
+        if client.converter.from_string(data)[0] == MsgType.MULTI_LINK:
+            error = Protocol.error_message(MsgType.MULTI_LINK, 0, "not supported")
+            client.handle_message(client.converter.to_string(error))
+        else:
+            remote.handle_message(data)
+
+    client.on_write(reject)
+    in_loop(client.link_remotes, names[:3])
+    assert not client.multi_link
+    assert [msg[0] for msg in decode(client_writes)] == [MsgType.MULTI_LINK] + [
+        MsgType.LINK
+    ] * 3
+    assert [sink.properties for sink in sinks] == [
+        {"index": name} for name in names[:3]
+    ]
+
+
+def test_fallback_on_timeout():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=3)
+    client.multi_link_timeout = 0.01
+
+    def ignore(data):
+        # a remote node without multi link support drops the message
+        client_writes.append(data)
+        if client.converter.from_string(data)[0] != MsgType.MULTI_LINK:
+            remote.handle_message(data)
+
+    client.on_write(ignore)
+
+    async def main():
+        client.link_remotes(names[:3])
+        assert sinks[0].properties == {}
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert not client.multi_link
+    assert [sink.properties for sink in sinks] == [
+        {"index": name} for name in names[:3]
+    ]
+
+
+def test_multi_init_cancels_timeout():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=3)
+    client.multi_link_timeout = 0.01
+
+    async def main():
+        client.link_remotes(names[:3])
+        assert client.multi_link_timer is None
+        # the multi init of the reconnect is still on the way when the timer
+        # of the first multi link would expire
+        client.multi_link_timeout = 1
+        client.on_write(lambda data: None)
+        client.handle_disconnect()
+        client.handle_connect()
+        await asyncio.sleep(0.05)
+        assert client.multi_link_pending == set(names[:3])
+
+    asyncio.run(main())
+    assert client.multi_link
+
+
+def test_links_without_multi_link():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=3)
+    client.multi_link = False
+    client.link_remotes(names[:3])
+    assert decode(client_writes) == [Protocol.link_message(name) for name in names[:3]]
+
+
+def test_links_without_loop():
+    client, remote, sinks, client_writes, remote_writes = create_nodes(count=3)
+    client.link_remotes(names[:3])
+    assert decode(client_writes) == [Protocol.link_message(name) for name in names[:3]]
+    assert client.multi_link_pending == set()
+    assert client.multi_link
@@ -0,0 +1,18 @@
+from olink.core import Name, ParsedName
+
+
+def test_parse():
+    assert Name.parse("demo.Calc/add") == ParsedName("demo.Calc", "add")
+    assert Name.parse("demo.Calc") == ParsedName("demo.Calc", "demo.Calc")
+    assert Name.parse("demo.Calc/add").resource == "demo.Calc"
+    assert Name.parse("demo.Calc/add").path == "add"
+
+
+def test_name_parts():
+    assert Name.resource_from_name("demo.Calc/add") == "demo.Calc"
+    assert Name.resource_from_name("demo.Calc") == "demo.Calc"
+    assert Name.path_from_name("demo.Calc/add") == "add"
+    assert Name.path_from_name("demo.Calc/nested/add") == "add"
+    assert Name.path_from_name("demo.Calc") == "demo.Calc"
+    assert Name.has_path("demo.Calc/add")
+    assert Name.create_name("demo.Calc", "add") == "demo.Calc/add"
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from olink.client import ClientNode, ClientRegistry, InvokeError
+from olink.remote import InvokePool, RemoteNode, RemoteRegistry
+from .helpers import connect
+
+name = "demo.Blocking"
+
+
+class BlockingSource:
+    # source with a blocking invoke, sleeps args[0] seconds
+    def olink_object_name(self):
+        return name
+
+    def olink_invoke(self, name, args):
+        time.sleep(args[0])
+        return threading.get_ident()
+
+
+def create_nodes():
+    # client connected back to back with a remote node serving a blocking source
+    registry = RemoteRegistry()
+    registry.add_source(BlockingSource())
+    client = ClientNode(registry=ClientRegistry())
+    connect(client, RemoteNode(registry=registry))
+    return client, registry
+
+
+def test_offload_object():
+    client, registry = create_nodes()
+    pool = InvokePool(ThreadPoolExecutor(max_workers=4))
+    registry.set_invoke_pool(name, pool)
+
+    async def main():
+        calls = [client.invoke(f"{name}/run", [0.05], timeout=1) for _ in range(4)]
+        start = time.perf_counter()
+        idents = await asyncio.gather(*calls)
+        return idents, time.perf_counter() - start
+
+    idents, elapsed = asyncio.run(main())
+    assert threading.get_ident() not in idents
+    assert elapsed < 0.15
+    assert pool.stats()["completed"] == 4
+    assert pool.stats()["pending"] == 0
+    pool.shutdown()
+
+
+def test_offload_method():
+    client, registry = create_nodes()
+    pool = InvokePool(max_queue=1)
+    registry.set_invoke_pool(f"{name}/slow", pool)
+
+    async def main():
+        fast = await client.invoke(f"{name}/fast", [0], timeout=1)
+        slow = await client.invoke(f"{name}/slow", [0], timeout=1)
+        return fast, slow
+
+    fast, slow = asyncio.run(main())
+    assert fast == threading.get_ident()
+    assert slow != threading.get_ident()
+    pool.shutdown()
+
+
+def test_offload_queue_limit():
+    client, registry = create_nodes()
+    pool = InvokePool(max_queue=1)
+    registry.set_invoke_pool(name, pool)
+
+    async def main():
+        first = asyncio.ensure_future(client.invoke(f"{name}/run", [0.05], timeout=1))
+        await asyncio.sleep(0)
+        with pytest.raises(InvokeError, match="queue full"):
+            await client.invoke(f"{name}/run", [0], timeout=1)
+        await first
+
+    asyncio.run(main())
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["max_pending"] == 1
+    pool.shutdown()
+
+
+def test_offload_without_loop():
+    client, registry = create_nodes()
+    pool = InvokePool()
+    registry.set_invoke_pool(name, pool)
+    replies = []
+    client.invoke_remote(f"{name}/run", [0], replies.append)
+    pool.shutdown(wait=True)
+    assert len(replies) == 1
+
+
+def test_offload_shutdown_pool():
+    client, registry = create_nodes()
+    pool = InvokePool(max_queue=1)
+    pool.shutdown()
+    registry.set_invoke_pool(name, pool)
+    errors = []
+    client.invoke_remote(f"{name}/run", [0], errors.append)
+    assert "shutdown" in errors[0].error
+    stats = pool.stats()
+    assert stats["pending"] == 0
+    assert stats["submitted"] == 0
+    assert stats["rejected"] == 1
+
+
+def test_offload_process_pool():
+    client, registry = create_nodes()
+    pool = InvokePool(ProcessPoolExecutor(max_workers=1))
+    registry.set_invoke_pool(name, pool)
+
+    async def main():
+        return await client.invoke(f"{name}/run", [0], timeout=10)
+
+    assert isinstance(asyncio.run(main()), int)
+    assert pool.stats()["completed"] == 1
+    pool.shutdown()
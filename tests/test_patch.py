@@ -0,0 +1,150 @@
+from olink.core import MsgType
+from olink.core.patch import apply, copy_value, diff
+from olink.remote import RemoteNode
+from .helpers import create_client, create_registry, decode
+
+old = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "e": [1, 2], "f": True}
+new = {"a": 1, "b": {"c": [1, 5, 3], "d": "y"}, "e": [1, 2, 3], "g": None, "f": 1}
+
+
+def test_diff():
+    assert diff(old, old) == []
+    assert diff(old, new) == [
+        [["b", "c", 1], 5],
+        [["b", "d"], "y"],
+        [["e"], [1, 2, 3]],
+        [["g"], None],
+        [["f"], 1],
+    ]
+    assert diff({"a": 1, "b": 2}, {"a": 1}) == [[["b"]]]
+    assert diff(1, 2) == [[[], 2]]
+
+
+def test_apply():
+    base = copy_value(old)
+    assert apply(old, diff(old, new)) == new
+    assert old == base
+    assert apply({"a": 1, "b": 2}, [[["b"]]]) == {"a": 1}
+    assert apply(1, [[[], 2]]) == 2
+
+
+def test_apply_is_idempotent():
+    ops = diff(old, new) + [[["z"]]]
+    once = apply(old, ops)
+    assert apply(once, ops) == once
+
+
+def test_apply_shares_unchanged_values():
+    value = {"x": {"y": 1}, "z": {"w": 2}}
+    patched = apply(value, [[["x", "y"], 3]])
+    assert patched["z"] is value["z"]
+    assert patched["x"] is not value["x"]
+
+
+name = "demo.Devices"
+propName = "demo.Devices/table"
+
+
+def test_patch_messages():
+    table = {"dev1": {"state": "on", "level": 1}, "dev2": {"state": "off", "level": 0}}
+    registry, source = create_registry(name, {"table": copy_value(table)})
+    client, remote, sink, writes = create_client(registry, name)
+    registry.set_patching(name, True)
+    client.link_remote(name, patch=True)
+
+    # first change is sent in full, as there is no base value yet
+    table["dev1"]["level"] = 2
+    source.set_property(propName, copy_value(table))
+    assert decode(writes)[-1][0] == MsgType.PROPERTY_CHANGE
+    table["dev2"]["state"] = "on"
+    source.set_property(propName, copy_value(table))
+    assert decode(writes)[-1] == [
+        MsgType.PROPERTY_PATCH,
+        propName,
+        [[["dev2", "state"], "on"]],
+    ]
+    assert sink.events[-1] == {
+        "type": "property_change",
+        "name": propName,
+        "value": table,
+    }
+
+    # unchanged values are not sent
+    count = len(writes)
+    source.set_property(propName, copy_value(table))
+    assert len(writes) == count
+
+    registry.set_patching(name, False)
+    assert registry.patch_values == {}
+    table["dev2"]["level"] = 5
+    source.set_property(propName, copy_value(table))
+    assert decode(writes)[-1][0] == MsgType.PROPERTY_CHANGE
+    assert sink.events[-1]["value"] == table
+
+
+def test_client_without_patching():
+    registry, source = create_registry(name, {"table": {"dev1": 1, "dev2": 1}})
+    registry.set_patching(name, True)
+    client, _, sink, writes = create_client(registry, name)
+    patch_client, _, patch_sink, patch_writes = create_client(registry, name)
+    client.link_remote(name)
+    patch_client.link_remote(name, patch=True)
+    assert client.property_values == {}
+    assert patch_client.property_values == {name: source.properties}
+    source.set_property(propName, {"dev1": 2, "dev2": 1})
+    source.set_property(propName, {"dev1": 2, "dev2": 2})
+    assert decode(writes)[-1] == [
+        MsgType.PROPERTY_CHANGE,
+        propName,
+        {"dev1": 2, "dev2": 2},
+    ]
+    assert decode(patch_writes)[-1] == [
+        MsgType.PROPERTY_PATCH,
+        propName,
+        [[["dev2"], 2]],
+    ]
+    assert sink.events[-1]["value"] == patch_sink.events[-1]["value"]
+    # the remaining node takes patches again after a new link
+    patch_client.unlink_remote(name)
+    source.set_property(propName, {"dev1": 3, "dev2": 2})
+    assert registry.patch_values == {}
+    patch_client.link_remote(name, patch=True)
+    source.set_property(propName, {"dev1": 3, "dev2": 3})
+    assert decode(patch_writes)[-1][0] == MsgType.PROPERTY_CHANGE
+    assert decode(writes)[-1][0] == MsgType.PROPERTY_CHANGE
+
+
+def set_table(source, table):
+    # change the table of the source, init messages send the current table
+    source.properties["table"] = table
+    source.set_property(propName, table)
+
+
+def test_patch_without_base_relinks():
+    registry, source = create_registry(name, {"table": {"dev1": 1, "dev2": 1}})
+    registry.set_patching(name, True)
+    client, _, sink, writes = create_client(registry, name)
+    client.link_remote(name, patch=True)
+    set_table(source, {"dev1": 2, "dev2": 1})
+    client.property_values.clear()
+    set_table(source, {"dev1": 2, "dev2": 2})
+    # the patch is not applied, the client links again and gets the full value
+    frames = decode(writes)
+    assert frames[-2][0] == MsgType.PROPERTY_PATCH
+    assert frames[-1] == [MsgType.INIT, name, source.properties]
+    assert sink.events[-1]["props"] == {"table": {"dev1": 2, "dev2": 2}}
+    assert client.property_values == {name: source.properties}
+    assert client.resyncing == set()
+    set_table(source, {"dev1": 3, "dev2": 2})
+    assert decode(writes)[-1][0] == MsgType.PROPERTY_CHANGE
+    assert client.property_values[name]["table"] == {"dev1": 3, "dev2": 2}
+
+
+def test_invalid_patch_option():
+    registry, source = create_registry(name)
+    writes = []
+    remote = RemoteNode(registry=registry)
+    remote.on_write(writes.append)
+    remote.handle_link(name, {"patch": "yes"})
+    assert remote not in registry.get_nodes(name)
+    assert decode(writes)[0][:2] == [MsgType.ERROR, MsgType.LINK]
@@ -37,3 +37,93 @@ def test_messages():
 
     msg = Protocol.error_message(msgType, id, error)
     assert msg == [MsgType.ERROR, msgType, id, error]
+
+
+class RecordingListener:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        if not name.startswith("handle_"):
+            raise AttributeError(name)
+        return lambda *args: self.calls.append((name, *args))
+
+
+def test_handle_messages():
+    listener = RecordingListener()
+    protocol = Protocol(listener)
+    assert protocol.handle_message(Protocol.link_message(name))
+    assert protocol.handle_message(Protocol.init_message(name, props))
+    assert protocol.handle_message(Protocol.unlink_message(name))
+    assert protocol.handle_message(Protocol.set_property_message(name, value))
+    assert protocol.handle_message(Protocol.property_change_message(name, value))
+    assert protocol.handle_message(Protocol.invoke_message(id, name, args))
+    assert protocol.handle_message(Protocol.invoke_reply_message(id, name, value))
+    assert protocol.handle_message(Protocol.signal_message(name, args))
+    assert protocol.handle_message(Protocol.error_message(msgType, id, error))
+    assert listener.calls == [
+        ("handle_link", name),
+        ("handle_init", name, props),
+        ("handle_unlink", name),
+        ("handle_set_property", name, value),
+        ("handle_property_change", name, value),
+        ("handle_invoke", id, name, args),
+        ("handle_invoke_reply", id, name, value),
+        ("handle_signal", name, args),
+        ("handle_error", msgType, id, error),
+    ]
+
+
+def test_reject_malformed_messages():
+    listener = RecordingListener()
+    protocol = Protocol(listener)
+    assert not protocol.handle_message([])
+    assert not protocol.handle_message([99, name])
+    assert not protocol.handle_message([[MsgType.LINK], name])
+    assert not protocol.handle_message({"type": MsgType.LINK})
+    assert not protocol.handle_message([MsgType.LINK])
+    assert not protocol.handle_message([MsgType.SIGNAL, name, args, 1])
+    assert listener.calls == []
+
+
+def test_listener_without_handlers():
+    class LinkListener:
+        def __init__(self):
+            self.links = []
+
+        def handle_link(self, name):
+            self.links.append(name)
+
+    listener = LinkListener()
+    protocol = Protocol(listener)
+    assert protocol.handle_message(Protocol.link_message(name))
+    assert not protocol.handle_message(Protocol.signal_message(name, args))
+    assert listener.links == [name]
+
+
+def test_link_with_options():
+    listener = RecordingListener()
+    protocol = Protocol(listener)
+    options = {"filter": ["count"]}
+    assert protocol.handle_message(Protocol.link_message(name, options))
+    assert not protocol.handle_message([MsgType.LINK, name, options, 1])
+    assert not protocol.handle_message([MsgType.UNLINK, name, options])
+    assert listener.calls == [("handle_link", name, options)]
+
+
+def test_batch_continues_after_error():
+    class FailingListener:
+        def __init__(self):
+            self.links = []
+
+        def handle_unlink(self, name):
+            raise KeyError(name)
+
+        def handle_link(self, name):
+            self.links.append(name)
+
+    listener = FailingListener()
+    protocol = Protocol(listener)
+    batch = [Protocol.unlink_message(name), Protocol.link_message(name)]
+    assert protocol.handle_message(Protocol.batch_message(batch))
+    assert listener.links == [name]
@@ -0,0 +1,227 @@
+import asyncio
+from olink.client import ClientNode, ClientRegistry
+from olink.core import MsgType, OverflowPolicy, Protocol, SendQueue
+from olink.remote import RemoteNode
+from .helpers import add_sink, create_registry
+
+name = "demo.Queue"
+propName = "demo.Queue/value"
+
+
+def test_queue_order_and_stats():
+    queue = SendQueue(max_messages=10)
+    assert queue.put("a")
+    assert queue.put("bb")
+    assert queue.depth == 2
+    assert queue.bytes == 3
+    assert queue.pop() == "a"
+    assert queue.pop() == "bb"
+    assert queue.pop() is None
+    assert queue.stats()["sent"] == 2
+
+
+def test_drop_oldest():
+    queue = SendQueue(max_messages=2, policy=OverflowPolicy.DROP_OLDEST)
+    for data in ["1", "2", "3"]:
+        queue.put(data)
+    assert [queue.pop(), queue.pop()] == ["2", "3"]
+    assert queue.dropped == 1
+
+
+def test_drop_oldest_on_bytes():
+    queue = SendQueue(max_bytes=4, policy=OverflowPolicy.DROP_OLDEST)
+    queue.put("aa")
+    queue.put("bb")
+    queue.put("cc")
+    assert queue.bytes == 4
+    assert queue.pop() == "bb"
+
+
+def test_conflate():
+    queue = SendQueue(max_messages=3, policy=OverflowPolicy.CONFLATE)
+    queue.put("p1", "demo.Queue/a", True)
+    queue.put("s1")
+    queue.put("p2", "demo.Queue/a", True)
+    assert queue.depth == 2
+    assert queue.conflated == 1
+    assert queue.pop() == "p2"
+    # a pending patch is never replaced by a later change
+    queue.put("patch", "demo.Queue/a", False)
+    queue.put("p3", "demo.Queue/a", True)
+    assert [queue.pop(), queue.pop(), queue.pop()] == ["s1", "patch", "p3"]
+
+
+def test_block_keeps_frames():
+    queue = SendQueue(max_messages=2, policy=OverflowPolicy.BLOCK)
+    for data in ["1", "2", "3"]:
+        assert queue.put(data)
+    assert queue.depth == 3
+    assert queue.dropped == 0
+    assert queue.blocked
+
+
+def test_close_wakes_writable():
+    queue = SendQueue(max_messages=2, policy=OverflowPolicy.BLOCK)
+
+    async def main():
+        queue.put("1")
+        queue.put("2")
+        waiter = asyncio.ensure_future(queue.writable())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        queue.close()
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(main())
+    assert not queue.blocked
+
+
+def test_disconnect():
+    overflows = []
+    queue = SendQueue(
+        max_messages=1, policy=OverflowPolicy.DISCONNECT, on_overflow=overflows.append
+    )
+    queue.put("1")
+    assert not queue.put("2")
+    assert overflows == [queue]
+    assert queue.closed
+    assert not queue.put("3")
+    assert queue.depth == 0
+
+
+def test_watermarks():
+    events = []
+    queue = SendQueue(
+        max_messages=10,
+        high_watermark=4,
+        low_watermark=1,
+        on_high=lambda q: events.append("high"),
+        on_low=lambda q: events.append("low"),
+    )
+    for i in range(5):
+        queue.put(str(i))
+    assert events == ["high"]
+    queue.pop()
+    queue.pop()
+    assert events == ["high"]
+    queue.pop()
+    queue.pop()
+    assert events == ["high", "low"]
+
+
+def test_async_get_and_writable():
+    queue = SendQueue(max_messages=10, high_watermark=2, low_watermark=1)
+
+    async def consumer():
+        frames = []
+        while len(frames) < 3:
+            frames.append(await queue.get())
+            await asyncio.sleep(0)
+        return frames
+
+    async def producer():
+        for i in range(3):
+            await queue.writable()
+            queue.put(str(i))
+
+    async def main():
+        frames, _ = await asyncio.gather(consumer(), producer())
+        return frames
+
+    assert asyncio.run(main()) == ["0", "1", "2"]
+
+
+def test_node_with_send_queue():
+    registry, source = create_registry(name)
+    node = RemoteNode(registry=registry)
+    queue = SendQueue(max_messages=100, policy=OverflowPolicy.CONFLATE)
+    node.set_send_queue(queue)
+    node.handle_link(name)
+    for value in range(50):
+        source.set_property(propName, value)
+    source.notify_signal("demo.Queue/sig", [1])
+    assert queue.depth == 3
+    frames = [node.converter.from_string(queue.pop()) for _ in range(3)]
+    assert frames[1] == Protocol.property_change_message(propName, 49)
+    assert frames[2] == Protocol.signal_message("demo.Queue/sig", [1])
+
+
+def test_batching_queues_property_changes():
+    registry, source = create_registry(name)
+    node = RemoteNode(registry=registry)
+    queue = SendQueue(max_messages=100, policy=OverflowPolicy.CONFLATE)
+    node.set_send_queue(queue)
+    node.handle_link(name)
+    node.enable_batching(max_messages=100, max_delay=60)
+    source.notify_signal("demo.Queue/sig", [1])
+    source.notify_signal("demo.Queue/sig", [2])
+    source.set_property(propName, 1)
+    source.set_property(propName, 2)
+    source.notify_signal("demo.Queue/sig", [3])
+    node.flush()
+    # the pending batch is written before the change, the changes are keyed
+    assert [entry[0] for entry in queue.items] == [None, None, propName, None]
+    assert queue.conflated == 1
+    frames = [node.converter.from_string(entry[1]) for entry in queue.items]
+    assert frames[1][0] == MsgType.BATCH
+    assert frames[2] == Protocol.property_change_message(propName, 2)
+
+
+def test_drop_breaks_patches():
+    queue = SendQueue(max_messages=3, policy=OverflowPolicy.DROP_OLDEST)
+    dropped = []
+    queue.on_drop = lambda queue, key: dropped.append(key)
+    queue.put("change", "a", True)
+    queue.put("patch1", "a", False)
+    queue.put("other", "b", True)
+    queue.put("patch2", "a", False)
+    assert queue.pop() == "other"
+    assert queue.pop() is None
+    assert dropped == ["a"]
+    assert queue.dropped == 3
+    assert queue.keys == {}
+    # the next patch is replaced by the full frame
+    queue.on_drop = lambda queue, key: "full"
+    queue.put("patch3", "a", False)
+    queue.put("patch4", "a", False)
+    assert queue.pop() == "full"
+    assert queue.pop() == "patch4"
+    assert queue.broken == set()
+
+
+def test_dropped_patch_resends_full_value():
+    registry, source = create_registry(name, {"value": {"a": 0, "b": 0}})
+    registry.set_patching(name, True)
+    node = RemoteNode(registry=registry)
+    queue = SendQueue(max_messages=2, policy=OverflowPolicy.DROP_OLDEST)
+    node.set_send_queue(queue)
+    client = ClientNode(registry=ClientRegistry())
+    sink = add_sink(client.registry(), name)
+    client.on_write(lambda data: node.handle_message(data))
+
+    def drain():
+        while queue.depth:
+            client.handle_message(queue.pop())
+
+    client.link_remote(name, patch=True)
+    drain()
+    source.set_property(propName, {"a": 0, "b": 0})
+    drain()
+    source.set_property(propName, {"a": 1, "b": 0})
+    source.set_property(propName, {"a": 1, "b": 1})
+    source.set_property(propName, {"a": 1, "b": 2})
+    # the patches after the dropped one are dropped, the last one is replaced by
+    # the full value
+    assert queue.depth == 1
+    assert node.converter.from_string(queue.items[0][1]) == [
+        MsgType.PROPERTY_CHANGE,
+        propName,
+        {"a": 1, "b": 2},
+    ]
+    drain()
+    assert sink.events[-1]["value"] == {"a": 1, "b": 2}
+    source.set_property(propName, {"a": 1, "b": 3})
+    assert node.converter.from_string(queue.items[-1][1])[0] == MsgType.PROPERTY_PATCH
+    drain()
+    assert sink.events[-1]["value"] == {"a": 1, "b": 3}
+    assert client.property_values[name]["value"] == {"a": 1, "b": 3}
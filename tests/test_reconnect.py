@@ -0,0 +1,172 @@
+import asyncio
+from olink.client import ClientNode, ClientRegistry, InvokeError, InvokePolicy
+from olink.core import MessageConverter, MsgType
+from olink.remote import RemoteNode, RemoteRegistry
+from olink.transport.reconnect import Backoff
+from olink.transport.stream import StreamClient, StreamServer
+from .helpers import (
+    add_sink,
+    add_source,
+    connect,
+    create_registry,
+    decode,
+    wait_for,
+)
+
+names = ["demo.Reconnect", "demo.Relink"]
+invokeName = "demo.Reconnect/add"
+
+
+def create_nodes():
+    registry = RemoteRegistry()
+    sources = [add_source(registry, name) for name in names]
+    client = ClientNode(registry=ClientRegistry())
+    sinks = [add_sink(client.registry(), name) for name in names]
+    remote = RemoteNode(registry=registry)
+    writes, _ = connect(client, remote)
+    return client, remote, sinks, sources, writes
+
+
+def replies(node: ClientNode, name: str, idempotent: bool, results: list):
+    node.invoke_remote(
+        name, [], lambda arg: results.append((arg.value, arg.error)), idempotent
+    )
+
+
+def test_relink():
+    client, remote, sinks, sources, writes = create_nodes()
+    for name in names:
+        client.link_remote(name)
+    for sink in sinks:
+        sink.clear()
+    writes.clear()
+    sources[0].set_property("demo.Reconnect/count", 1)
+    client.handle_disconnect()
+    client.handle_connect()
+    assert decode(writes) == [[MsgType.LINK, name] for name in names]
+    assert [event["type"] for event in sinks[1].events] == ["init"]
+    assert sinks[0].node is client
+
+
+def test_relink_without_batch_support():
+    client, remote, sinks, sources, writes = create_nodes()
+
+    def write(data):
+        # a remote node without batch support drops batch frames
+        if MessageConverter().from_string(data)[0] != MsgType.BATCH:
+            remote.handle_message(data)
+
+    client.on_write(write)
+    for name in names:
+        client.link_remote(name)
+    for sink in sinks:
+        sink.clear()
+    client.handle_disconnect()
+    client.handle_connect()
+    assert [[event["type"] for event in sink.events] for sink in sinks] == [
+        ["init"]
+    ] * 2
+
+
+def test_relink_in_one_frame():
+    client, remote, sinks, sources, writes = create_nodes()
+    for name in names:
+        client.link_remote(name)
+    client.enable_batching(max_delay=60)
+    writes.clear()
+    client.handle_disconnect()
+    client.handle_connect()
+    assert len(writes) == 1
+    msg = decode(writes)[0]
+    assert msg[0] == MsgType.BATCH
+    assert sorted(link[1] for link in msg[1]) == names
+
+
+def test_fail_pending_invokes():
+    client, remote, sinks, sources, writes = create_nodes()
+    results = []
+    client.on_write(lambda data: None)
+    replies(client, invokeName, True, results)
+    replies(client, invokeName, False, results)
+    client.handle_disconnect()
+    assert results == [(None, "disconnected")] * 2
+    assert client.invokes_pending == {}
+    replies(client, invokeName, True, results)
+    assert len(results) == 3
+
+
+def test_replay_idempotent_invokes():
+    client, remote, sinks, sources, writes = create_nodes()
+    client.invoke_policy = InvokePolicy.REPLAY
+    results = []
+    lost = []
+    client.on_write(lost.append)
+    replies(client, invokeName, True, results)
+    replies(client, invokeName, False, results)
+    client.handle_disconnect()
+    assert results == [(None, "disconnected")]
+    replies(client, invokeName, True, results)
+    replies(client, invokeName, False, results)
+    assert len(lost) == 2
+    assert results == [(None, "disconnected")] * 2
+    client.on_write(lambda data: remote.handle_message(data))
+    client.handle_connect()
+    assert results[2:] == [(invokeName, None)] * 2
+    assert client.invokes_pending == {}
+    assert client.invokes_replay == {}
+
+
+def test_invoke_raises_on_disconnect():
+    client, remote, sinks, sources, writes = create_nodes()
+    client.on_write(lambda data: None)
+
+    async def main():
+        task = asyncio.ensure_future(client.invoke(invokeName, []))
+        await asyncio.sleep(0)
+        client.handle_disconnect()
+        try:
+            await task
+        except InvokeError as e:
+            return str(e)
+
+    assert asyncio.run(main()) == "disconnected"
+
+
+def test_backoff():
+    backoff = Backoff(initial=1, maximum=5, factor=2)
+    for limit in [1, 2, 4, 5, 5]:
+        assert 0 <= backoff.next() <= limit
+    backoff.reset()
+    assert backoff.next() <= 1
+
+
+def test_reconnect_stream():
+    registry, source = create_registry(names[0])
+    node = ClientNode(registry=ClientRegistry())
+    sink = add_sink(node.registry(), names[0])
+
+    async def main():
+        server = StreamServer(registry)
+        await server.start_tcp("127.0.0.1", 0)
+        port = server.port
+        client = StreamClient(node)
+        # linked before the first connect, sent by the reconnector
+        node.link_remote(names[0])
+        task = asyncio.ensure_future(
+            client.run_tcp("127.0.0.1", port, Backoff(initial=0.01))
+        )
+        await wait_for(lambda: len(server.nodes) == 1 and sink.node is node)
+        await server.close()
+        await wait_for(lambda: not node.connected)
+        assert registry.get_nodes(names[0]) == set()
+        source.properties = {"count": 2}
+        sink.clear()
+        await server.start_tcp("127.0.0.1", port)
+        await wait_for(lambda: sink.properties == {"count": 2})
+        assert await node.invoke(invokeName, [], timeout=5) == invokeName
+        assert client.reconnector.connects == 2
+        await client.close()
+        await task
+        await server.close()
+
+    asyncio.run(main())
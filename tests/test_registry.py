@@ -0,0 +1,79 @@
+from olink.client import ClientNode, ClientRegistry, get_client_registry
+from olink.remote import RemoteNode, RemoteRegistry, get_remote_registry
+from .helpers import create_client, create_registry
+
+name = "demo.Hub"
+sigName = "demo.Hub/tick"
+
+
+class Hub:
+    # an isolated pair of client and remote side with own registries
+    def __init__(self):
+        self.remote_registry, self.source = create_registry(name)
+        self.client, self.remote, self.sink, _ = create_client(
+            self.remote_registry, name
+        )
+        self.client_registry = self.client.registry()
+
+
+def test_default_registries():
+    assert ClientNode().registry() is get_client_registry()
+    assert RemoteNode().registry() is get_remote_registry()
+
+
+def test_isolated_registries():
+    first = Hub()
+    second = Hub()
+    assert first.client_registry.entries is not second.client_registry.entries
+    assert first.remote_registry.entries is not second.remote_registry.entries
+    first.client.link_remote(name)
+    second.client.link_remote(name)
+    assert first.remote_registry.get_nodes(name) == {first.remote}
+    assert second.remote_registry.get_nodes(name) == {second.remote}
+    assert get_remote_registry().get_nodes(name) == set()
+    first.source.notify_signal(sigName, [1])
+    assert first.sink.events[-1] == {"type": "signal", "name": sigName, "args": [1]}
+    assert second.sink.events[-1]["type"] == "init"
+
+
+def test_isolated_pending_invokes():
+    first = Hub()
+    second = Hub()
+    first.client.on_write(lambda data: None)
+    first.client.invoke_remote(f"{name}/add", [1], lambda arg: None)
+    assert len(first.client.invokes_pending) == 1
+    assert len(second.client.invokes_pending) == 0
+
+
+def test_remote_reverse_index():
+    registry = RemoteRegistry()
+    first = RemoteNode(registry=registry)
+    second = RemoteNode(registry=registry)
+    registry.add_node_to_source("demo.A", first)
+    registry.add_node_to_source("demo.B/prop", first)
+    registry.add_node_to_source("demo.B", second)
+    assert registry.node_links[first] == {"demo.A", "demo.B"}
+    registry.remove_node_from_source("demo.A", first)
+    assert registry.node_links[first] == {"demo.B"}
+    first.detach()
+    assert first not in registry.node_links
+    assert registry.get_nodes("demo.B") == {second}
+    second.detach()
+    assert registry.node_links == {}
+    assert registry.get_nodes("demo.B") == set()
+
+
+def test_client_reverse_index():
+    registry = ClientRegistry()
+    first = ClientNode(registry=registry)
+    second = ClientNode(registry=registry)
+    first.link_node("demo.A")
+    first.link_node("demo.B")
+    assert registry.node_links[first] == {"demo.A", "demo.B"}
+    second.link_node("demo.B")
+    assert registry.node_links[first] == {"demo.A"}
+    first.detach()
+    assert registry.get_node("demo.A") is None
+    assert registry.get_node("demo.B") is second
+    second.unlink_node("demo.B")
+    assert registry.node_links == {}
@@ -0,0 +1,134 @@
+import asyncio
+from olink.core import MsgType, Protocol
+from olink.mocks import MockSink
+from olink.remote import SignalBatcher
+from .helpers import create_client, create_registry
+
+name = "demo.Sensor"
+sampleName = "demo.Sensor/sample"
+alarmName = "demo.Sensor/alarm"
+
+
+class BatchSink(MockSink):
+    # sink handling signal batches at once
+    def olink_on_signal_batch(self, name, batch):
+        self.events.append({"type": "signal_batch", "name": name, "batch": batch})
+
+
+def signals(sink):
+    return [event["args"] for event in sink.events if event["type"] == "signal"]
+
+
+def test_batcher_ring_buffer():
+    sent = []
+    batcher = SignalBatcher(
+        sampleName, lambda name, batch: sent.append(batch), None, 60, 3
+    )
+    for i in range(5):
+        batcher.add([i])
+    assert sent == []
+    assert batcher.dropped == 2
+    batcher.flush()
+    assert sent == [[[2], [3], [4]]]
+    assert batcher.batches == 1
+    batcher.flush()
+    assert len(sent) == 1
+
+
+def test_flush_on_size():
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(registry, name)
+    client.link_remote(name)
+    frames.clear()
+    registry.set_signal_batching(name, True, max_events=4, max_delay=60)
+    for i in range(10):
+        source.notify_signal(sampleName, [i])
+    assert len(frames) == 2
+    assert signals(sink) == [[i] for i in range(8)]
+    registry.flush_signals()
+    assert len(frames) == 3
+    assert signals(sink) == [[i] for i in range(10)]
+
+
+def test_signal_overrides_object():
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(registry, name)
+    client.link_remote(name)
+    frames.clear()
+    registry.set_signal_batching(name, True, max_events=100, max_delay=60)
+    registry.set_signal_batching(alarmName, True, max_events=1)
+    source.notify_signal(sampleName, [1])
+    source.notify_signal(alarmName, ["fire"])
+    assert signals(sink) == [["fire"]]
+    registry.flush_signals()
+    assert signals(sink) == [["fire"], [1]]
+
+
+def test_disable_flushes():
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(registry, name)
+    client.link_remote(name)
+    frames.clear()
+    registry.set_signal_batching(name, True, max_events=None, max_delay=60)
+    source.notify_signal(sampleName, [1])
+    source.notify_signal(sampleName, [2])
+    assert signals(sink) == []
+    registry.set_signal_batching(name, False)
+    assert signals(sink) == [[1], [2]]
+    source.notify_signal(sampleName, [3])
+    assert signals(sink) == [[1], [2], [3]]
+    assert len(frames) == 2
+
+
+def test_overflow_drops_oldest():
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(registry, name)
+    client.link_remote(name)
+    frames.clear()
+    registry.set_signal_batching(
+        sampleName, True, max_events=None, max_delay=60, capacity=4
+    )
+    for i in range(10):
+        source.notify_signal(sampleName, [i])
+    registry.flush_signals()
+    assert signals(sink) == [[6], [7], [8], [9]]
+    assert registry.get_signal_batcher(sampleName).dropped == 6
+
+
+def test_sink_batch():
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(registry, name, BatchSink)
+    client.link_remote(name)
+    frames.clear()
+    registry.set_signal_batching(name, True, max_events=3)
+    for i in range(3):
+        source.notify_signal(sampleName, [i])
+    assert sink.events[-1] == {
+        "type": "signal_batch",
+        "name": sampleName,
+        "batch": [[0], [1], [2]],
+    }
+    assert signals(sink) == []
+
+
+def test_flush_on_delay():
+    registry, source = create_registry(name)
+    client, remote, sink, frames = create_client(registry, name)
+    client.link_remote(name)
+    frames.clear()
+    registry.set_signal_batching(name, True, max_events=None, max_delay=0.01)
+
+    async def emit():
+        for i in range(3):
+            source.notify_signal(sampleName, [i])
+        assert signals(sink) == []
+        await asyncio.sleep(0.05)
+
+    asyncio.run(emit())
+    assert signals(sink) == [[0], [1], [2]]
+    assert len(frames) == 1
+
+
+def test_signal_batch_message():
+    msg = Protocol.signal_batch_message(sampleName, [[1], [2]])
+    assert msg == [MsgType.SIGNAL_BATCH, sampleName, [[1], [2]]]
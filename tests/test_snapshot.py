@@ -0,0 +1,73 @@
+import pytest
+from olink.core import MessageFormat, Protocol
+from olink.mocks import MockSource
+from olink.remote import RemoteNode, RemoteRegistry
+from .helpers import create_registry, create_remote
+
+name = "demo.Snapshot"
+propName = "demo.Snapshot/count"
+
+
+class CountingSource(MockSource):
+    collected = 0
+
+    def olink_collect_properties(self) -> object:
+        self.collected += 1
+        return self.properties
+
+
+def link_nodes(registry: RemoteRegistry, count: int, format=MessageFormat.JSON):
+    frames = []
+    for _ in range(count):
+        node, writes = create_remote(registry, format)
+        node.handle_link(name)
+        frames.extend(writes)
+    return frames
+
+
+def test_link_storm_collects_once():
+    registry, source = create_registry(name, {"count": 1}, True, CountingSource)
+    frames = link_nodes(registry, 100)
+    assert source.collected == 1
+    assert all(frame is frames[0] for frame in frames)
+    assert RemoteNode().converter.from_string(frames[0]) == Protocol.init_message(
+        name, {"count": 1}
+    )
+
+
+def test_property_change_invalidates():
+    registry, source = create_registry(name, {"count": 1}, True, CountingSource)
+    link_nodes(registry, 2)
+    version = registry.snapshot_version(name)
+    source.olink_set_property(propName, 2)
+    assert registry.snapshot_version(name) == version + 1
+    frames = link_nodes(registry, 2)
+    assert source.collected == 2
+    assert RemoteNode().converter.from_string(frames[0])[2] == {"count": 2}
+    registry.invalidate_snapshot(name)
+    link_nodes(registry, 1)
+    assert source.collected == 3
+
+
+def test_send_property_change_invalidates():
+    registry, source = create_registry(name, {"count": 1}, True, CountingSource)
+    link_nodes(registry, 1)
+    source.properties["count"] = 2
+    registry.send_property_change(propName, 2)
+    frames = link_nodes(registry, 1)
+    assert RemoteNode().converter.from_string(frames[0])[2] == {"count": 2}
+
+
+def test_snapshot_per_format():
+    pytest.importorskip("msgpack")
+    registry, source = create_registry(name, {"count": 1}, True, CountingSource)
+    link_nodes(registry, 2)
+    frames = link_nodes(registry, 2, MessageFormat.MSGPACK)
+    assert source.collected == 2
+    assert isinstance(frames[0], bytes)
+
+
+def test_snapshot_cache_disabled():
+    registry, source = create_registry(name, {"count": 1}, False, CountingSource)
+    link_nodes(registry, 3)
+    assert source.collected == 3
@@ -0,0 +1,177 @@
+import asyncio
+import socket
+import pytest
+from olink.client import ClientNode, ClientRegistry
+from olink.core import (
+    MsgType,
+    MessageConverter,
+    MessageFormat,
+    Metrics,
+    OverflowPolicy,
+    Protocol,
+    SendQueue,
+)
+from olink.transport.stream import StreamClient, StreamConnection, StreamServer
+from .helpers import add_sink, create_registry, wait_for
+
+name = "demo.Stream"
+propName = "demo.Stream/count"
+invokeName = "demo.Stream/add"
+
+formats = [
+    (MessageFormat.JSON, None),
+    (MessageFormat.MSGPACK, "msgpack"),
+    (MessageFormat.CBOR, "cbor2"),
+]
+
+
+class RecordingNode(ClientNode):
+    def __init__(self, format):
+        super().__init__(format, registry=ClientRegistry())
+        self.received = []
+
+    def handle_message(self, data):
+        self.received.append(self.converter.from_string(data))
+
+
+def frame(converter, msg):
+    data = converter.to_string(msg)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return len(data).to_bytes(4, "big") + data
+
+
+def feed(connection, data, chunk):
+    # feed data through the buffer protocol in chunks of the given size
+    while data:
+        buffer = connection.get_buffer(-1)
+        size = min(chunk, len(buffer), len(data))
+        buffer[:size] = data[:size]
+        connection.buffer_updated(size)
+        data = data[size:]
+
+
+@pytest.mark.parametrize("format,module", formats)
+@pytest.mark.parametrize("chunk", [1, 7, 4096])
+def test_split_frames(format, module, chunk):
+    if module:
+        pytest.importorskip(module)
+    node = RecordingNode(format)
+    connection = StreamConnection(node, SendQueue(), buffer_size=64)
+    converter = MessageConverter(format)
+    msgs = [Protocol.signal_message(name, [i, "x" * i]) for i in range(50)]
+    feed(connection, b"".join(frame(converter, msg) for msg in msgs), chunk)
+    assert node.received == msgs
+    assert connection.start == connection.end == 0
+
+
+def test_large_frame_grows_buffer():
+    node = RecordingNode(MessageFormat.JSON)
+    connection = StreamConnection(node, SendQueue(), buffer_size=16)
+    msg = Protocol.property_change_message(propName, "x" * 1000)
+    feed(connection, frame(MessageConverter(MessageFormat.JSON), msg), 100)
+    assert node.received == [msg]
+
+
+def test_invalid_utf8_frame():
+    node = ClientNode(registry=ClientRegistry())
+    metrics = Metrics()
+    node.set_metrics(metrics)
+    connection = StreamConnection(node, SendQueue())
+    data = b"\xff\xfe"
+    msg = Protocol.signal_message(name, [1])
+    feed(connection, len(data).to_bytes(4, "big") + data, 4096)
+    feed(connection, frame(MessageConverter(MessageFormat.JSON), msg), 4096)
+    assert metrics.decode_errors == 1
+    assert metrics.messages_in[MsgType.SIGNAL] == 1
+
+
+class PausingTransport:
+    # records the written frames and the reading state of a stream connection
+    def __init__(self):
+        self.paused = False
+        self.pauses = 0
+        self.written = []
+
+    def pause_reading(self):
+        self.paused = True
+        self.pauses += 1
+
+    def resume_reading(self):
+        self.paused = False
+
+    def writelines(self, chunks):
+        self.written.extend(chunks[1::2])
+
+
+def test_blocked_queue_pauses_reading():
+    node = ClientNode(registry=ClientRegistry())
+    queue = SendQueue(max_messages=4, policy=OverflowPolicy.BLOCK, high_watermark=2)
+    connection = StreamConnection(node, queue)
+    transport = PausingTransport()
+    converter = MessageConverter(MessageFormat.JSON)
+
+    async def main():
+        connection.connection_made(transport)
+        node.emit_write(Protocol.signal_message(name, [1]))
+        feed(connection, frame(converter, Protocol.signal_message(name, [2])), 4096)
+        assert not transport.paused
+        node.emit_write(Protocol.signal_message(name, [3]))
+        feed(connection, frame(converter, Protocol.signal_message(name, [4])), 4096)
+        assert transport.paused
+        await asyncio.sleep(0)
+        assert not transport.paused
+        assert len(transport.written) == 2
+        connection._writer.cancel()
+
+    asyncio.run(main())
+    assert transport.pauses == 1
+
+
+async def roundtrip(format, listen, connect):
+    registry, source = create_registry(name)
+    server = StreamServer(registry, format)
+    await listen(server)
+    node = ClientNode(format, registry=ClientRegistry())
+    sink = add_sink(node.registry(), name)
+    client = StreamClient(node)
+    await connect(client, server)
+    node.link_remote(name)
+    replies = await asyncio.gather(
+        *[node.invoke(invokeName, [i], timeout=5) for i in range(100)]
+    )
+    assert replies == [invokeName] * 100
+    source.set_property(propName, "x" * 100000)
+    await wait_for(lambda: sink.properties.get("count") == "x" * 100000)
+    assert len(server.nodes) == 1
+    await client.close()
+    await wait_for(lambda: not server.nodes)
+    assert registry.node_links == {}
+    await server.close()
+
+
+@pytest.mark.parametrize("format,module", formats)
+def test_tcp(format, module):
+    if module:
+        pytest.importorskip(module)
+
+    async def listen(server):
+        await server.start_tcp("127.0.0.1", 0)
+
+    async def connect(client, server):
+        await client.connect_tcp("127.0.0.1", server.port)
+
+    asyncio.run(roundtrip(format, listen, connect))
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no unix sockets")
+def test_unix(tmp_path):
+    path = str(tmp_path / "olink.sock")
+
+    async def listen(server):
+        await server.start_unix(path)
+
+    async def connect(client, server):
+        await client.connect_unix(path)
+
+    asyncio.run(roundtrip(MessageFormat.JSON, listen, connect))
@@ -0,0 +1,126 @@
+import asyncio
+import time
+import pytest
+from olink.core.timer import TimerWheel
+from olink.remote import RateLimit
+from .helpers import create_client, create_registry
+
+name = "demo.Throttle"
+props = {"speed": 0, "mode": "idle"}
+speedName = "demo.Throttle/speed"
+modeName = "demo.Throttle/mode"
+
+
+def changes(sink, path=None):
+    return [
+        event["value"]
+        for event in sink.events
+        if event["type"] == "property_change"
+        and (path is None or event["name"] == path)
+    ]
+
+
+def test_rate_limit():
+    limit = RateLimit(10, {"speed": 2})
+    assert limit.get_interval("speed") == 0.5
+    assert limit.get_interval("mode") == 0.1
+    assert RateLimit(None, {"speed": 4}).get_interval("mode") is None
+    assert RateLimit.from_options({"filter": []}) is None
+    with pytest.raises(ValueError):
+        RateLimit.from_options({"rate": 0})
+    with pytest.raises(ValueError):
+        RateLimit.from_options({"rates": {"speed": "fast"}})
+
+
+def test_timer_wheel():
+    calls = []
+
+    async def main():
+        wheel = TimerWheel(tick=0.005, slots=4)
+        wheel.schedule(0.03, lambda: calls.append(3))
+        wheel.schedule(0.01, lambda: calls.append(1))
+        wheel.schedule(0.02, lambda: calls.append(2))
+        assert wheel.count == 3
+        await asyncio.sleep(0.08)
+        assert wheel.count == 0
+        assert wheel.handle is None
+
+    asyncio.run(main())
+    assert calls == [1, 2, 3]
+
+
+def test_throttle_trailing_value():
+    registry, source = create_registry(name, props)
+    client, remote, sink, _ = create_client(registry, name)
+    other, other_remote, other_sink, _ = create_client(registry, name)
+
+    async def main():
+        client.link_remote(name, rate=20)
+        other.link_remote(name)
+        for value in range(1, 101):
+            source.set_property(speedName, value)
+        assert changes(sink) == [1]
+        assert len(changes(other_sink)) == 100
+        await asyncio.sleep(0.1)
+        assert changes(sink) == [1, 100]
+        source.set_property(speedName, 101)
+        await asyncio.sleep(0.1)
+        assert changes(sink) == [1, 100, 101]
+
+    asyncio.run(main())
+
+
+def test_throttle_per_property():
+    registry, source = create_registry(name, props)
+    client, remote, sink, _ = create_client(registry, name)
+
+    async def main():
+        client.link_remote(name, rates={"speed": 20})
+        for value in range(10):
+            source.set_property(speedName, value)
+            source.set_property(modeName, str(value))
+        assert changes(sink, speedName) == [0]
+        assert len(changes(sink, modeName)) == 10
+        await asyncio.sleep(0.1)
+        assert changes(sink, speedName) == [0, 9]
+
+    asyncio.run(main())
+
+
+def test_throttle_without_loop():
+    registry, source = create_registry(name, props)
+    client, remote, sink, _ = create_client(registry, name)
+    client.link_remote(name, rate=100)
+    source.set_property(speedName, 1)
+    source.set_property(speedName, 2)
+    assert changes(sink) == [1]
+    time.sleep(0.03)
+    source.set_property(modeName, "run")
+    assert changes(sink) == [1, 2, "run"]
+
+
+def test_throttled_nodes_get_full_values():
+    registry, source = create_registry(name, props)
+    registry.set_patching(name, True)
+    client, remote, sink, _ = create_client(registry, name)
+    client.link_remote(name, rate=1000, patch=True)
+    source.set_property(speedName, {"x": 1, "y": 1})
+    source.set_property(speedName, {"x": 2, "y": 1})
+    time.sleep(0.02)
+    source.set_property(speedName, {"x": 3, "y": 1})
+    time.sleep(0.02)
+    registry.get_timer_wheel().advance()
+    assert changes(sink) == [{"x": 1, "y": 1}, {"x": 2, "y": 1}, {"x": 3, "y": 1}]
+    assert client.property_values[name]["speed"] == {"x": 3, "y": 1}
+
+
+def test_detach_drops_throttled():
+    registry, source = create_registry(name, props)
+    client, remote, sink, _ = create_client(registry, name)
+    client.link_remote(name, rate=1)
+    source.set_property(speedName, 1)
+    source.set_property(speedName, 2)
+    assert remote.throttled
+    client.unlink_remote(name)
+    assert remote.throttled == {}
+    assert registry.entries[name].rate_limits == {}
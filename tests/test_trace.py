@@ -0,0 +1,86 @@
+import time
+from olink.core import LogLevel, MsgType, SlowestSampler, TraceStage
+from olink.mocks import MockSink
+from .helpers import add_sink, add_source, create_client, create_registry
+
+name = "demo.Trace"
+slowName = "demo.Slow"
+
+
+class SlowSink(MockSink):
+    def olink_on_signal(self, name, args):
+        time.sleep(0.01)
+        super().olink_on_signal(name, args)
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.traces = []
+
+    def trace(self, stage, msg_type, name, start, end):
+        assert end >= start
+        self.traces.append((stage, msg_type, name))
+
+
+def create_nodes():
+    registry, source = create_registry(name)
+    sources = [source, add_source(registry, slowName)]
+    client, remote, _, _ = create_client(registry, name)
+    add_sink(client.registry(), slowName, SlowSink)
+    client.link_remote(name)
+    client.link_remote(slowName)
+    return client, remote, sources
+
+
+def test_trace_stages():
+    client, remote, sources = create_nodes()
+    tracer = RecordingTracer()
+    client.set_tracer(tracer)
+    remote.set_tracer(tracer)
+    sources[0].notify_signal("demo.Trace/tick", [1])
+    client.invoke_remote("demo.Trace/add", [1], lambda arg: None)
+    assert tracer.traces == [
+        (TraceStage.DECODE, MsgType.SIGNAL, "demo.Trace/tick"),
+        (TraceStage.CALLBACK, MsgType.SIGNAL, "demo.Trace/tick"),
+        (TraceStage.DISPATCH, MsgType.SIGNAL, "demo.Trace/tick"),
+        (TraceStage.DECODE, MsgType.INVOKE, "demo.Trace/add"),
+        (TraceStage.CALLBACK, MsgType.INVOKE, "demo.Trace/add"),
+        (TraceStage.DECODE, MsgType.INVOKE_REPLY, "demo.Trace/add"),
+        (TraceStage.CALLBACK, MsgType.INVOKE_REPLY, "demo.Trace/add"),
+        (TraceStage.DISPATCH, MsgType.INVOKE_REPLY, "demo.Trace/add"),
+        (TraceStage.DISPATCH, MsgType.INVOKE, "demo.Trace/add"),
+    ]
+
+
+def test_trace_decode_error():
+    client, remote, sources = create_nodes()
+    tracer = RecordingTracer()
+    client.set_tracer(tracer)
+    client.handle_message("not json")
+    assert tracer.traces == [(TraceStage.DECODE, 0, "")]
+
+
+def test_slowest_sampler():
+    client, remote, sources = create_nodes()
+    sampler = SlowestSampler(size=2)
+    logs = []
+    sampler.on_log(lambda level, msg: logs.append((level, msg)))
+    client.set_tracer(sampler)
+    for i in range(20):
+        sources[0].notify_signal("demo.Trace/tick", [i])
+    sources[1].notify_signal("demo.Slow/tick", [])
+    report = sampler.report()
+    assert [entry["name"] for entry in report] == ["demo.Slow/tick"] * 2
+    assert {entry["stage"] for entry in report} == {"DISPATCH", "CALLBACK"}
+    assert report[0]["duration_ms"] >= 10
+    sampler.log_slowest()
+    assert len(logs) == 2
+    assert logs[0][0] == LogLevel.INFO
+    assert logs[0][1].startswith("slow DISPATCH SIGNAL demo.Slow/tick")
+    assert sampler.report() == []
+
+
+def test_disabled():
+    client, remote, sources = create_nodes()
+    assert client.tracer is None
+    sources[0].notify_signal("demo.Trace/tick", [1])
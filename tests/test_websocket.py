@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from olink.client import ClientNode, ClientRegistry
+
+pytest.importorskip("websockets")
+
+from olink.transport.websocket import WebSocketClient, WebSocketServer
+from .helpers import add_sink, create_registry, wait_for
+
+name = "demo.Socket"
+propName = "demo.Socket/count"
+invokeName = "demo.Socket/add"
+
+
+async def start_server():
+    registry, source = create_registry(name)
+    server = WebSocketServer(registry)
+    await server.start("127.0.0.1", 0)
+    return server, registry, source
+
+
+async def connect(server):
+    node = ClientNode(registry=ClientRegistry())
+    sink = add_sink(node.registry(), name)
+    client = WebSocketClient(node)
+    await client.connect(f"ws://127.0.0.1:{server.port}")
+    return client, node, sink
+
+
+def test_link_invoke_and_detach():
+    async def main():
+        server, registry, source = await start_server()
+        client, node, sink = await connect(server)
+        node.link_remote(name)
+        assert await node.invoke(invokeName, [1], timeout=5) == invokeName
+        assert sink.events[0]["type"] == "init"
+        source.set_property(propName, 3)
+        await wait_for(lambda: sink.properties.get("count") == 3)
+        assert len(server.nodes) == 1
+        await client.close()
+        await wait_for(lambda: not server.nodes)
+        assert registry.node_links == {}
+        assert registry.get_nodes(name) == set()
+        await server.close()
+
+    asyncio.run(main())
+
+
+def test_many_clients():
+    count = 200
+
+    async def main():
+        server, registry, source = await start_server()
+        clients = await asyncio.gather(*[connect(server) for _ in range(count)])
+        for _, node, _ in clients:
+            node.link_remote(name)
+        replies = await asyncio.gather(
+            *[
+                node.invoke(invokeName, [i], timeout=10)
+                for i in range(10)
+                for _, node, _ in clients
+            ]
+        )
+        assert replies == [invokeName] * (count * 10)
+        assert len(registry.get_nodes(name)) == count
+        source.set_property(propName, 42)
+        await wait_for(
+            lambda: all(sink.properties.get("count") == 42 for _, _, sink in clients)
+        )
+        await asyncio.gather(*[client.close() for client, _, _ in clients])
+        await wait_for(lambda: not server.nodes)
+        assert registry.node_links == {}
+        await server.close()
+
+    asyncio.run(main())